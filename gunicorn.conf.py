@@ -0,0 +1,25 @@
+"""
+Gunicorn configuration. Serves the ASGI application with uvicorn workers:
+
+    gunicorn social_networking_app.asgi:application -c gunicorn.conf.py
+
+For the sync WSGI baseline, set GUNICORN_WORKER_CLASS=gthread and serve
+social_networking_app.wsgi:application instead.
+"""
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('APP_PORT', '8000')}"
+# settings.ASGI_SERVER reads this too, to choose the database connection mode.
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "uvicorn.workers.UvicornWorker")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+# Only used by the gthread worker class.
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = 30
+keepalive = 5
+# Recycle workers now and then to bound memory growth.
+max_requests = 10000
+max_requests_jitter = 1000
+accesslog = "-"
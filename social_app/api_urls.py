@@ -4,10 +4,20 @@ from .api_views import (
     SignUpView,
     UserSearchAPIView,
     FriendListView,
+    FriendSuggestionListView,
     SendRequestAPIview,
     PendingRequestListView,
     ApproveRequestView,
     RejectRequestView,
+    BulkSendRequestAPIView,
+    BulkApproveRequestView,
+    BulkRejectRequestView,
+    GraphExportView,
+)
+from .async_views import (
+    AsyncFriendListView,
+    AsyncPendingRequestListView,
+    AsyncUserSearchView,
 )
 
 
@@ -15,6 +25,11 @@ urlpatterns = [
     path("signup/", SignUpView.as_view(), name="sign-up"),
     path("users/", UserSearchAPIView.as_view(), name="users"),
     path("friend-list/", FriendListView.as_view(), name="friend-list"),
+    path(
+        "friend-suggestions/",
+        FriendSuggestionListView.as_view(),
+        name="friend-suggestions",
+    ),
     path(
         "pending-requests/", PendingRequestListView.as_view(), name="pending-requests"
     ),
@@ -33,5 +48,29 @@ urlpatterns = [
         RejectRequestView.as_view(),
         name="reject-request",
     ),
-    path("block/<user_id>/", BlockUnBlockAPIView.as_view(), name="block-unblock")
+    path(
+        "requests/bulk-send/",
+        BulkSendRequestAPIView.as_view(),
+        name="bulk-send-requests",
+    ),
+    path(
+        "requests/bulk-accept/",
+        BulkApproveRequestView.as_view(),
+        name="bulk-accept-requests",
+    ),
+    path(
+        "requests/bulk-reject/",
+        BulkRejectRequestView.as_view(),
+        name="bulk-reject-requests",
+    ),
+    path("block/<user_id>/", BlockUnBlockAPIView.as_view(), name="block-unblock"),
+    path("export/", GraphExportView.as_view(), name="export"),
+    # Async variants of the read endpoints, for ASGI deployments.
+    path("async/users/", AsyncUserSearchView.as_view(), name="async-users"),
+    path("async/friend-list/", AsyncFriendListView.as_view(), name="async-friend-list"),
+    path(
+        "async/pending-requests/",
+        AsyncPendingRequestListView.as_view(),
+        name="async-pending-requests",
+    ),
 ]
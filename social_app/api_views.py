@@ -1,34 +1,98 @@
 from abc import ABC, abstractmethod
-from django.contrib.postgres.search import SearchVector, SearchQuery
+from django.conf import settings
 from django.shortcuts import get_object_or_404
 from rest_framework.views import APIView
 from rest_framework import generics
+from django.db import transaction
 from django.db.models import Q
 from django.db.utils import IntegrityError
 from rest_framework import permissions
 from rest_framework.response import Response
 from rest_framework import status
 
-from social_app.helpers import process_request
+from social_app.caching import (
+    FRIENDS_LIST,
+    LIST_CACHE_TIMEOUT,
+    PENDING_LIST,
+    get_cache_version,
+    record_cache_hit,
+    record_cache_miss,
+)
+from social_app.counters import FRIENDS, PENDING_RECEIVED, aprofile_counter, profile_counter
+from social_app.db_routing import replica_reads
+from social_app.export import (
+    CONTENT_TYPES,
+    FORMATS,
+    NDJSON,
+    aexport_profile,
+    agzip_chunks,
+    export_profile,
+    gzip_chunks,
+)
+from social_app.fast_serialization import RowListSerializer, row_queryset
+from social_app.graph import friends_of
+from social_app.helpers import (
+    process_bulk_requests,
+    process_request,
+    resolve_bulk_requests,
+)
+from social_app.instrumentation import serializer_data
+from social_app.pagination import DEFAULT_KEYSET_ORDERING, CustomPagination
+from social_app import search_query
+from social_app.search import get_search_engine
 from .serializers import (
+    BulkResolveRequestSerializer,
+    BulkSendRequestSerializer,
     FriendRequestSerializer,
+    FriendSuggestionSerializer,
     SignUpSerializer,
     UserDetailSerializer,
     UserSerializer,
 )
-from rest_framework.pagination import PageNumberPagination
-from .models import BlockDetail, CustomUser, FriendRequest, RequestStatus, UserProfile
-from .utils import is_valid_email
+from .models import (
+    BlockDetail,
+    CustomUser,
+    FriendRequest,
+    FriendSuggestion,
+    RequestStatus,
+    UserProfile,
+)
 from .permissions import IsNotBlockedUser, IsReceiver
-from django.utils import timezone
-from datetime import timedelta
-from django.conf import settings
-from typing import Optional
+from typing import Any, AsyncIterator, Iterator, Optional, Union, cast
 from django.db.models import QuerySet
 from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
 from rest_framework.filters import OrderingFilter
 
-MAX_REQUESTS_ALLOWED = settings.MAX_REQUESTS_IN_MINUTE
+
+def search_keyset_ordering(request) -> tuple:
+    # Name search results are ranked, anything else is newest first.
+    if search_query.classify(request.query_params.get("search")) == search_query.NAME:
+        return ("-rank", "uuid")
+    return DEFAULT_KEYSET_ORDERING
+
+
+def request_profile(request) -> UserProfile:
+    """
+    Profile of the authenticated user making `request`.
+    """
+    return cast(CustomUser, request.user).user_profile
+
+
+def list_cache_key(prefix: str, paginator, request, profile_id, version: int) -> str:
+    """
+    Key of one cached page of a user's list. The path is part of the key as
+    cached pages embed absolute next/previous links.
+    """
+    page_size = paginator.get_page_size(request)
+    if paginator.use_keyset(request):
+        cursor = request.query_params.get(paginator.cursor_query_param, "")
+        page = f"c{cursor}"
+    else:
+        page = f"p{request.query_params.get(paginator.page_query_param, 1)}"
+    return f"{prefix}_{profile_id}_v{version}_{page}_s{page_size}_{request.path}"
 
 
 class SignUpView(APIView):
@@ -43,33 +107,82 @@ class SignUpView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class CustomPagination(PageNumberPagination):
-    page_size = 10
-    page_size_query_param = 'page_size'
-    max_page_size = 100
+class QueryOptimizedListMixin:
+    """
+    Applies the serializer's declared `select_related`/`only()` to list
+    querysets right before pagination, keeping the keyset columns loaded.
+    """
+
+    def paginate_queryset(self, queryset):
+        extra_fields = ()
+        if self.paginator is not None and self.paginator.use_keyset(self.request):
+            ordering = self.paginator.get_keyset_ordering(self)
+            extra_fields = tuple(field.lstrip("-") for field in ordering)
+        serializer_class = self.get_serializer_class()
+        if settings.FAST_SERIALIZATION:
+            queryset = row_queryset(serializer_class, queryset, extra_fields)
+        else:
+            queryset = serializer_class.optimize_queryset(queryset, extra_fields)
+        return super().paginate_queryset(queryset)
 
+    def get_serializer(self, *args, **kwargs):
+        if kwargs.get("many") and settings.FAST_SERIALIZATION:
+            return RowListSerializer(self.get_serializer_class(), *args)
+        return super().get_serializer(*args, **kwargs)
 
-class UserSearchAPIView(generics.GenericAPIView):
+    def list(self, request, *args, **kwargs):
+        # ListModelMixin.list, with the serializer's work timed as serialization.
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            data = serializer_data(self.get_serializer(page, many=True))
+            return self.get_paginated_response(data)
+        return Response(serializer_data(self.get_serializer(queryset, many=True)))
+
+
+class ProfileCounterMixin:
+    """
+    Gives page number pagination the list's total from one of the user's
+    profile counters (see social_app.counters) instead of a COUNT query.
+    """
+
+    count_field: str  # Set in child classes
+    request: Any  # The view's request, sync (DRF) or async
+
+    def get_known_count(self) -> Optional[int]:
+        return profile_counter(request_profile(self.request).uuid, self.count_field)
+
+    async def aget_known_count(self) -> Optional[int]:
+        return await aprofile_counter(request_profile(self.request).uuid, self.count_field)
+
+
+@replica_reads
+class UserSearchAPIView(QueryOptimizedListMixin, generics.GenericAPIView):
     pagination_class = CustomPagination
     serializer_class = UserSerializer
 
+    def get_keyset_ordering(self):
+        return search_keyset_ordering(self.request)
+
     def __paginate_result(self, user_profiles):
         page = self.paginate_queryset(user_profiles)
         if page is not None:
             serializer = self.get_serializer(page , many=True)
-            result = self.get_paginated_response(serializer.data)
+            result = self.get_paginated_response(serializer_data(serializer))
             data = result.data
         else:
             serializer = self.get_serializer(user_profiles, many=True)
-            data = serializer.data
+            data = serializer_data(serializer)
         return data
     
     def get(self, request) -> Response:
         query_params = request.query_params
-        search_key: Optional[str] = query_params.get("search", None)
-        is_email: bool = is_valid_email(search_key)
-        if is_email:
-            user: CustomUser = get_object_or_404(CustomUser, email__iexact=search_key)
+        search_key: str = query_params.get("search", "")
+        kind: str = search_query.classify(search_key)
+        if kind == search_query.EMAIL:
+            user: CustomUser = get_object_or_404(
+                CustomUser.objects.by_email(search_key).select_related("user_profile")
+            )
             user_profile_serializer: UserDetailSerializer = UserDetailSerializer(
                 user.user_profile
             )
@@ -81,65 +194,92 @@ class UserSearchAPIView(generics.GenericAPIView):
             # remove users which blocked the current user
             .remove_block_users(request.user.user_profile)
         )
-        if search_key:
-            search_vector = SearchVector('user__name')
-            search_query = SearchQuery(search_key)
-            user_profiles = user_profiles.annotate(search=search_vector).filter(search=search_query)
+        if kind == search_query.UUID:
+            user_profiles = user_profiles.filter(uuid=search_key).order_by(
+                *DEFAULT_KEYSET_ORDERING
+            )
+        elif search_key:
+            user_profiles = get_search_engine().search(user_profiles, search_key)
+        else:
+            user_profiles = user_profiles.order_by(*DEFAULT_KEYSET_ORDERING)
         data = self.__paginate_result(user_profiles)
         return Response(data, status=status.HTTP_200_OK)
 
 
-class BaseCachedListView(generics.ListAPIView):
-    cache_key_prefix: Optional[str] = None  # Prefix for cache key (to be set in child classes)
+class BaseCachedListView(QueryOptimizedListMixin, generics.ListAPIView):
+    """
+    Read-through cache for per-user list endpoints. Pages are cached under a
+    versioned key which the model layer bumps whenever the list changes.
+    """
+
+    cache_key_prefix: str  # Prefix for cache key (to be set in child classes)
 
-    def get_cache_key(self, user_profile) -> str:
-        return f"{self.cache_key_prefix}_{user_profile.uuid}"
+    def get_cache_key(self, request, user_profile) -> str:
+        version = get_cache_version(self.cache_key_prefix, user_profile.uuid)
+        return list_cache_key(
+            self.cache_key_prefix, self.paginator, request, user_profile.uuid, version
+        )
 
     def list(self, request, *args, **kwargs):
-        response = super().list(request, *args, **kwargs)
-        user_profile = request.user.user_profile
-        cache_key = self.get_cache_key(user_profile)
+        cache_key = self.get_cache_key(request, request.user.user_profile)
         cached_data = cache.get(cache_key)
-        if cached_data:
+        if cached_data is not None:
+            record_cache_hit(self.cache_key_prefix)
             return Response(cached_data, status=status.HTTP_200_OK)
-        cache.set(cache_key, response.data)
+        record_cache_miss(self.cache_key_prefix)
+        response = super().list(request, *args, **kwargs)
+        cache.set(cache_key, response.data, timeout=LIST_CACHE_TIMEOUT)
         return Response(response.data, status=status.HTTP_200_OK)
 
 
-class FriendListView(BaseCachedListView):
+@replica_reads
+class FriendListView(ProfileCounterMixin, BaseCachedListView):
     serializer_class = UserSerializer
     pagination_class = CustomPagination
-    cache_key_prefix = "friends_list"
+    cache_key_prefix = FRIENDS_LIST
+    count_field = FRIENDS
 
     def get_queryset(self) -> QuerySet[UserProfile]:
-        return UserProfile.objects.prefetch_related('friends').get(user=self.request.user).friends.all()
+        return friends_of(request_profile(self.request).uuid).order_by(
+            *DEFAULT_KEYSET_ORDERING
+        )
 
 
-class PendingRequestListView(BaseCachedListView):
+@replica_reads
+class PendingRequestListView(ProfileCounterMixin, BaseCachedListView):
     serializer_class = FriendRequestSerializer
     pagination_class = CustomPagination
-    cache_key_prefix = "pending_list"
+    cache_key_prefix = PENDING_LIST
+    count_field = PENDING_RECEIVED
 
     def get_queryset(self) -> QuerySet[FriendRequest]:
         return FriendRequest.objects.filter(
-            receiver__user=self.request.user, status=RequestStatus.PENDING
-        )
+            receiver_id=self.request.user.user_profile.uuid, status=RequestStatus.PENDING
+        ).order_by(*DEFAULT_KEYSET_ORDERING)
+
+
+@replica_reads
+class FriendSuggestionListView(QueryOptimizedListMixin, generics.ListAPIView):
+    """
+    Serves the suggestions precomputed by `compute_friend_suggestions`.
+    """
+
+    serializer_class = FriendSuggestionSerializer
+    pagination_class = CustomPagination
+    keyset_ordering = ("rank", "uuid")
+
+    def get_queryset(self) -> QuerySet[FriendSuggestion]:
+        return FriendSuggestion.objects.filter(profile__user_id=self.request.user.pk)
 
 
 class SendRequestAPIview(APIView):
     permission_classes = [permissions.IsAuthenticated, IsNotBlockedUser]
+    # process_request applies the send-requests rate limit to requests that
+    # are actually sent, answering 400 like the other failed sends.
+    throttle_classes: list = []
 
     def post(self, request, user_id) -> Response:
         user_profile = request.user.user_profile
-        time_threshold = timezone.now() - timedelta(seconds=60)
-        requests_within_minute: int = FriendRequest.objects.filter(
-            sender=user_profile, created_at__gte=time_threshold
-        ).count()
-        if requests_within_minute >= MAX_REQUESTS_ALLOWED:
-            response: dict = {
-                "message": f"Can't send more than {MAX_REQUESTS_ALLOWED} requests per minute."
-            }
-            return Response(data=response, status=status.HTTP_400_BAD_REQUEST)
         processed, response_dict = process_request(user_profile, user_id)
         return Response(
             data=response_dict,
@@ -147,6 +287,21 @@ class SendRequestAPIview(APIView):
         )
 
 
+class BulkSendRequestAPIView(APIView):
+    """
+    Send requests to a list of users in one transaction. Blocks and the
+    send-requests rate limit are checked per user, see process_bulk_requests.
+    """
+
+    def post(self, request) -> Response:
+        serializer = BulkSendRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = process_bulk_requests(
+            request.user.user_profile, serializer.validated_data["user_ids"]
+        )
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+
 class BaseRequestView(APIView, ABC):
     """
     Base class for approve and reject apiViews.
@@ -156,19 +311,24 @@ class BaseRequestView(APIView, ABC):
     action: Optional[str] = None
 
     def put(self, request, request_id) -> Response:
-        try:
-            request_object: FriendRequest = FriendRequest.objects.select_related(
-                "sender", "receiver"
-            ).get(pk=request_id)
-        except FriendRequest.DoesNotExist:
-            return Response(status=status.HTTP_404_NOT_FOUND)
-        self.check_object_permissions(request, request_object)
-        if request_object.not_in_pending():
-            return Response(
-                {"message": f"Request can't be {self.action}"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-        self.perform_action(request_object)
+        with transaction.atomic():
+            # Locked so concurrent accepts and rejects see each other's status
+            # and the counters and outbox events change once.
+            try:
+                request_object: FriendRequest = (
+                    FriendRequest.objects.select_for_update(of=("self",))
+                    .select_related("sender", "receiver")
+                    .get(pk=request_id)
+                )
+            except FriendRequest.DoesNotExist:
+                return Response(status=status.HTTP_404_NOT_FOUND)
+            self.check_object_permissions(request, request_object)
+            if request_object.not_in_pending():
+                return Response(
+                    {"message": f"Request can't be {self.action}"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            self.perform_action(request_object)
         return Response(status=status.HTTP_200_OK)
 
     @abstractmethod
@@ -193,6 +353,32 @@ class RejectRequestView(BaseRequestView):
         request_object.make_rejected()
 
 
+class BaseBulkRequestView(APIView):
+    """
+    Base class for bulk approve and reject apiViews.
+    """
+
+    target_status: str  # Set in child classes
+
+    def put(self, request) -> Response:
+        serializer = BulkResolveRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = resolve_bulk_requests(
+            request.user.user_profile,
+            serializer.validated_data["request_ids"],
+            self.target_status,
+        )
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+
+class BulkApproveRequestView(BaseBulkRequestView):
+    target_status = RequestStatus.ACCEPTED
+
+
+class BulkRejectRequestView(BaseBulkRequestView):
+    target_status = RequestStatus.REJECTED
+
+
 class BlockUnBlockAPIView(APIView):
     def post(self, request, user_id):
         user_profile = request.user.user_profile
@@ -209,3 +395,37 @@ class BlockUnBlockAPIView(APIView):
             return Response({"message": "User not blocked"}, status=status.HTTP_400_BAD_REQUEST)
         blocked_detail.delete()
         return Response({"message": "User is unblocked"})
+
+
+class GraphExportView(APIView):
+    """
+    Stream the user's friendships, friend requests and blocks as NDJSON, or
+    CSV with `?output=csv`, gzipped when the client accepts it. Under ASGI
+    the chunks come from an async generator: Django would otherwise read a
+    sync iterator into a list before sending any of it.
+    """
+
+    def get(self, request):
+        fmt = request.query_params.get("output", NDJSON)
+        if fmt not in FORMATS:
+            return Response(
+                {"output": [f"Must be one of: {', '.join(FORMATS)}."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        profile_id = request.user.user_profile.uuid
+        compress = "gzip" in request.META.get("HTTP_ACCEPT_ENCODING", "")
+        chunks: Union[Iterator[bytes], AsyncIterator[bytes]]
+        if isinstance(request._request, ASGIRequest):
+            chunks = aexport_profile(profile_id, fmt)
+            if compress:
+                chunks = agzip_chunks(chunks)
+        else:
+            chunks = export_profile(profile_id, fmt)
+            if compress:
+                chunks = gzip_chunks(chunks)
+        response = StreamingHttpResponse(chunks, content_type=CONTENT_TYPES[fmt])
+        if compress:
+            response["Content-Encoding"] = "gzip"
+        response["Content-Disposition"] = f'attachment; filename="social-graph.{fmt}"'
+        patch_vary_headers(response, ("Accept-Encoding",))
+        return response
@@ -0,0 +1,85 @@
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional
+
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+from .models import ArchivedFriendRequest, FriendRequest, RequestStatus
+
+ARCHIVED_FIELDS = (
+    "uuid",
+    "sender_id",
+    "receiver_id",
+    "status",
+    "cooldown_time",
+    "created_at",
+    "updated_at",
+)
+
+
+def archivable_requests(resolved_before: datetime) -> QuerySet[FriendRequest]:
+    """
+    Requests resolved before `resolved_before` which `process_request` only
+    needs to tell apart as accepted: acceptances, and rejections whose
+    cooldown is over.
+    """
+    return FriendRequest.objects.filter(
+        Q(status=RequestStatus.ACCEPTED)
+        | Q(status=RequestStatus.REJECTED, cooldown_time__lt=timezone.now()),
+        updated_at__lt=resolved_before,
+    )
+
+
+def archive_resolved_requests(
+    resolved_before: datetime,
+    batch_size: int = 1000,
+    progress: Optional[Callable[[Dict[str, int]], None]] = None,
+) -> Dict[str, int]:
+    """
+    Move archivable requests to ArchivedFriendRequest, one transaction per
+    batch of `batch_size`. An interrupted run loses at most its current
+    batch and the next run picks up the rest. Rows locked by a concurrent
+    re-request are skipped. `progress` is called with the running totals
+    after each batch.
+    """
+    result = {"archived": 0, "batches": 0}
+    last = None
+    while True:
+        with transaction.atomic():
+            batch = archivable_requests(resolved_before).order_by("uuid")
+            if last is not None:
+                batch = batch.filter(uuid__gt=last)
+            requests = list(batch.select_for_update(skip_locked=True)[:batch_size])
+            if not requests:
+                return result
+            last = requests[-1].uuid
+            ArchivedFriendRequest.objects.bulk_create(
+                [
+                    ArchivedFriendRequest(
+                        **{field: getattr(request, field) for field in ARCHIVED_FIELDS}
+                    )
+                    for request in requests
+                ]
+            )
+            FriendRequest.objects.filter(uuid__in=[request.uuid for request in requests]).delete()
+        result["archived"] += len(requests)
+        result["batches"] += 1
+        if progress is not None:
+            progress(dict(result))
+
+
+def archived_acceptances(sender_id, receiver_ids: Iterable) -> Dict:
+    """
+    Archived accepted requests from `sender_id`, by receiver. Only these
+    decide the outcome of sending a request again.
+    """
+    receiver_ids = list(receiver_ids)
+    if not receiver_ids:
+        return {}
+    return {
+        archived.receiver_id: archived
+        for archived in ArchivedFriendRequest.objects.filter(
+            sender_id=sender_id, receiver_id__in=receiver_ids, status=RequestStatus.ACCEPTED
+        )
+    }
@@ -0,0 +1,138 @@
+import asyncio
+import pickle
+from functools import lru_cache
+from typing import Any, Dict, Optional
+from weakref import WeakKeyDictionary
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.utils.module_loading import import_string
+
+
+class BaseAsyncCache:
+    """
+    The subset of the cache API used by the async views, mirroring Django's
+    `aget`/`aset`/... semantics: `incr` raises ValueError for missing keys.
+    """
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Any, timeout: Any = DEFAULT_TIMEOUT) -> None:
+        raise NotImplementedError
+
+    async def add(self, key: str, value: Any, timeout: Any = DEFAULT_TIMEOUT) -> bool:
+        raise NotImplementedError
+
+    async def incr(self, key: str, delta: int = 1) -> int:
+        raise NotImplementedError
+
+
+class DjangoAsyncCache(BaseAsyncCache):
+    """
+    Django's own async cache API. Most backends, django-redis included, run
+    it in a thread, so this is meant for tests and local development.
+    """
+
+    def __init__(self, alias: str = DEFAULT_CACHE_ALIAS) -> None:
+        self.cache = caches[alias]
+
+    async def get(self, key, default=None):
+        return await self.cache.aget(key, default)
+
+    async def set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        await self.cache.aset(key, value, timeout)
+
+    async def add(self, key, value, timeout=DEFAULT_TIMEOUT):
+        return await self.cache.aadd(key, value, timeout)
+
+    async def incr(self, key, delta=1):
+        return await self.cache.aincr(key, delta)
+
+
+class RedisAsyncCache(BaseAsyncCache):
+    """
+    Non-blocking client for the django-redis cache, using `redis.asyncio`.
+    Keys, timeouts and the value encoding (raw integers, pickle otherwise)
+    match django-redis, so both clients read each other's entries.
+    """
+
+    # Same script as django-redis: only increment keys which exist.
+    INCR_SCRIPT = """
+    local exists = redis.call('EXISTS', KEYS[1])
+    if (exists == 1) then
+        return redis.call('INCRBY', KEYS[1], ARGV[1])
+    else return false
+    end
+    """
+
+    def __init__(self, alias: str = DEFAULT_CACHE_ALIAS) -> None:
+        self.cache = caches[alias]
+        config: Dict[str, Any] = settings.CACHES[alias]
+        self.url = config["LOCATION"]
+        self.pool_kwargs = config.get("OPTIONS", {}).get("CONNECTION_POOL_KWARGS", {})
+        # Connections belong to the event loop that opened them.
+        self._clients: WeakKeyDictionary = WeakKeyDictionary()
+
+    @property
+    def client(self):
+        from redis import asyncio as aioredis
+
+        loop = asyncio.get_running_loop()
+        if loop not in self._clients:
+            self._clients[loop] = aioredis.Redis.from_url(self.url, **self.pool_kwargs)
+        return self._clients[loop]
+
+    def make_key(self, key: str) -> str:
+        return self.cache.make_and_validate_key(key)
+
+    def get_timeout_ms(self, timeout) -> Optional[int]:
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.cache.default_timeout
+        return None if timeout is None else int(timeout * 1000)
+
+    @staticmethod
+    def encode(value) -> Any:
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def decode(value) -> Any:
+        try:
+            return int(value)
+        except (ValueError, TypeError):
+            return pickle.loads(value)
+
+    async def get(self, key, default=None):
+        value = await self.client.get(self.make_key(key))
+        return default if value is None else self.decode(value)
+
+    async def set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        await self._set(key, value, timeout, nx=False)
+
+    async def add(self, key, value, timeout=DEFAULT_TIMEOUT):
+        return await self._set(key, value, timeout, nx=True)
+
+    async def _set(self, key, value, timeout, nx: bool) -> bool:
+        timeout = self.get_timeout_ms(timeout)
+        if timeout is not None and timeout <= 0:
+            # Redis rejects non-positive expiries; django-redis deletes instead.
+            if nx:
+                return not await self.client.exists(self.make_key(key))
+            return bool(await self.client.delete(self.make_key(key)))
+        return bool(
+            await self.client.set(self.make_key(key), self.encode(value), px=timeout, nx=nx)
+        )
+
+    async def incr(self, key, delta=1):
+        value = await self.client.eval(self.INCR_SCRIPT, 1, self.make_key(key), delta)
+        if value is None:
+            raise ValueError(f"Key '{key}' not found.")
+        return value
+
+
+@lru_cache(maxsize=None)
+def get_async_cache() -> BaseAsyncCache:
+    return import_string(settings.ASYNC_CACHE_BACKEND)()
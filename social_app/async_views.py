@@ -0,0 +1,210 @@
+from typing import Optional, Tuple, Type, Union
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.http import Http404, HttpResponse
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import MethodNotAllowed
+from rest_framework.request import Request
+from rest_framework.serializers import BaseSerializer
+from rest_framework.views import exception_handler
+
+from social_app import search_query
+from social_app.api_views import (
+    ProfileCounterMixin,
+    list_cache_key,
+    request_profile,
+    search_keyset_ordering,
+)
+from social_app.authentication import aauthenticate
+from social_app.async_cache import get_async_cache
+from social_app.blocklist import aget_blocker_ids
+from social_app.caching import (
+    FRIENDS_LIST,
+    LIST_CACHE_TIMEOUT,
+    PENDING_LIST,
+    aget_cache_version,
+    arecord_cache_hit,
+    arecord_cache_miss,
+)
+from social_app.counters import FRIENDS, PENDING_RECEIVED
+from social_app.db_routing import replica_reads
+from social_app.graph import friends_of
+from social_app.fast_serialization import RowListSerializer, row_queryset
+from social_app.instrumentation import serializer_data
+from social_app.pagination import DEFAULT_KEYSET_ORDERING, CustomPagination
+from social_app.renderers import FastJSONRenderer
+from social_app.search import get_search_engine
+from .models import CustomUser, FriendRequest, RequestStatus, UserProfile
+from .serializers import (
+    FriendRequestSerializer,
+    OptimizedModelSerializer,
+    UserDetailSerializer,
+    UserSerializer,
+)
+
+
+class AsyncAPIView(View):
+    """
+    Base for the async read endpoints, served natively under ASGI. The
+    bearer token is checked with the async ORM, and responses and errors
+    are rendered exactly as the sync API views render them.
+    """
+
+    http_method_names = ["get"]
+    renderer_class = FastJSONRenderer
+
+    # View.dispatch is typed as sync; Django awaits it for async views.
+    async def dispatch(self, request, *args, **kwargs) -> HttpResponse:  # type: ignore[override]
+        self.request = Request(request)
+        try:
+            self.request.user = await aauthenticate(request)
+            handler = getattr(self, request.method.lower(), None)
+            if handler is None:
+                raise MethodNotAllowed(request.method)
+            data = await handler(self.request, *args, **kwargs)
+        except Exception as exc:
+            return self.handle_exception(exc)
+        return self.render(data)
+
+    def handle_exception(self, exc: Exception) -> HttpResponse:
+        error = exception_handler(exc, {"view": self, "request": self.request})
+        if error is None:
+            raise exc
+        response = self.render(error.data, error.status_code)
+        for header, value in error.items():
+            if header != "Content-Type":
+                response[header] = value
+        if error.status_code == status.HTTP_401_UNAUTHORIZED:
+            response["WWW-Authenticate"] = 'Bearer realm="api"'
+        return response
+
+    def render(self, data, status_code: int = status.HTTP_200_OK) -> HttpResponse:
+        renderer = self.renderer_class()
+        return HttpResponse(
+            renderer.render(data), status=status_code, content_type=renderer.media_type
+        )
+
+
+class AsyncListAPIView(AsyncAPIView):
+    serializer_class: Type[OptimizedModelSerializer]  # Set in child classes
+    pagination_class = CustomPagination
+
+    def get_queryset(self) -> QuerySet:
+        raise NotImplementedError
+
+    async def get(self, request):
+        return await self.paginate(self.get_queryset())
+
+    async def paginate(self, queryset: QuerySet):
+        """
+        Same optimisations and response shape as QueryOptimizedListMixin on a
+        sync ListAPIView.
+        """
+        paginator = self.pagination_class()
+        extra_fields: Tuple[str, ...] = ()
+        if paginator.use_keyset(self.request):
+            extra_fields = tuple(
+                field.lstrip("-") for field in paginator.get_keyset_ordering(self)
+            )
+        if settings.FAST_SERIALIZATION:
+            queryset = row_queryset(self.serializer_class, queryset, extra_fields)
+        else:
+            queryset = self.serializer_class.optimize_queryset(queryset, extra_fields)
+        page = await paginator.apaginate_queryset(queryset, self.request, self)
+        serializer: Union[RowListSerializer, BaseSerializer]
+        if settings.FAST_SERIALIZATION:
+            serializer = RowListSerializer(self.serializer_class, page)
+        else:
+            serializer = self.serializer_class(
+                page, many=True, context={"request": self.request, "view": self}
+            )
+        return paginator.get_paginated_response(serializer_data(serializer)).data
+
+
+@replica_reads
+class AsyncUserSearchView(AsyncListAPIView):
+    serializer_class = UserSerializer
+
+    def get_keyset_ordering(self):
+        return search_keyset_ordering(self.request)
+
+    async def get(self, request):
+        search_key: str = request.query_params.get("search", "")
+        kind = search_query.classify(search_key)
+        if kind == search_query.EMAIL:
+            user = (
+                await CustomUser.objects.by_email(search_key)
+                .select_related("user_profile")
+                .afirst()
+            )
+            if user is None:
+                # Same message as get_object_or_404 in the sync view.
+                raise Http404(
+                    f"No {CustomUser._meta.object_name} matches the given query."
+                )
+            return UserDetailSerializer(user.user_profile).data
+        user_profile = request.user.user_profile
+        user_profiles = (
+            UserProfile.objects.exclude(user=request.user)
+            # remove users which blocked the current user
+            .exclude_blockers(await aget_blocker_ids(user_profile.uuid))
+        )
+        if kind == search_query.UUID:
+            user_profiles = user_profiles.filter(uuid=search_key).order_by(
+                *DEFAULT_KEYSET_ORDERING
+            )
+        elif search_key:
+            user_profiles = get_search_engine().search(user_profiles, search_key)
+        else:
+            user_profiles = user_profiles.order_by(*DEFAULT_KEYSET_ORDERING)
+        return await self.paginate(user_profiles)
+
+
+class AsyncCachedListView(AsyncListAPIView):
+    """
+    Async BaseCachedListView, invalidated through the same list versions.
+    """
+
+    cache_key_prefix: Optional[str] = None
+
+    async def get(self, request):
+        user_profile = request.user.user_profile
+        version = await aget_cache_version(self.cache_key_prefix, user_profile.uuid)
+        cache_key = list_cache_key(
+            self.cache_key_prefix, self.pagination_class(), request, user_profile.uuid, version
+        )
+        async_cache = get_async_cache()
+        cached_data = await async_cache.get(cache_key)
+        if cached_data is not None:
+            await arecord_cache_hit(self.cache_key_prefix)
+            return cached_data
+        await arecord_cache_miss(self.cache_key_prefix)
+        data = await self.paginate(self.get_queryset())
+        await async_cache.set(cache_key, data, timeout=LIST_CACHE_TIMEOUT)
+        return data
+
+
+@replica_reads
+class AsyncFriendListView(ProfileCounterMixin, AsyncCachedListView):
+    serializer_class = UserSerializer
+    cache_key_prefix = FRIENDS_LIST
+    count_field = FRIENDS
+
+    def get_queryset(self) -> QuerySet[UserProfile]:
+        return friends_of(request_profile(self.request).uuid).order_by(
+            *DEFAULT_KEYSET_ORDERING
+        )
+
+
+@replica_reads
+class AsyncPendingRequestListView(ProfileCounterMixin, AsyncCachedListView):
+    serializer_class = FriendRequestSerializer
+    cache_key_prefix = PENDING_LIST
+    count_field = PENDING_RECEIVED
+
+    def get_queryset(self) -> QuerySet[FriendRequest]:
+        return FriendRequest.objects.filter(
+            receiver_id=self.request.user.user_profile.uuid, status=RequestStatus.PENDING
+        ).order_by(*DEFAULT_KEYSET_ORDERING)
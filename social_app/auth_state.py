@@ -0,0 +1,68 @@
+from typing import Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .async_cache import get_async_cache
+
+# The state is kept in the shared cache only, not in a per-process tier, so
+# a deactivation or password change applies to every worker at once.
+
+
+def _cache_key(user_id) -> str:
+    return f"auth_state_{user_id}"
+
+
+def _user_state_query(user_id):
+    return (
+        get_user_model()
+        .objects.filter(pk=user_id)
+        .values("is_active", "password", "user_profile__uuid")
+    )
+
+
+def _as_state(row: Optional[dict]) -> Optional[dict]:
+    if row is None:
+        return None
+    return {
+        "is_active": row["is_active"],
+        "profile_uuid": row["user_profile__uuid"],
+        "password_hash": get_md5_hash_password(row["password"]),
+    }
+
+
+def _cacheable(state: Optional[dict]) -> bool:
+    # Profiles are created after their user, without saving the user again.
+    return state is not None and state["profile_uuid"] is not None
+
+
+def get_auth_state(user_id) -> Optional[dict]:
+    """
+    What token authentication needs to know about a user: whether it is
+    active, its profile id and a hash of its password, or None for unknown
+    users. Cached for AUTH_STATE_CACHE_TIMEOUT seconds.
+    """
+    key = _cache_key(user_id)
+    state = cache.get(key)
+    if state is None:
+        state = _as_state(_user_state_query(user_id).first())
+        if _cacheable(state):
+            cache.set(key, state, timeout=settings.AUTH_STATE_CACHE_TIMEOUT)
+    return state
+
+
+async def aget_auth_state(user_id) -> Optional[dict]:
+    async_cache = get_async_cache()
+    key = _cache_key(user_id)
+    state = await async_cache.get(key)
+    if state is None:
+        state = _as_state(await _user_state_query(user_id).afirst())
+        if _cacheable(state):
+            await async_cache.set(key, state, timeout=settings.AUTH_STATE_CACHE_TIMEOUT)
+    return state
+
+
+def invalidate_auth_state(user_id) -> None:
+    cache.delete(_cache_key(user_id))
@@ -1,15 +1,146 @@
+import uuid
+
 from django.contrib.auth.backends import BaseBackend
 from django.contrib.auth import get_user_model
-from typing import Optional
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Model
+from django.utils.translation import gettext as _
+from rest_framework.exceptions import AuthenticationFailed, NotAuthenticated
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import get_md5_hash_password
+from typing import Optional, Type, cast
+
+from .auth_state import aget_auth_state, get_auth_state
+
+PROFILE_CLAIM = "profile_uuid"
+ACTIVE_CLAIM = "is_active"
 
 
 class CustomAuthenticationBackend(BaseBackend):
     def authenticate(self, request, email=None, password=None, **kwargs):
         UserModel = get_user_model()
         try:
-            user = UserModel.objects.get(email=email.lower())
+            user = UserModel.objects.by_email(email).get()
         except UserModel.DoesNotExist:
             return None
         if user.check_password(password):
             return user
         return None
+
+
+class ProfileRefreshToken(RefreshToken):
+    """
+    Refresh token carrying the user's profile id and active flag, which are
+    copied into the access tokens it issues.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        try:
+            token[PROFILE_CLAIM] = str(user.user_profile.uuid)
+        except ObjectDoesNotExist:
+            pass
+        token[ACTIVE_CLAIM] = user.is_active
+        return token
+
+
+def lightweight_user(user_id, profile_uuid: uuid.UUID):
+    """
+    A user with only its primary key and active flag loaded and its profile
+    with only the ids loaded. Other fields are deferred, so reading one
+    loads it from the database instead of returning a wrong value.
+    """
+    UserModel = get_user_model()
+    profile_model = cast(Type[Model], UserModel._meta.get_field("user_profile").related_model)
+    user = UserModel.from_db(
+        DEFAULT_DB_ALIAS, [UserModel._meta.pk.attname, "is_active"], [user_id, True]
+    )
+    profile = profile_model.from_db(
+        DEFAULT_DB_ALIAS, ["uuid", "user_id"], [profile_uuid, user_id]
+    )
+    user._state.fields_cache["user_profile"] = profile
+    profile._state.fields_cache["user"] = user
+    return user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication without a user query per request. Tokens issued by
+    ProfileRefreshToken carry the profile id; the user's active flag and
+    password hash are read from a short-lived cache entry which is dropped
+    whenever the user is saved. Tokens without the profile claim fall back to
+    the database lookup of JWTAuthentication. Assumes USER_ID_FIELD is the
+    primary key, the default.
+    """
+
+    def get_user(self, validated_token):
+        if PROFILE_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        user_id = self.get_user_id(validated_token)
+        return self.build_user(validated_token, user_id, get_auth_state(user_id))
+
+    async def aget_user(self, validated_token):
+        if PROFILE_CLAIM not in validated_token:
+            UserModel = get_user_model()
+            user = (
+                await UserModel.objects.select_related("user_profile")
+                .filter(**{api_settings.USER_ID_FIELD: self.get_user_id(validated_token)})
+                .afirst()
+            )
+            return self.check_user(validated_token, user)
+        user_id = self.get_user_id(validated_token)
+        return self.build_user(validated_token, user_id, await aget_auth_state(user_id))
+
+    def get_user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+    def build_user(self, validated_token, user_id, state: Optional[dict]):
+        if state is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if not state["is_active"] or not validated_token.get(ACTIVE_CLAIM, True):
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if str(state["profile_uuid"]) != validated_token[PROFILE_CLAIM]:
+            raise InvalidToken(_("Token has no valid profile"))
+        self.check_revoked(validated_token, state["password_hash"])
+        return lightweight_user(user_id, state["profile_uuid"])
+
+    def check_user(self, validated_token, user):
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN:
+            self.check_revoked(validated_token, get_md5_hash_password(user.password))
+        return user
+
+    @staticmethod
+    def check_revoked(validated_token, password_hash: str) -> None:
+        if (
+            api_settings.CHECK_REVOKE_TOKEN
+            and validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != password_hash
+        ):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
+
+
+async def aauthenticate(request):
+    """
+    Async counterpart of `CachedJWTAuthentication.authenticate` for the
+    async views. Raises NotAuthenticated without a bearer token.
+    """
+    authentication = CachedJWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header is not None else None
+    if raw_token is None:
+        raise NotAuthenticated()
+    validated_token = authentication.get_validated_token(raw_token)
+    return await authentication.aget_user(validated_token)
@@ -0,0 +1,254 @@
+import math
+import random
+import time
+from array import array
+from datetime import timedelta
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from .counters import reconcile_counters
+from .models import (
+    BlockDetail,
+    CustomUser,
+    Friendship,
+    FriendRequest,
+    RequestStatus,
+    UserProfile,
+)
+
+FIRST_NAMES = (
+    "Aarav", "Aditi", "Alex", "Amara", "Ana", "Arjun", "Ben", "Chen", "Chloe",
+    "Daniel", "Divya", "Elena", "Emma", "Fatima", "Gabriel", "Hana", "Ivan",
+    "Jia", "John", "Kavya", "Leo", "Lucia", "Maya", "Mohammed", "Nina", "Omar",
+    "Priya", "Rahul", "Sara", "Sofia", "Tom", "Yuki", "Zara",
+)
+LAST_NAMES = (
+    "Ahmed", "Brown", "Chen", "Das", "Fernandez", "Garcia", "Gupta", "Ivanova",
+    "Jones", "Khan", "Kim", "Kumar", "Lee", "Martin", "Menon", "Miller", "Nair",
+    "Nguyen", "Okafor", "Patel", "Rossi", "Sato", "Silva", "Singh", "Smith",
+    "Tanaka", "Wang", "Williams", "Wilson", "Yilmaz",
+)
+BENCHMARK_PASSWORD = "password123"
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of `samples`.
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def summarize(samples_ms: Sequence[float]) -> Dict[str, float]:
+    return {
+        "count": len(samples_ms),
+        "mean_ms": sum(samples_ms) / len(samples_ms) if samples_ms else 0.0,
+        "p50_ms": percentile(samples_ms, 50),
+        "p95_ms": percentile(samples_ms, 95),
+        "p99_ms": percentile(samples_ms, 99),
+        "max_ms": max(samples_ms, default=0.0),
+    }
+
+
+def time_calls(func: Callable[[], object], iterations: int, warmup: int = 1) -> List[float]:
+    """
+    Call `func` `warmup + iterations` times, returning the durations in
+    milliseconds of the measured calls.
+    """
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def create_synthetic_users(
+    count: int, batch_size: int = 5000, seed: int = 0, email_prefix: str = "bench"
+) -> List:
+    """
+    Bulk insert `count` users with profiles and random names, returning the
+    new profile ids. All users share one precomputed password hash so the
+    load is not dominated by password hashing.
+    """
+    rng = random.Random(seed)
+    password = make_password(BENCHMARK_PASSWORD)
+    offset = CustomUser.objects.filter(email__startswith=email_prefix).count()
+    profile_ids: List = []
+    for start in range(offset, offset + count, batch_size):
+        stop = min(start + batch_size, offset + count)
+        users = [
+            CustomUser(
+                email=f"{email_prefix}{index}@example.com",
+                name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                password=password,
+            )
+            for index in range(start, stop)
+        ]
+        with transaction.atomic():
+            CustomUser.objects.bulk_create(users)
+            if users[0].pk is None:
+                # Backends that can't return ids from bulk inserts.
+                users = list(
+                    CustomUser.objects.filter(
+                        email__in=[user.email for user in users]
+                    ).only("pk")
+                )
+            profiles = UserProfile.objects.bulk_create(
+                [UserProfile(user=user) for user in users]
+            )
+        profile_ids.extend(profile.uuid for profile in profiles)
+    return profile_ids
+
+
+def power_law_degrees(
+    count: int, mean_degree: float, exponent: float, rng: random.Random
+) -> array:
+    """
+    Pareto distributed degrees with the given mean, capped at `count - 1`.
+    `exponent` must be above 1; lower values give heavier tails.
+    """
+    scale = mean_degree * (exponent - 1) / exponent
+    cap = max(count - 1, 0)
+    return array(
+        "q", (min(int(rng.paretovariate(exponent) * scale), cap) for _ in range(count))
+    )
+
+
+def configuration_model_edges(degrees: array, rng: random.Random) -> Iterator[Tuple[int, int]]:
+    """
+    Pair up degree "stubs" at random, yielding node index pairs. Self loops
+    are dropped; duplicate pairs are left to the unique constraints.
+    """
+    stubs = array("q")
+    for node, degree in enumerate(degrees):
+        stubs.extend([node] * degree)
+    rng.shuffle(stubs)
+    for position in range(0, len(stubs) - 1, 2):
+        a, b = stubs[position], stubs[position + 1]
+        if a != b:
+            yield a, b
+
+
+def random_pairs(count: int, population: int, rng: random.Random) -> Iterator[Tuple[int, int]]:
+    """
+    `count` uniformly random ordered pairs of distinct node indexes. For
+    realistic sizes the chance of drawing two friends is negligible.
+    """
+    if population < 2:
+        return
+    for _ in range(count):
+        a, b = rng.randrange(population), rng.randrange(population - 1)
+        yield a, b + (b >= a)
+
+
+def _batched(items: Iterator, batch_size: int) -> Iterator[List]:
+    batch: List = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def generate_social_graph(
+    users: int,
+    mean_friends: float = 20,
+    exponent: float = 2.5,
+    pending_per_user: float = 2,
+    rejected_per_user: float = 1,
+    blocks_per_user: float = 0.2,
+    batch_size: int = 5000,
+    seed: int = 0,
+) -> Dict[str, int]:
+    """
+    Bulk load `users` synthetic users with power-law friend degrees plus
+    random pending requests, rejected requests (half of them still cooling
+    down) and blocks. Friendships are written the way `accept_many` writes
+    them: an accepted request, the M2M row and both adjacency rows. Returns
+    the number of rows written per kind.
+    """
+    rng = random.Random(seed)
+    profile_ids = create_synthetic_users(users, batch_size=batch_size, seed=seed)
+    population = len(profile_ids)
+    through = UserProfile.friends.through
+    counts = {"users": population, "friendships": 0, "pending": 0, "rejected": 0, "blocks": 0}
+
+    degrees = power_law_degrees(population, mean_friends, exponent, rng)
+    for batch in _batched(configuration_model_edges(degrees, rng), batch_size):
+        id_pairs = [(profile_ids[a], profile_ids[b]) for a, b in batch]
+        with transaction.atomic():
+            FriendRequest.objects.bulk_create(
+                [
+                    FriendRequest(sender_id=a, receiver_id=b, status=RequestStatus.ACCEPTED)
+                    for a, b in id_pairs
+                ],
+                ignore_conflicts=True,
+            )
+            through.objects.bulk_create(
+                [through(from_userprofile_id=a, to_userprofile_id=b) for a, b in id_pairs],
+                ignore_conflicts=True,
+            )
+            Friendship.objects.bulk_create(
+                [
+                    edge
+                    for a, b in id_pairs
+                    for edge in (
+                        Friendship(profile_id=a, friend_id=b),
+                        Friendship(profile_id=b, friend_id=a),
+                    )
+                ],
+                ignore_conflicts=True,
+            )
+        counts["friendships"] += len(id_pairs)
+
+    now = timezone.now()
+    cooldown = timedelta(seconds=settings.COOLDOWN_TIME)
+    requests = (
+        ("pending", pending_per_user, lambda index: {"status": RequestStatus.PENDING}),
+        (
+            "rejected",
+            rejected_per_user,
+            lambda index: {
+                "status": RequestStatus.REJECTED,
+                "cooldown_time": now + cooldown if index % 2 else now - cooldown,
+            },
+        ),
+    )
+    for kind, per_user, fields in requests:
+        pairs = random_pairs(int(population * per_user), population, rng)
+        for batch in _batched(pairs, batch_size):
+            FriendRequest.objects.bulk_create(
+                [
+                    FriendRequest(
+                        sender_id=profile_ids[a], receiver_id=profile_ids[b], **fields(index)
+                    )
+                    for index, (a, b) in enumerate(batch)
+                ],
+                ignore_conflicts=True,
+            )
+            counts[kind] += len(batch)
+
+    pairs = random_pairs(int(population * blocks_per_user), population, rng)
+    for batch in _batched(pairs, batch_size):
+        # bulk_create skips BlockDetail.save(), so no cache invalidation runs;
+        # generate data before warming any cache.
+        BlockDetail.objects.bulk_create(
+            [BlockDetail(blocker_id=profile_ids[a], blocked_id=profile_ids[b]) for a, b in batch],
+            ignore_conflicts=True,
+        )
+        counts["blocks"] += len(batch)
+    # Bulk inserts bypass the counter updates; recount once at the end.
+    reconcile_counters(batch_size=batch_size)
+    return counts
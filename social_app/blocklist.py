@@ -0,0 +1,131 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import FrozenSet, Optional
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+
+from .async_cache import get_async_cache
+from .instrumentation import record_cache_lookup
+
+
+class LocalLRUCache:
+    """
+    Small thread-safe LRU with a per-entry TTL, used as an in-process tier
+    in front of the shared cache.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+local_cache = LocalLRUCache(
+    maxsize=settings.BLOCKLIST_LOCAL_MAXSIZE, ttl=settings.BLOCKLIST_LOCAL_TTL
+)
+
+
+def _cache_key(profile_id) -> str:
+    return f"blocked_by_{profile_id}"
+
+
+def _as_uuid(value) -> Optional[uuid.UUID]:
+    if isinstance(value, uuid.UUID):
+        return value
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+def get_blocker_ids(profile_id) -> FrozenSet[uuid.UUID]:
+    """
+    Ids of the profiles which blocked `profile_id`, read from the local LRU,
+    then the shared cache, then the database.
+    """
+    key = _cache_key(profile_id)
+    blocker_ids = local_cache.get(key)
+    if blocker_ids is not None:
+        record_cache_lookup(hit=True)
+        return blocker_ids
+    blocker_ids = cache.get(key)
+    record_cache_lookup(hit=blocker_ids is not None)
+    if blocker_ids is None:
+        BlockDetail = apps.get_model("social_app", "BlockDetail")
+        blocker_ids = frozenset(
+            BlockDetail.objects.filter(blocked_id=profile_id).values_list(
+                "blocker_id", flat=True
+            )
+        )
+        cache.set(key, blocker_ids, timeout=settings.BLOCKLIST_CACHE_TIMEOUT)
+    local_cache.set(key, blocker_ids)
+    return blocker_ids
+
+
+async def aget_blocker_ids(profile_id) -> FrozenSet[uuid.UUID]:
+    """
+    `get_blocker_ids` for async views.
+    """
+    key = _cache_key(profile_id)
+    blocker_ids = local_cache.get(key)
+    if blocker_ids is not None:
+        record_cache_lookup(hit=True)
+        return blocker_ids
+    async_cache = get_async_cache()
+    blocker_ids = await async_cache.get(key)
+    record_cache_lookup(hit=blocker_ids is not None)
+    if blocker_ids is None:
+        BlockDetail = apps.get_model("social_app", "BlockDetail")
+        rows = BlockDetail.objects.filter(blocked_id=profile_id).values_list(
+            "blocker_id", flat=True
+        )
+        blocker_ids = frozenset([blocker_id async for blocker_id in rows])
+        await async_cache.set(key, blocker_ids, timeout=settings.BLOCKLIST_CACHE_TIMEOUT)
+    local_cache.set(key, blocker_ids)
+    return blocker_ids
+
+
+def is_blocked_by(profile_id, blocker_id) -> bool:
+    return _as_uuid(blocker_id) in get_blocker_ids(profile_id)
+
+
+def invalidate_blocker_ids(profile_id) -> None:
+    """
+    Drop the cached blockers of `profile_id`. Other processes drop their
+    local copy when it expires, after at most BLOCKLIST_LOCAL_TTL seconds.
+    """
+    key = _cache_key(profile_id)
+    local_cache.delete(key)
+    cache.delete(key)
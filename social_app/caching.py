@@ -0,0 +1,127 @@
+import time
+from functools import partial
+from typing import Dict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .async_cache import get_async_cache
+from .db_routing import pin_to_primary
+from .instrumentation import record_cache_lookup
+
+FRIENDS_LIST = "friends_list"
+PENDING_LIST = "pending_list"
+
+LIST_CACHE_TIMEOUT: int = settings.LIST_CACHE_TIMEOUT
+
+
+def _version_key(namespace: str, profile_id) -> str:
+    return f"{namespace}_version_{profile_id}"
+
+
+def _stats_key(namespace: str, kind: str) -> str:
+    return f"cache_stats_{namespace}_{kind}"
+
+
+def get_cache_version(namespace: str, profile_id) -> int:
+    """
+    Current cache version of a user's list. A missing version (never set or
+    evicted) is seeded from the clock so entries written under an older
+    version can never be served again.
+    """
+    key = _version_key(namespace, profile_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+async def aget_cache_version(namespace: str, profile_id) -> int:
+    async_cache = get_async_cache()
+    key = _version_key(namespace, profile_id)
+    version = await async_cache.get(key)
+    if version is None:
+        await async_cache.add(key, time.time_ns(), timeout=None)
+        version = await async_cache.get(key)
+    return version
+
+
+def invalidate_list_cache(namespace: str, *profile_ids) -> None:
+    """
+    Bump the version of the given users' lists, orphaning every cached page,
+    and pin the users to the primary database so the pages are not refilled
+    from a lagging replica. Both happen once the current transaction
+    commits (straight away outside one); bumped any earlier, a concurrent
+    read could miss, load the rows as they were before the write and cache
+    that page under the new version.
+    """
+    transaction.on_commit(partial(_bump_versions, namespace, profile_ids))
+
+
+def _bump_versions(namespace: str, profile_ids) -> None:
+    pin_to_primary(*profile_ids)
+    for profile_id in profile_ids:
+        try:
+            cache.incr(_version_key(namespace, profile_id))
+        except ValueError:
+            # No version yet, the next read seeds a fresh one.
+            pass
+
+
+def invalidate_user_lists(*profile_ids) -> None:
+    invalidate_list_cache(FRIENDS_LIST, *profile_ids)
+    invalidate_list_cache(PENDING_LIST, *profile_ids)
+
+
+def _incr_counter(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+async def _aincr_counter(key: str) -> None:
+    async_cache = get_async_cache()
+    try:
+        await async_cache.incr(key)
+    except ValueError:
+        if not await async_cache.add(key, 1, timeout=None):
+            await async_cache.incr(key)
+
+
+def record_cache_hit(namespace: str) -> None:
+    _incr_counter(_stats_key(namespace, "hits"))
+    record_cache_lookup(hit=True)
+
+
+def record_cache_miss(namespace: str) -> None:
+    _incr_counter(_stats_key(namespace, "misses"))
+    record_cache_lookup(hit=False)
+
+
+async def arecord_cache_hit(namespace: str) -> None:
+    await _aincr_counter(_stats_key(namespace, "hits"))
+    record_cache_lookup(hit=True)
+
+
+async def arecord_cache_miss(namespace: str) -> None:
+    await _aincr_counter(_stats_key(namespace, "misses"))
+    record_cache_lookup(hit=False)
+
+
+def get_cache_stats(namespace: str) -> Dict[str, float]:
+    hits: int = cache.get(_stats_key(namespace, "hits"), 0)
+    misses: int = cache.get(_stats_key(namespace, "misses"), 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": hits / total if total else 0.0,
+    }
+
+
+def reset_cache_stats(namespace: str) -> None:
+    cache.delete_many([_stats_key(namespace, "hits"), _stats_key(namespace, "misses")])
@@ -0,0 +1,24 @@
+import uuid
+from typing import List, Set
+
+from .outbox import REQUEST_ACCEPTED, USER_BLOCKED, USER_UNBLOCKED, BaseConsumer
+from .suggestions import refresh_suggestions
+
+
+class SuggestionRefreshConsumer(BaseConsumer):
+    """
+    Recomputes the suggestions of both users of a new friendship or block,
+    instead of waiting for the next full `compute_friend_suggestions` run.
+    """
+
+    topics = (REQUEST_ACCEPTED, USER_BLOCKED, USER_UNBLOCKED)
+
+    def handle(self, events: List) -> None:
+        profile_ids: Set[uuid.UUID] = set()
+        for event in events:
+            if event.topic == REQUEST_ACCEPTED:
+                keys = ("sender_id", "receiver_id")
+            else:
+                keys = ("blocker_id", "blocked_id")
+            profile_ids.update(uuid.UUID(event.payload[key]) for key in keys)
+        refresh_suggestions(profile_ids)
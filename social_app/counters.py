@@ -0,0 +1,145 @@
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+# Denormalized per-profile counts, stored on UserProfile and adjusted in the
+# same transaction as the rows they count. `reconcile_counters` repairs any
+# drift left by writes that bypass the model methods.
+FRIENDS = "friend_count"
+PENDING_RECEIVED = "pending_received_count"
+PENDING_SENT = "pending_sent_count"
+COUNTER_FIELDS = (FRIENDS, PENDING_RECEIVED, PENDING_SENT)
+
+
+def _profiles():
+    return apps.get_model("social_app", "UserProfile").objects
+
+
+def adjust_counter(field: str, deltas: Mapping) -> None:
+    """
+    Add `deltas[profile_id]` to each profile's counter, with one UPDATE per
+    distinct delta. Counters are clamped at zero.
+    """
+    by_delta: Dict[int, List] = defaultdict(list)
+    for profile_id, delta in deltas.items():
+        if delta:
+            by_delta[delta].append(profile_id)
+    for delta, profile_ids in sorted(by_delta.items()):
+        value = F(field) + delta
+        if delta < 0:
+            value = Greatest(value, Value(0))
+        _profiles().filter(uuid__in=profile_ids).update(**{field: value})
+
+
+def adjust_pending(requests: Iterable, sign: int) -> None:
+    """
+    Count requests entering (sign=1) or leaving (sign=-1) the pending state.
+    """
+    requests = list(requests)
+    received = Counter(request.receiver_id for request in requests)
+    sent = Counter(request.sender_id for request in requests)
+    adjust_counter(PENDING_RECEIVED, {key: sign * count for key, count in received.items()})
+    adjust_counter(PENDING_SENT, {key: sign * count for key, count in sent.items()})
+
+
+def unstored_friendships(pairs: Iterable[Tuple]) -> List[Tuple]:
+    """
+    The (profile_id, friend_id) pairs not stored as friendships yet, with
+    duplicates in either direction removed.
+    """
+    unique: Dict = {}
+    for pair in pairs:
+        unique.setdefault(frozenset(pair), tuple(pair))
+    if not unique:
+        return []
+    Friendship = apps.get_model("social_app", "Friendship")
+    stored = set(
+        Friendship.objects.filter(
+            profile_id__in={profile_id for profile_id, _ in unique.values()},
+            friend_id__in={friend_id for _, friend_id in unique.values()},
+        ).values_list("profile_id", "friend_id")
+    )
+    return [pair for pair in unique.values() if pair not in stored]
+
+
+def count_friendships(pairs: Iterable[Tuple]) -> None:
+    """
+    Count new friendships, as returned by `unstored_friendships`.
+    """
+    deltas: Counter = Counter()
+    for profile_id, friend_id in pairs:
+        deltas.update({profile_id, friend_id})
+    adjust_counter(FRIENDS, deltas)
+
+
+def profile_counter(profile_id, field: str) -> Optional[int]:
+    return _profiles().filter(uuid=profile_id).values_list(field, flat=True).first()
+
+
+async def aprofile_counter(profile_id, field: str) -> Optional[int]:
+    return await _profiles().filter(uuid=profile_id).values_list(field, flat=True).afirst()
+
+
+def _count_of(model_name: str, profile_field: str, **filters):
+    rows = (
+        apps.get_model("social_app", model_name)
+        .objects.filter(**{profile_field: OuterRef("uuid")}, **filters)
+        .order_by()
+        .values(profile_field)
+        .annotate(total=Count("*"))
+        .values("total")
+    )
+    return Coalesce(Subquery(rows, output_field=IntegerField()), 0)
+
+
+def actual_counts():
+    """
+    The true value of every counter, as annotations for a profile queryset.
+    """
+    from .models import RequestStatus
+
+    return {
+        FRIENDS: _count_of("Friendship", "profile"),
+        PENDING_RECEIVED: _count_of("FriendRequest", "receiver", status=RequestStatus.PENDING),
+        PENDING_SENT: _count_of("FriendRequest", "sender", status=RequestStatus.PENDING),
+    }
+
+
+def reconcile_counters(batch_size: int = 1000, dry_run: bool = False) -> Dict[str, int]:
+    """
+    Recount every profile's counters in batches and fix the ones that
+    drifted. Each batch locks its profiles before counting, so concurrent
+    adjustments either are counted or apply on top of the fixed value.
+    Returns the number of profiles checked and fixed.
+    """
+    result = {"checked": 0, "fixed": 0}
+    last = None
+    while True:
+        with transaction.atomic():
+            batch = _profiles().order_by("uuid")
+            if last is not None:
+                batch = batch.filter(uuid__gt=last)
+            profile_ids = list(
+                batch.select_for_update().values_list("uuid", flat=True)[:batch_size]
+            )
+            if not profile_ids:
+                return result
+            last = profile_ids[-1]
+            actual_fields = {f"actual_{field}": value for field, value in actual_counts().items()}
+            rows = (
+                _profiles()
+                .filter(uuid__in=profile_ids)
+                .annotate(**actual_fields)
+                .values("uuid", *COUNTER_FIELDS, *actual_fields)
+            )
+            for row in rows:
+                actual = {field: row[f"actual_{field}"] for field in COUNTER_FIELDS}
+                if any(row[field] != actual[field] for field in COUNTER_FIELDS):
+                    result["fixed"] += 1
+                    if not dry_run:
+                        _profiles().filter(uuid=row["uuid"]).update(**actual)
+            result["checked"] += len(profile_ids)
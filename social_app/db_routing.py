@@ -0,0 +1,129 @@
+import functools
+import random
+from asyncio import iscoroutinefunction
+from contextvars import ContextVar
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.functional import SimpleLazyObject
+
+
+def _pin_key(profile_id) -> str:
+    return f"replica_pin_{profile_id}"
+
+
+def pin_to_primary(*profile_ids) -> None:
+    """
+    Serve the given users' reads from the primary for REPLICA_PIN_SECONDS,
+    so they read their own writes while the replicas catch up.
+    """
+    if settings.DATABASE_REPLICAS and profile_ids:
+        cache.set_many(
+            {_pin_key(profile_id): 1 for profile_id in profile_ids},
+            timeout=settings.REPLICA_PIN_SECONDS,
+        )
+
+
+def is_pinned(profile_id) -> bool:
+    return cache.get(_pin_key(profile_id)) is not None
+
+
+class ReadRoute:
+    """
+    Where one request's reads go: a replica, unless the authenticated user's
+    profile is pinned to the primary. The pin is checked once the view has
+    authenticated the user; reads made before that (authentication itself)
+    go to the replica.
+    """
+
+    def __init__(self, request, replica: str) -> None:
+        self.request = request
+        self.replica = replica
+        self.alias: Optional[str] = None
+        self.resolving = False
+
+    def read_alias(self) -> str:
+        if self.alias is None and not self.resolving:
+            self.resolving = True
+            try:
+                profile_id = self.profile_id()
+                if profile_id is not None:
+                    self.alias = DEFAULT_DB_ALIAS if is_pinned(profile_id) else self.replica
+            finally:
+                self.resolving = False
+        return self.alias or self.replica
+
+    def profile_id(self):
+        # DRF sets `user` on the Django request once it has authenticated;
+        # until then it is AuthenticationMiddleware's lazy session user.
+        user = self.request.__dict__.get("user")
+        if user is None or isinstance(user, SimpleLazyObject) or not user.is_authenticated:
+            return None
+        # May load the profile, which is a read through this route.
+        return user.user_profile.uuid
+
+
+_route: ContextVar[Optional[ReadRoute]] = ContextVar("read_route", default=None)
+
+
+class ReplicaRouter:
+    """
+    Sends reads made inside `replica_reads` views to the route's database,
+    everything else to the primary.
+    """
+
+    def db_for_read(self, model, **hints) -> Optional[str]:
+        route = _route.get()
+        if route is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return route.read_alias()
+
+    def db_for_write(self, model, **hints) -> str:
+        # Rows read from a replica are saved to the primary.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints) -> Optional[bool]:
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+def replica_reads(view_class):
+    """
+    Class decorator for read-only views (sync or async): reads made while
+    handling a request go to one of DATABASE_REPLICAS, picked per request.
+    """
+    dispatch = view_class.dispatch
+
+    def start_route(request):
+        if not settings.DATABASE_REPLICAS:
+            return None
+        return _route.set(ReadRoute(request, random.choice(settings.DATABASE_REPLICAS)))
+
+    if iscoroutinefunction(dispatch):
+
+        @functools.wraps(dispatch)
+        async def routed_dispatch(self, request, *args, **kwargs):
+            token = start_route(request)
+            try:
+                return await dispatch(self, request, *args, **kwargs)
+            finally:
+                if token is not None:
+                    _route.reset(token)
+
+    else:
+
+        @functools.wraps(dispatch)
+        def routed_dispatch(self, request, *args, **kwargs):
+            token = start_route(request)
+            try:
+                return dispatch(self, request, *args, **kwargs)
+            finally:
+                if token is not None:
+                    _route.reset(token)
+
+    view_class.dispatch = routed_dispatch
+    return view_class
@@ -0,0 +1,322 @@
+import csv
+import gzip
+import io
+import json
+import os
+import zlib
+from dataclasses import dataclass
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    TypedDict,
+    Union,
+)
+
+from django.apps import apps
+from django.db.models import Q
+
+# Every record has these keys, so NDJSON and CSV exports share one schema.
+# `source` and `target` are the two profiles of the edge: friend, sender
+# and receiver, or blocker and blocked.
+EXPORT_FIELDS = (
+    "type",
+    "id",
+    "source",
+    "target",
+    "status",
+    "created_at",
+    "updated_at",
+    "cooldown_time",
+)
+NDJSON = "ndjson"
+CSV = "csv"
+FORMATS = (NDJSON, CSV)
+CONTENT_TYPES = {NDJSON: "application/x-ndjson", CSV: "text/csv"}
+
+# Bytes of encoded records gathered before a chunk is yielded.
+BUFFER_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True)
+class Section:
+    name: str
+    model_name: str
+    record_type: str
+    # Export field -> model field, in EXPORT_FIELDS order.
+    columns: Dict[str, str]
+    # The rows of one profile, given its id.
+    owned_by: Callable[[object], Q]
+
+    def rows(self, profile_id=None, after=None):
+        rows = apps.get_model("social_app", self.model_name).objects.order_by("pk")
+        if profile_id is not None:
+            rows = rows.filter(self.owned_by(profile_id))
+        if after is not None:
+            rows = rows.filter(pk__gt=after)
+        return rows
+
+    def queryset(self, profile_id=None, after=None):
+        return self.rows(profile_id, after).values_list("pk", *self.columns.values())
+
+
+def _requests(name: str, model_name: str, record_type: str) -> Section:
+    return Section(
+        name,
+        model_name,
+        record_type,
+        {
+            "id": "uuid",
+            "source": "sender_id",
+            "target": "receiver_id",
+            "status": "status",
+            "created_at": "created_at",
+            "updated_at": "updated_at",
+            "cooldown_time": "cooldown_time",
+        },
+        lambda profile_id: Q(sender_id=profile_id) | Q(receiver_id=profile_id),
+    )
+
+
+SECTIONS: Tuple[Section, ...] = (
+    Section(
+        "friendships",
+        "Friendship",
+        "friend",
+        {"id": "id", "source": "profile_id", "target": "friend_id", "created_at": "created_at"},
+        lambda profile_id: Q(profile_id=profile_id),
+    ),
+    _requests("requests", "FriendRequest", "request"),
+    _requests("archived_requests", "ArchivedFriendRequest", "archived_request"),
+    Section(
+        "blocks",
+        "BlockDetail",
+        "block",
+        {
+            "id": "uuid",
+            "source": "blocker_id",
+            "target": "blocked_id",
+            "created_at": "created_at",
+            "updated_at": "updated_at",
+        },
+        # Blocks made by the profile; who blocked it is not its data.
+        lambda profile_id: Q(blocker_id=profile_id),
+    ),
+)
+
+
+def _plain(value):
+    if value is None or isinstance(value, (str, int)):
+        return value
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def section_rows(
+    section: Section, profile_id=None, after=None, chunk_size: int = 2000
+) -> Iterator[Tuple[object, tuple]]:
+    """
+    (pk, record values in EXPORT_FIELDS order) for the section's rows in pk
+    order, read through a server-side cursor where the database has them.
+    """
+    record = _record_maker(section)
+    for row in section.queryset(profile_id, after).iterator(chunk_size=chunk_size):
+        yield row[0], record(row)
+
+
+async def asection_rows(
+    section: Section, profile_id=None, chunk_size: int = 2000
+) -> AsyncIterator[Tuple[object, tuple]]:
+    """
+    section_rows() read with aiterator(), for streaming under ASGI.
+    """
+    record = _record_maker(section)
+    # values() rather than values_list(): the values_list() iterable runs its
+    # query as soon as it is created, which aiterator() does on the event loop.
+    rows = section.rows(profile_id).values("pk", *section.columns.values())
+    async for row in rows.aiterator(chunk_size=chunk_size):
+        values = tuple(row.values())
+        yield values[0], record(values)
+
+
+def _record_maker(section: Section) -> Callable[[tuple], tuple]:
+    positions = [
+        1 + list(section.columns).index(field) if field in section.columns else None
+        for field in EXPORT_FIELDS[1:]
+    ]
+
+    def record(row: tuple) -> tuple:
+        return (section.record_type,) + tuple(
+            None if position is None else _plain(row[position]) for position in positions
+        )
+
+    return record
+
+
+class RecordEncoder:
+    """
+    Encodes records to NDJSON lines or CSV rows, with a CSV header first
+    unless `header` is False.
+    """
+
+    def __init__(self, fmt: str, header: bool = True) -> None:
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown export format {fmt!r}.")
+        self.fmt = fmt
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer, lineterminator="\n") if fmt == CSV else None
+        if self.writer is not None and header:
+            self.writer.writerow(EXPORT_FIELDS)
+
+    def write(self, values: tuple) -> None:
+        if self.writer is not None:
+            self.writer.writerow(values)
+        else:
+            self.buffer.write(json.dumps(dict(zip(EXPORT_FIELDS, values))))
+            self.buffer.write("\n")
+
+    def size(self) -> int:
+        return self.buffer.tell()
+
+    def take(self) -> bytes:
+        data = self.buffer.getvalue().encode()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return data
+
+
+def export_profile(profile_id, fmt: str, chunk_size: int = 2000) -> Iterator[bytes]:
+    """
+    A profile's friendships, sent and received requests (archived ones
+    included) and blocks, as chunks of about BUFFER_SIZE bytes.
+    """
+    encoder = RecordEncoder(fmt)
+    for section in SECTIONS:
+        for _, values in section_rows(section, profile_id, chunk_size=chunk_size):
+            encoder.write(values)
+            if encoder.size() >= BUFFER_SIZE:
+                yield encoder.take()
+    data = encoder.take()
+    if data:
+        yield data
+
+
+class ExportState(TypedDict):
+    """
+    Checkpoint of a whole graph dump: the section to carry on with (None
+    once done), the last pk exported from it, and the records and bytes
+    written so far.
+    """
+
+    section: Optional[str]
+    after: Union[str, int, None]
+    records: int
+    offset: int
+
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Compress a stream of chunks into one gzip member, chunk by chunk.
+    """
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+async def agzip_chunks(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """
+    gzip_chunks() over an async stream of chunks.
+    """
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def dump_graph(
+    path: str,
+    fmt: str,
+    checkpoint_path: Optional[str] = None,
+    compress: bool = False,
+    chunk_size: int = 2000,
+    checkpoint_every: int = 10000,
+    progress: Optional[Callable[[ExportState], None]] = None,
+) -> ExportState:
+    """
+    Write every section of the whole graph to `path`. After each
+    `checkpoint_every` records the file is flushed and the checkpoint
+    records the last exported pk and the file size; a rerun with the same
+    checkpoint truncates the file to that size and carries on after that
+    pk, so each record is written exactly once. With `compress`, every
+    checkpointed chunk is its own gzip member, which gzip readers read as
+    one stream. Returns the final checkpoint.
+    """
+    state: ExportState = {"section": SECTIONS[0].name, "after": None, "records": 0, "offset": 0}
+    if checkpoint_path and os.path.exists(checkpoint_path):
+        with open(checkpoint_path) as checkpoint:
+            state = json.load(checkpoint)
+    names = [section.name for section in SECTIONS]
+    if state["section"] is None:
+        return state
+
+    mode = "r+b" if state["offset"] else "wb"
+    with open(path, mode) as output:
+        output.truncate(state["offset"])
+        output.seek(state["offset"])
+        encoder = RecordEncoder(fmt, header=state["offset"] == 0)
+
+        def save(section_name, after) -> None:
+            data = encoder.take()
+            output.write(gzip.compress(data) if compress and data else data)
+            output.flush()
+            os.fsync(output.fileno())
+            state["section"], state["after"] = section_name, after
+            state["offset"] = output.tell()
+            if checkpoint_path:
+                with open(checkpoint_path + ".tmp", "w") as checkpoint:
+                    json.dump(state, checkpoint)
+                os.replace(checkpoint_path + ".tmp", checkpoint_path)
+            if progress is not None:
+                progress(state.copy())
+
+        resume = state["section"]
+        for section in SECTIONS[names.index(resume):]:
+            after = state["after"] if section.name == resume else None
+            pending = 0
+            for pk, values in section_rows(section, after=after, chunk_size=chunk_size):
+                encoder.write(values)
+                state["records"] += 1
+                pending += 1
+                if pending >= checkpoint_every:
+                    save(section.name, _plain(pk))
+                    pending = 0
+            index = names.index(section.name) + 1
+            save(names[index] if index < len(names) else None, None)
+    return state
+
+
+async def aexport_profile(profile_id, fmt: str, chunk_size: int = 2000) -> AsyncIterator[bytes]:
+    """
+    export_profile() as an async stream, so ASGI servers send each chunk as
+    it is read instead of collecting the whole export first.
+    """
+    encoder = RecordEncoder(fmt)
+    for section in SECTIONS:
+        async for _, values in asection_rows(section, profile_id, chunk_size=chunk_size):
+            encoder.write(values)
+            if encoder.size() >= BUFFER_SIZE:
+                yield encoder.take()
+    data = encoder.take()
+    if data:
+        yield data
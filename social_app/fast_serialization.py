@@ -0,0 +1,126 @@
+from functools import lru_cache
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.encoding import force_str
+from rest_framework import serializers
+
+# Field classes whose to_representation is exactly one builtin call.
+_BUILTIN_CONVERTERS = {
+    serializers.CharField: str,
+    serializers.EmailField: str,
+    serializers.IntegerField: int,
+}
+
+
+class RowMapper:
+    """
+    Turns `values_list(*columns)` rows into the dicts a serializer returns
+    for the same objects, with a function generated once per serializer.
+    """
+
+    def __init__(self, columns: Sequence[str], map_row: Callable[[tuple], dict]) -> None:
+        self.columns = tuple(columns)
+        self.map_row = map_row
+
+    def map_rows(self, rows) -> List[dict]:
+        map_row = self.map_row
+        return [map_row(row) for row in rows]
+
+
+class RowListSerializer:
+    """
+    Stands in for `serializer_class(rows, many=True)` on rows loaded with
+    `row_queryset`.
+    """
+
+    def __init__(self, serializer_class, rows) -> None:
+        self.mapper = compile_row_mapper(serializer_class)
+        self.rows = rows
+
+    @property
+    def data(self) -> List[dict]:
+        return self.mapper.map_rows(self.rows)
+
+
+def _converter(field: serializers.Field) -> Callable:
+    if type(field) in _BUILTIN_CONVERTERS:
+        return _BUILTIN_CONVERTERS[type(field)]
+    if type(field) is serializers.UUIDField and field.uuid_format == "hex_verbose":
+        return str
+    return field.to_representation
+
+
+def _display_converter(field: serializers.Field, model, name: str) -> Callable:
+    """
+    Converter for a `get_<name>_display` source, reading the `name` column.
+    """
+    choices = dict(model._meta.get_field(name).flatchoices)
+    convert = _converter(field)
+    return lambda value: convert(force_str(choices.get(value, value), strings_only=True))
+
+
+def _compile(serializer, prefix: str, model, columns: List[str], namespace: Dict) -> str:
+    """
+    Source of a dict display for `serializer`'s readable fields, adding the
+    columns it reads to `columns` and its converters to `namespace`.
+    """
+    items = []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        attrs = field.source_attrs
+        if not attrs or isinstance(field, serializers.SerializerMethodField):
+            raise ImproperlyConfigured(
+                f"{type(serializer).__name__}.{name} can't be read from a values() row."
+            )
+        related = model
+        for attr in attrs[:-1]:
+            related = related._meta.get_field(attr).related_model
+        path = prefix + "__".join(attrs[:-1]) + ("__" if len(attrs) > 1 else "")
+        if isinstance(field, serializers.BaseSerializer):
+            relation = related._meta.get_field(attrs[-1])
+            if relation.null:
+                # The serializer would return None rather than a dict.
+                raise ImproperlyConfigured(
+                    f"{type(serializer).__name__}.{name} is a nullable relation."
+                )
+            nested_model = relation.related_model
+            nested = _compile(field, f"{path}{attrs[-1]}__", nested_model, columns, namespace)
+            items.append(f"{name!r}: {nested}")
+            continue
+        attr = attrs[-1]
+        if attr.startswith("get_") and attr.endswith("_display"):
+            attr = attr[len("get_"):-len("_display")]
+            convert = _display_converter(field, related, attr)
+        else:
+            convert = _converter(field)
+        column = path + attr
+        if column not in columns:
+            columns.append(column)
+        converter_name = f"convert_{len(namespace)}"
+        namespace[converter_name] = convert
+        value = f"row[{columns.index(column)}]"
+        # Serializers return None for missing values without converting them.
+        items.append(f"{name!r}: None if {value} is None else {converter_name}({value})")
+    return "{" + ", ".join(items) + "}"
+
+
+@lru_cache(maxsize=None)
+def compile_row_mapper(serializer_class) -> RowMapper:
+    serializer = serializer_class()
+    columns: List[str] = []
+    namespace: Dict = {}
+    body = _compile(serializer, "", serializer_class.Meta.model, columns, namespace)
+    exec(f"def map_row(row):\n    return {body}\n", namespace)
+    return RowMapper(columns, namespace["map_row"])
+
+
+def row_queryset(serializer_class, queryset, extra_fields: Tuple[str, ...] = ()):
+    """
+    `queryset` as named rows of exactly the serializer's columns, plus
+    `extra_fields` (e.g. keyset pagination columns) after them.
+    """
+    columns = compile_row_mapper(serializer_class).columns
+    extra = [field for field in extra_fields if field not in columns]
+    return queryset.values_list(*columns, *extra, named=True)
@@ -0,0 +1,75 @@
+from typing import Iterable, List, Set, Tuple
+
+from django.db import transaction
+from django.db.models import QuerySet
+
+from .counters import FRIENDS, count_friendships, unstored_friendships
+from .models import Friendship, UserProfile
+
+
+def add_friendships(pairs: Iterable[Tuple]) -> None:
+    """
+    Store each (profile_id, friend_id) pair in both directions and count the
+    new ones in the profiles' friend counters.
+    """
+    pairs = unstored_friendships(pairs)
+    edges: List[Friendship] = []
+    for profile_id, friend_id in pairs:
+        edges.append(Friendship(profile_id=profile_id, friend_id=friend_id))
+        edges.append(Friendship(profile_id=friend_id, friend_id=profile_id))
+    with transaction.atomic():
+        Friendship.objects.bulk_create(edges, ignore_conflicts=True)
+        count_friendships(pairs)
+
+
+def are_friends(profile_id, other_id) -> bool:
+    return Friendship.objects.filter(profile_id=profile_id, friend_id=other_id).exists()
+
+
+def friend_ids(profile_id) -> Set:
+    return set(
+        Friendship.objects.filter(profile_id=profile_id).values_list(
+            "friend_id", flat=True
+        )
+    )
+
+
+def friend_count(profile_id) -> int:
+    return Friendship.objects.filter(profile_id=profile_id).count()
+
+
+def mutual_friend_ids(profile_id, other_id) -> Set:
+    other_friends = Friendship.objects.filter(profile_id=other_id).values("friend_id")
+    return set(
+        Friendship.objects.filter(
+            profile_id=profile_id, friend_id__in=other_friends
+        ).values_list("friend_id", flat=True)
+    )
+
+
+def friends_of(profile_id) -> QuerySet[UserProfile]:
+    return UserProfile.objects.filter(friend_of__profile_id=profile_id)
+
+
+def rebuild_friend_graph(batch_size: int = 5000) -> int:
+    """
+    Recreate the adjacency table from the `UserProfile.friends` M2M table,
+    treating every M2M row as an undirected friendship. Returns the number of
+    M2M rows read.
+    """
+    through = UserProfile.friends.through
+    rows = through.objects.values_list("from_userprofile_id", "to_userprofile_id")
+    total = 0
+    with transaction.atomic():
+        Friendship.objects.all().delete()
+        UserProfile.objects.update(**{FRIENDS: 0})
+        batch: List[Tuple] = []
+        for pair in rows.iterator(chunk_size=batch_size):
+            batch.append(pair)
+            if len(batch) >= batch_size:
+                add_friendships(batch)
+                total += len(batch)
+                batch = []
+        add_friendships(batch)
+        total += len(batch)
+    return total
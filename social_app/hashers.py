@@ -0,0 +1,37 @@
+from typing import Optional
+
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, PBKDF2PasswordHasher
+
+# Missing from django-stubs.
+from django.contrib.auth.hashers import ScryptPasswordHasher  # type: ignore[attr-defined]
+
+
+class TunableHasherMixin:
+    """
+    Takes the hasher's cost parameters from PASSWORD_HASHER_OPTIONS, keyed by
+    algorithm, when Django loads PASSWORD_HASHERS. Hashes made with other
+    parameters still verify and are rehashed on the user's next login.
+    """
+
+    algorithm: Optional[str]
+
+    def __init__(self) -> None:
+        # Every hasher Django can load sets its algorithm.
+        options = settings.PASSWORD_HASHER_OPTIONS.get(self.algorithm or "", {})
+        for name, value in options.items():
+            setattr(self, name, value)
+
+
+class TunablePBKDF2PasswordHasher(TunableHasherMixin, PBKDF2PasswordHasher):
+    pass
+
+
+class TunableScryptPasswordHasher(TunableHasherMixin, ScryptPasswordHasher):
+    pass
+
+
+class TunableArgon2PasswordHasher(TunableHasherMixin, Argon2PasswordHasher):
+    """
+    Needs the argon2-cffi package, which is only imported when it is used.
+    """
@@ -1,25 +1,180 @@
-from social_app.models import BlockDetail, FriendRequest
+import uuid
+from typing import Dict, List, Tuple
+
+from django.conf import settings
+from django.db import transaction
+
+from social_app.archival import archived_acceptances
+from social_app.blocklist import get_blocker_ids
+from social_app.caching import PENDING_LIST, invalidate_list_cache
+from social_app.counters import adjust_pending
+from social_app.outbox import REQUEST_SENT, emit, request_payload
+from social_app.models import FriendRequest, RequestStatus, UserProfile
 from social_app.serializers import FriendRequestSerializer
+from social_app.throttling import hit_rate_limit
 
+SEND_REQUEST_SCOPE = "send-requests"
+RATE_LIMIT_MESSAGE = (
+    f"Can't send more than {settings.MAX_REQUESTS_IN_MINUTE} requests per minute."
+)
 
-def process_request(user_profile, user_id):
-    request_object, created = FriendRequest.objects.get_or_create(
-        sender=user_profile, receiver_id=user_id
-    )
-    if created:
-        return True, FriendRequestSerializer(request_object).data
+
+def can_re_request(request_object) -> bool:
+    return request_object.is_rejected() and request_object.valid_for_re_request()
+
+
+def unprocessed_response(request_object) -> dict:
+    """
+    Response for a request that already exists and can't be sent again.
+    """
     if request_object.is_rejected():
-        if request_object.valid_for_re_request():
+        return {"message": "Cool down time is not over"}
+    if request_object.is_accepted():
+        return {"message": "Already friends"}
+    return {"message": "Already requested"}
+
+
+def process_request(user_profile, user_id):
+    """
+    Send a friend request, or re-send a rejected one whose cooldown is over.
+    Only requests that are actually sent count toward the rate limit.
+    """
+    # URL kwargs arrive as str, the archive is keyed by UUID.
+    user_id = uuid.UUID(str(user_id))
+    with transaction.atomic():
+        # Locked so the archiver can't move the request while it's re-sent.
+        requests = FriendRequest.objects.select_for_update()
+        request_object = requests.filter(sender=user_profile, receiver_id=user_id).first()
+        if request_object is None:
+            request_object = archived_acceptances(user_profile.uuid, [user_id]).get(user_id)
+        if request_object is not None and not can_re_request(request_object):
+            return False, unprocessed_response(request_object)
+        if not _allowed_to_send(user_profile):
+            return False, {"message": RATE_LIMIT_MESSAGE}
+        if request_object is not None:
             request_object.make_pending()
-            processed = True
-            response = FriendRequestSerializer(request_object).data
+            return True, FriendRequestSerializer(request_object).data
+        request_object, created = requests.get_or_create(
+            sender=user_profile, receiver_id=user_id
+        )
+        if not created:
+            return False, unprocessed_response(request_object)
+        emit(REQUEST_SENT, [request_payload(request_object)])
+    return True, FriendRequestSerializer(request_object).data
+
+
+def process_bulk_requests(user_profile, user_ids) -> List[dict]:
+    """
+    Send friend requests to many users in one transaction. Every user gets
+    the outcome `process_request` would give, plus a rate limit and block
+    check per item since the per-view permission and throttle only see the
+    batch as a whole.
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    existing = set(
+        UserProfile.objects.filter(uuid__in=user_ids).values_list("uuid", flat=True)
+    )
+    blockers = get_blocker_ids(user_profile.uuid)
+    results: Dict = {}
+    to_create: List[FriendRequest] = []
+    to_re_request: List[FriendRequest] = []
+    with transaction.atomic():
+        current = {
+            request_object.receiver_id: request_object
+            for request_object in FriendRequest.objects.select_for_update().filter(
+                sender=user_profile, receiver_id__in=user_ids
+            )
+        }
+        current.update(
+            archived_acceptances(
+                user_profile.uuid,
+                [user_id for user_id in user_ids if user_id in existing and user_id not in current],
+            )
+        )
+        for user_id in user_ids:
+            request_object = current.get(user_id)
+            if user_id not in existing:
+                results[user_id] = (False, {"message": "User not found"})
+            elif user_id in blockers:
+                results[user_id] = (False, {"message": "Blocked by user"})
+            elif request_object is not None and not can_re_request(request_object):
+                results[user_id] = (False, unprocessed_response(request_object))
+            elif not _allowed_to_send(user_profile):
+                results[user_id] = (False, {"message": RATE_LIMIT_MESSAGE})
+            elif request_object is None:
+                to_create.append(FriendRequest(sender=user_profile, receiver_id=user_id))
+            else:
+                request_object.sender = user_profile
+                to_re_request.append(request_object)
+
+        if to_create:
+            FriendRequest.objects.bulk_create(to_create, ignore_conflicts=True)
+            # Rows created concurrently by another request were skipped.
+            stored = set(
+                FriendRequest.objects.filter(
+                    uuid__in=[request_object.uuid for request_object in to_create]
+                ).values_list("uuid", flat=True)
+            )
+            for request_object in to_create:
+                if request_object.uuid not in stored:
+                    results[request_object.receiver_id] = (
+                        False,
+                        {"message": "Already requested"},
+                    )
+            to_create = [obj for obj in to_create if obj.uuid in stored]
+            # bulk_create skips FriendRequest.save(), which counts new requests.
+            adjust_pending(to_create, 1)
+            emit(REQUEST_SENT, map(request_payload, to_create))
+            invalidate_list_cache(PENDING_LIST, *{obj.receiver_id for obj in to_create})
+        if to_re_request:
+            FriendRequest.make_pending_many(to_re_request)
+
+    for request_object in to_create + to_re_request:
+        results[request_object.receiver_id] = (
+            True,
+            FriendRequestSerializer(request_object).data,
+        )
+    return [_bulk_result("user_id", user_id, *results[user_id]) for user_id in user_ids]
+
+
+def resolve_bulk_requests(user_profile, request_ids, status: str) -> List[dict]:
+    """
+    Accept or reject many incoming requests in one transaction.
+    """
+    request_ids = list(dict.fromkeys(request_ids))
+    label = RequestStatus(status).label
+    results: Dict[object, Tuple[bool, dict]] = {}
+    to_resolve: List[FriendRequest] = []
+    with transaction.atomic():
+        requests = FriendRequest.objects.select_for_update().in_bulk(request_ids)
+        for request_id in request_ids:
+            request_object = requests.get(request_id)
+            if request_object is None or request_object.receiver_id != user_profile.uuid:
+                results[request_id] = (False, {"message": "Not found"})
+            elif request_object.not_in_pending():
+                results[request_id] = (False, {"message": f"Request can't be {label}"})
+            else:
+                to_resolve.append(request_object)
+                results[request_id] = (True, {})
+        if status == RequestStatus.ACCEPTED:
+            FriendRequest.accept_many(to_resolve)
         else:
-            processed = False
-            response = {"message": "Cool down time is not over"}
-    elif request_object.is_accepted():
-        processed = False
-        response = {"message": "Already friends"}
+            FriendRequest.reject_many(to_resolve)
+    return [
+        _bulk_result("request_id", request_id, *results[request_id])
+        for request_id in request_ids
+    ]
+
+
+def _allowed_to_send(user_profile) -> bool:
+    result = hit_rate_limit(SEND_REQUEST_SCOPE, user_profile.user_id)
+    return result is None or result.allowed
+
+
+def _bulk_result(id_name: str, item_id, processed: bool, response: dict) -> dict:
+    result = {id_name: str(item_id), "processed": processed}
+    if processed and response:
+        result["request"] = response
     else:
-        processed = False
-        response = {"message": "Already requested"}
-    return processed, response
+        result.update(response)
+    return result
@@ -0,0 +1,250 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import Http404, HttpResponse
+from rest_framework.renderers import JSONRenderer
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+@dataclass
+class RequestMetrics:
+    queries: int = 0
+    db_seconds: float = 0.0
+    serialization_seconds: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+HISTOGRAMS: Dict[str, Tuple[str, Sequence[float]]] = {
+    "social_app_request_duration_seconds": ("Request latency.", DURATION_BUCKETS),
+    "social_app_request_queries": ("SQL queries per request.", QUERY_COUNT_BUCKETS),
+    "social_app_request_db_seconds": ("Time spent in SQL per request.", DURATION_BUCKETS),
+    "social_app_request_serialization_seconds": (
+        "Time spent serializing and rendering the response body per request.",
+        DURATION_BUCKETS,
+    ),
+}
+CACHE_COUNTER = "social_app_request_cache_total"
+
+
+class MetricsRegistry:
+    """
+    Per-process metrics grouped by URL name.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.histograms: Dict[Tuple[str, str], Histogram] = {}
+            self.cache_counts: Dict[Tuple[str, str], int] = {}
+
+    def observe(self, url_name: str, metrics: RequestMetrics, duration: float) -> None:
+        values = {
+            "social_app_request_duration_seconds": duration,
+            "social_app_request_queries": metrics.queries,
+            "social_app_request_db_seconds": metrics.db_seconds,
+            "social_app_request_serialization_seconds": metrics.serialization_seconds,
+        }
+        with self._lock:
+            for name, value in values.items():
+                key = (name, url_name)
+                if key not in self.histograms:
+                    self.histograms[key] = Histogram(HISTOGRAMS[name][1])
+                self.histograms[key].observe(value)
+            for result, count in (("hit", metrics.cache_hits), ("miss", metrics.cache_misses)):
+                key = (url_name, result)
+                self.cache_counts[key] = self.cache_counts.get(key, 0) + count
+
+    def render(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            for name, (help_text, _) in HISTOGRAMS.items():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} histogram")
+                for (metric, url_name), histogram in sorted(self.histograms.items()):
+                    if metric == name:
+                        lines.extend(histogram.render(name, f'url_name="{url_name}"'))
+            lines.append(f"# HELP {CACHE_COUNTER} Cache lookups by result.")
+            lines.append(f"# TYPE {CACHE_COUNTER} counter")
+            for (url_name, result), count in sorted(self.cache_counts.items()):
+                lines.append(
+                    f'{CACHE_COUNTER}{{url_name="{url_name}",result="{result}"}} {count}'
+                )
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def record_cache_lookup(hit: bool) -> None:
+    metrics = _current.get()
+    if metrics is None:
+        return
+    if hit:
+        metrics.cache_hits += 1
+    else:
+        metrics.cache_misses += 1
+
+
+@contextmanager
+def measure_serialization():
+    metrics = _current.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if metrics is not None:
+            metrics.serialization_seconds += time.perf_counter() - start
+
+
+def serializer_data(serializer):
+    """
+    `serializer.data`, timed as serialization like the rendering that
+    follows it.
+    """
+    with measure_serialization():
+        return serializer.data
+
+
+class InstrumentedJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with measure_serialization():
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+class RequestMetricsMiddleware:
+    """
+    Records SQL query count and time, cache hits and misses, serialization
+    time and latency of every request, grouped by URL name. Enabled with
+    REQUEST_METRICS_ENABLED; queries slower than SLOW_QUERY_THRESHOLD_MS are
+    logged.
+    """
+
+    # Runs natively in both modes so async views are not pushed to a thread.
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            with self.record_queries(metrics):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.observe(request, metrics, start)
+        return response
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        # Async ORM queries run on the request's sync thread, which has its
+        # own connections, so the wrappers are installed from that thread.
+        recorder = self.record_queries(metrics)
+        await sync_to_async(recorder.__enter__)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(recorder.__exit__)(None, None, None)
+            _current.reset(token)
+        self.observe(request, metrics, start)
+        return response
+
+    @contextmanager
+    def record_queries(self, metrics: RequestMetrics):
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self.record_query(metrics)))
+            yield
+
+    @staticmethod
+    def observe(request, metrics: RequestMetrics, start: float) -> None:
+        match = request.resolver_match
+        url_name = (match.url_name if match else None) or "unresolved"
+        registry.observe(url_name, metrics, time.perf_counter() - start)
+
+    @staticmethod
+    def record_query(metrics: RequestMetrics):
+        threshold = settings.SLOW_QUERY_THRESHOLD_MS / 1000
+
+        def wrapper(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                duration = time.perf_counter() - start
+                metrics.queries += 1
+                metrics.db_seconds += duration
+                if duration >= threshold:
+                    logger.warning("Slow query (%.1f ms): %s", duration * 1000, sql)
+
+        return wrapper
+
+
+def metrics_view(request):
+    """
+    Prometheus text exposition of this process' metrics, served to
+    METRICS_ALLOWED_IPS only.
+    """
+    if (
+        not settings.REQUEST_METRICS_ENABLED
+        or request.META.get("REMOTE_ADDR") not in settings.METRICS_ALLOWED_IPS
+    ):
+        raise Http404
+    return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4")
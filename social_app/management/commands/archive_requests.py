@@ -0,0 +1,50 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from social_app.archival import archivable_requests, archive_resolved_requests
+
+
+class Command(BaseCommand):
+    help = (
+        "Move friend requests resolved more than --older-than-days ago to the "
+        "archive table in batches. Safe to interrupt and rerun."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-days", type=int, default=settings.REQUEST_ARCHIVE_AFTER_DAYS
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.REQUEST_ARCHIVE_BATCH_SIZE
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Count the archivable requests only."
+        )
+
+    def handle(self, *args, **options):
+        resolved_before = timezone.now() - timedelta(days=options["older_than_days"])
+        total = archivable_requests(resolved_before).count()
+        if options["dry_run"]:
+            self.stdout.write(f"{total} requests to archive.")
+            return
+        start = time.perf_counter()
+
+        def progress(result):
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f"Archived {result['archived']} of {total} requests in "
+                f"{result['batches']} batches ({result['archived'] / elapsed:.0f}/s)."
+            )
+
+        result = archive_resolved_requests(
+            resolved_before, batch_size=options["batch_size"], progress=progress
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archived {result['archived']} requests in {result['batches']} batches."
+            )
+        )
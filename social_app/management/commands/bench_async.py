@@ -0,0 +1,104 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from social_app.authentication import ProfileRefreshToken
+from social_app.benchmarking import summarize
+from social_app.models import CustomUser
+
+# Benchmark name: (sync URL name, async URL name, query string)
+ENDPOINTS: Dict[str, Tuple[str, str, str]] = {
+    "users": ("users", "async-users", ""),
+    "users-search": ("users", "async-users", "?search=maya"),
+    "friend-list": ("friend-list", "async-friend-list", ""),
+    "pending-requests": ("pending-requests", "async-pending-requests", ""),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test the sync read endpoints on a WSGI server and their async "
+        "variants on an ASGI server at increasing concurrency. Start both "
+        "first, e.g. `docker compose --profile bench up` (ASGI on APP_PORT, "
+        "WSGI on WSGI_PORT), against the database this command uses."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--async-url", default="http://localhost:8000")
+        parser.add_argument("--sync-url", default="http://localhost:8001")
+        parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50, 100])
+        parser.add_argument(
+            "--requests", type=int, default=1000, help="Requests per endpoint and level."
+        )
+        parser.add_argument(
+            "--users", type=int, default=50, help="Distinct users to log in as."
+        )
+        parser.add_argument(
+            "--endpoints", nargs="+", choices=sorted(ENDPOINTS), default=list(ENDPOINTS)
+        )
+        parser.add_argument("--timeout", type=float, default=30)
+        parser.add_argument("--output", help="Write the results as JSON to this file.")
+
+    def handle(self, *args, **options):
+        users = list(
+            CustomUser.objects.filter(is_active=True, user_profile__isnull=False)[
+                : options["users"]
+            ]
+        )
+        if not users:
+            raise CommandError("No users; run generate_social_graph first.")
+        tokens = [str(ProfileRefreshToken.for_user(user).access_token) for user in users]
+
+        results: Dict = {}
+        for name in options["endpoints"]:
+            sync_name, async_name, query = ENDPOINTS[name]
+            targets = {
+                "wsgi": options["sync_url"].rstrip("/") + reverse(sync_name) + query,
+                "asgi": options["async_url"].rstrip("/") + reverse(async_name) + query,
+            }
+            for mode, url in targets.items():
+                for concurrency in options["concurrency"]:
+                    result = self.run_level(
+                        url, tokens, concurrency, options["requests"], options["timeout"]
+                    )
+                    results.setdefault(name, {}).setdefault(mode, {})[concurrency] = result
+                    self.stdout.write(
+                        f"{name:<17} {mode} c={concurrency:<4} "
+                        f"p50={result['p50_ms']:.1f}ms p99={result['p99_ms']:.1f}ms "
+                        f"rps={result['throughput_rps']:.0f} errors={result['errors']}"
+                    )
+
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=2)
+
+    def run_level(
+        self, url: str, tokens: List[str], concurrency: int, total: int, timeout: float
+    ) -> dict:
+        local = threading.local()
+
+        def call(index: int) -> Tuple[float, bool]:
+            if not hasattr(local, "session"):
+                local.session = requests.Session()
+            headers = {"Authorization": f"Bearer {tokens[index % len(tokens)]}"}
+            start = time.perf_counter()
+            try:
+                ok = local.session.get(url, headers=headers, timeout=timeout).ok
+            except requests.RequestException:
+                ok = False
+            return (time.perf_counter() - start) * 1000, ok
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            start = time.perf_counter()
+            samples = list(pool.map(call, range(total)))
+            elapsed = time.perf_counter() - start
+        result = summarize([latency for latency, _ in samples])
+        result["errors"] = sum(1 for _, ok in samples if not ok)
+        result["throughput_rps"] = total / elapsed if elapsed else 0.0
+        return result
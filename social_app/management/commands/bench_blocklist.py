@@ -0,0 +1,57 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Subquery
+from django.test.utils import CaptureQueriesContext
+
+from social_app.benchmarking import create_synthetic_users, summarize, time_calls
+from social_app.blocklist import get_blocker_ids, invalidate_blocker_ids, is_blocked_by
+from social_app.models import BlockDetail, UserProfile
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare queries and latency per request of the block checks done by "
+        "search and send-request, with and without the blocked-by cache."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--blockers", type=int, default=50)
+        parser.add_argument("--iterations", type=int, default=200)
+        parser.add_argument("--output", help="Write the results as JSON to this file.")
+
+    def handle(self, *args, **options):
+        profile_ids = create_synthetic_users(options["blockers"] + 2, email_prefix="blockbench")
+        target, stranger, blockers = profile_ids[0], profile_ids[1], profile_ids[2:]
+        BlockDetail.objects.bulk_create(
+            [BlockDetail(blocker_id=blocker, blocked_id=target) for blocker in blockers],
+            ignore_conflicts=True,
+        )
+        invalidate_blocker_ids(target)
+
+        def uncached_request():
+            BlockDetail.objects.filter(blocked_id=target, blocker_id=stranger).exists()
+            blocked_by = BlockDetail.objects.filter(blocked_id=target).values("blocker")
+            list(UserProfile.objects.exclude(uuid__in=Subquery(blocked_by))[:10])
+
+        def cached_request():
+            is_blocked_by(target, stranger)
+            list(UserProfile.objects.exclude(uuid__in=get_blocker_ids(target))[:10])
+
+        results = {}
+        for name, request in (("uncached", uncached_request), ("cached", cached_request)):
+            request()  # warm up, the cached path loads the set once
+            with CaptureQueriesContext(connection) as queries:
+                request()
+            results[name] = {
+                "queries_per_request": len(queries.captured_queries),
+                **summarize(time_calls(request, options["iterations"])),
+            }
+            self.stdout.write(
+                f"{name:<9} queries/request={results[name]['queries_per_request']} "
+                f"p50={results[name]['p50_ms']:.3f}ms p95={results[name]['p95_ms']:.3f}ms"
+            )
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=2)
@@ -0,0 +1,217 @@
+import asyncio
+import json
+import random
+from urllib.parse import urlencode
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, close_old_connections, connections
+from django.db.backends.signals import connection_created
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from social_app.authentication import ProfileRefreshToken
+from social_app.benchmarking import summarize, time_calls
+from social_app.models import CustomUser
+
+# (CONN_MAX_AGE, CONN_HEALTH_CHECKS) per request-level mode.
+REQUEST_MODES = {
+    "new_connection": (0, False),
+    "persistent": (600, False),
+    "persistent_health_check": (600, True),
+}
+# How the requests are served: by the test client, as the gthread workers
+# run them (on pool threads that outlive the requests), and by Django's
+# ASGIHandler, as the uvicorn workers run them (the sync code of each request
+# in a thread and context of its own).
+INTERFACES = ("wsgi", "asgi")
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure database connection overhead: opening a connection versus "
+        "reusing one, on its own and per request to a search endpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=500)
+        parser.add_argument(
+            "--database", default=DEFAULT_DB_ALIAS, help="Alias for the connection timings."
+        )
+        parser.add_argument("--search", default="maya", help="Search term of the requests.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", help="Write the results as JSON to this file.")
+
+    def handle(self, *args, **options):
+        results = {
+            "vendor": connections[options["database"]].vendor,
+            "connection": self.bench_connections(options),
+            "request": self.bench_requests(options),
+        }
+        for group in ("connection", "request"):
+            for name, summary in results[group].items():
+                line = (
+                    f"{group:<10} {name:<30} p50={summary['p50_ms']:.3f}ms "
+                    f"p95={summary['p95_ms']:.3f}ms p99={summary['p99_ms']:.3f}ms"
+                )
+                if "connections_per_request" in summary:
+                    line += (
+                        f" connections/request={summary['connections_per_request']:.2f}"
+                        f" left_open={summary['connections_left_open']}"
+                    )
+                self.stdout.write(line)
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=2)
+
+    def bench_connections(self, options) -> dict:
+        alias = options["database"]
+        iterations = options["iterations"]
+
+        def new_connection():
+            connection = connections.create_connection(alias)
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+            finally:
+                connection.close()
+
+        reused = connections.create_connection(alias)
+        reused.ensure_connection()
+
+        def reused_connection():
+            with reused.cursor() as cursor:
+                cursor.execute("SELECT 1")
+
+        def health_checked_connection():
+            # What CONN_HEALTH_CHECKS adds at the start of each request.
+            if not reused.is_usable():
+                raise CommandError("Connection became unusable.")
+            reused_connection()
+
+        try:
+            return {
+                "new_connection": summarize(time_calls(new_connection, iterations)),
+                "reused": summarize(time_calls(reused_connection, iterations)),
+                "reused_health_check": summarize(
+                    time_calls(health_checked_connection, iterations)
+                ),
+            }
+        finally:
+            reused.close()
+
+    def bench_requests(self, options) -> dict:
+        """
+        Authenticated search requests through each interface, closing or
+        keeping the connection between them per CONN_MAX_AGE as the request
+        handlers do, with the connections opened per request and those still
+        open afterwards.
+        """
+        users = list(CustomUser.objects.filter(user_profile__isnull=False)[:50])
+        if not users:
+            raise CommandError("No users; run generate_social_graph first.")
+        rng = random.Random(options["seed"])
+        tokens = [str(ProfileRefreshToken.for_user(user).access_token) for user in users]
+        url = reverse("users")
+        query = {"search": options["search"]}
+        connection = connections[DEFAULT_DB_ALIAS]
+        original = dict(connection.settings_dict)
+        opened = []
+
+        def count_connection(sender, connection, **kwargs):
+            if connection.alias == DEFAULT_DB_ALIAS:
+                opened.append(connection)
+
+        results = {}
+        with override_settings(ALLOWED_HOSTS=["testserver"]):
+            client = APIClient()
+            asgi_handler = ASGIHandler()
+
+            def wsgi_search():
+                client.credentials(HTTP_AUTHORIZATION=f"Bearer {rng.choice(tokens)}")
+                # The test client skips the handler's close_old_connections
+                # calls at request start and end; make them here.
+                close_old_connections()
+                response = client.get(url, query)
+                close_old_connections()
+                return response.status_code
+
+            # An event loop of its own rather than async_to_sync(), which would
+            # run the sync parts of each request on this thread and so reuse
+            # its connection; as under uvicorn, each request gets a new thread.
+            loop = asyncio.new_event_loop()
+
+            def asgi_search():
+                return loop.run_until_complete(
+                    asgi_get(asgi_handler, url, query, rng.choice(tokens))
+                )
+
+            searches = {"wsgi": wsgi_search, "asgi": asgi_search}
+            connection_created.connect(count_connection)
+            try:
+                for interface in INTERFACES:
+                    for mode, (max_age, health_checks) in REQUEST_MODES.items():
+                        connection.close()
+                        connection.settings_dict["CONN_MAX_AGE"] = max_age
+                        connection.settings_dict["CONN_HEALTH_CHECKS"] = health_checks
+
+                        def search():
+                            status_code = searches[interface]()
+                            if status_code != 200:
+                                raise CommandError(f"GET {url} returned {status_code}.")
+
+                        opened.clear()
+                        name = f"{interface}_{mode}"
+                        results[name] = summarize(time_calls(search, options["iterations"]))
+                        # The warmup request included.
+                        results[name]["connections_per_request"] = len(opened) / (
+                            options["iterations"] + 1
+                        )
+                        # Kept by CONN_MAX_AGE; under ASGI, never to be reused.
+                        results[name]["connections_left_open"] = sum(
+                            opened_connection.connection is not None for opened_connection in opened
+                        )
+            finally:
+                loop.close()
+                connection_created.disconnect(count_connection)
+                opened.clear()
+                connection.close()
+                connection.settings_dict.update(original)
+        return results
+
+
+async def asgi_get(handler: ASGIHandler, path: str, query: dict, token: str) -> int:
+    """
+    GET `path` through `handler` as an ASGI server would; returns the status.
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": urlencode(query).encode(),
+        "root_path": "",
+        "headers": [(b"host", b"testserver"), (b"authorization", f"Bearer {token}".encode())],
+        "client": ("127.0.0.1", 0),
+        "server": ("testserver", 80),
+    }
+    body_sent = False
+    messages = []
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # The client stays connected; the handler stops waiting once it responds.
+        await asyncio.Event().wait()
+
+    async def send(message):
+        messages.append(message)
+
+    await handler(scope, receive, send)
+    return messages[0]["status"]
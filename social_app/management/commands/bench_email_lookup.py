@@ -0,0 +1,68 @@
+import json
+import random
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from social_app.benchmarking import create_synthetic_users, summarize, time_calls
+from social_app.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare email lookups by `email__iexact` with the LOWER(email) index "
+        "path used by CustomUser.objects.by_email, and print their query plans."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=10_000_000,
+            help="Generate synthetic users until at least this many exist.",
+        )
+        parser.add_argument("--iterations", type=int, default=200)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", help="Write the results as JSON to this file.")
+
+    def handle(self, *args, **options):
+        existing = CustomUser.objects.count()
+        if existing < options["users"]:
+            self.stdout.write(f"Generating {options['users'] - existing} users...")
+            create_synthetic_users(options["users"] - existing, batch_size=20000)
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute("ANALYZE social_app_customuser")
+
+        rng = random.Random(options["seed"])
+        emails = list(
+            CustomUser.objects.filter(email__startswith="bench")
+            .order_by("pk")
+            .values_list("email", flat=True)[:10000]
+        )
+        # Clients type emails in any case.
+        emails = [
+            email.upper() if index % 2 else email.title() for index, email in enumerate(emails)
+        ]
+
+        paths = {
+            "iexact": lambda email: CustomUser.objects.filter(email__iexact=email),
+            "by_email": lambda email: CustomUser.objects.by_email(email),
+            "by_email_pk_only": lambda email: CustomUser.objects.by_email(email).values("pk"),
+        }
+        results = {"users": CustomUser.objects.count(), "paths": {}}
+        for name, lookup in paths.items():
+            samples = time_calls(
+                lambda: list(lookup(rng.choice(emails))), options["iterations"]
+            )
+            plan = lookup(emails[0]).explain()
+            results["paths"][name] = {**summarize(samples), "plan": plan}
+            summary = results["paths"][name]
+            self.stdout.write(
+                f"{name:<18} p50={summary['p50_ms']:.3f}ms p99={summary['p99_ms']:.3f}ms"
+            )
+            self.stdout.write(f"  {plan.splitlines()[0].strip()}")
+
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=2)
@@ -0,0 +1,60 @@
+import json
+import timeit
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand
+from django.core.validators import EmailValidator
+
+from social_app import search_query
+from social_app.utils import is_valid_email
+
+# Autocomplete sends every prefix of a name, so name terms dominate.
+DEFAULT_TERMS = ("m", "maya", "maya pat", "maya.patel@example.com", "Maya@", "0" * 32)
+
+
+def fresh_validator_is_email(term) -> bool:
+    """
+    The previous `is_valid_email`, building a validator per call.
+    """
+    try:
+        EmailValidator()(term)
+        return True
+    except ValidationError:
+        return False
+
+
+class Command(BaseCommand):
+    help = (
+        "Micro-benchmark the user search term classification against the "
+        "previous per-call EmailValidator check."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--number", type=int, default=100_000)
+        parser.add_argument("--terms", nargs="+", default=list(DEFAULT_TERMS))
+        parser.add_argument("--output", help="Write the results as JSON to this file.")
+
+    def handle(self, *args, **options):
+        functions = {
+            "fresh_validator": fresh_validator_is_email,
+            "is_valid_email": is_valid_email,
+            "classify": search_query.classify,
+        }
+        results = {}
+        for term in options["terms"]:
+            results[term] = {"kind": search_query.classify(term)}
+            for name, function in functions.items():
+                seconds = min(
+                    timeit.repeat(lambda: function(term), number=options["number"], repeat=3)
+                )
+                results[term][f"{name}_ns"] = seconds / options["number"] * 1e9
+            self.stdout.write(
+                f"{term!r:<26} {results[term]['kind']:<6} "
+                + " ".join(
+                    f"{name}={results[term][f'{name}_ns']:.0f}ns" for name in functions
+                )
+            )
+
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=2)
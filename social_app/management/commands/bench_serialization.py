@@ -0,0 +1,92 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from rest_framework.renderers import JSONRenderer
+
+from social_app.benchmarking import summarize, time_calls
+from social_app.fast_serialization import compile_row_mapper, row_queryset
+from social_app.models import FriendRequest, FriendSuggestion, UserProfile
+from social_app.pagination import DEFAULT_KEYSET_ORDERING
+from social_app.renderers import FastJSONRenderer
+from social_app.serializers import (
+    FriendRequestSerializer,
+    FriendSuggestionSerializer,
+    UserSerializer,
+)
+
+CASES = {
+    "users": (UserSerializer, lambda: UserProfile.objects.order_by(*DEFAULT_KEYSET_ORDERING)),
+    "friend-requests": (
+        FriendRequestSerializer,
+        lambda: FriendRequest.objects.order_by(*DEFAULT_KEYSET_ORDERING),
+    ),
+    "friend-suggestions": (
+        FriendSuggestionSerializer,
+        lambda: FriendSuggestion.objects.order_by("rank", "uuid"),
+    ),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare list pages built with the ModelSerializers and JSONRenderer "
+        "against the values() row mappers and orjson, in rows per second."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100, help="Rows per page.")
+        parser.add_argument("--iterations", type=int, default=200)
+        parser.add_argument("--output", help="Write the results as JSON to this file.")
+
+    def handle(self, *args, **options):
+        results = {}
+        with override_settings(FAST_SERIALIZATION=True):
+            for name, (serializer_class, queryset) in CASES.items():
+                if not queryset().exists():
+                    self.stdout.write(f"{name:<20} no rows; run generate_social_graph first.")
+                    continue
+                results[name] = self.bench_case(serializer_class, queryset, options)
+                for mode, summary in results[name].items():
+                    self.stdout.write(
+                        f"{name:<20} {mode:<20} {summary['rows_per_sec']:>12.0f} rows/s "
+                        f"p50={summary['p50_ms']:.3f}ms"
+                    )
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=2)
+
+    def bench_case(self, serializer_class, queryset, options) -> dict:
+        rows = options["rows"]
+        regular_renderer, fast_renderer = JSONRenderer(), FastJSONRenderer()
+        mapper = compile_row_mapper(serializer_class)
+        objects = list(serializer_class.optimize_queryset(queryset())[:rows])
+        values = list(row_queryset(serializer_class, queryset())[:rows])
+
+        def regular():
+            return regular_renderer.render(serializer_class(objects, many=True).data)
+
+        def fast():
+            return fast_renderer.render(mapper.map_rows(values))
+
+        def regular_with_query():
+            page = serializer_class.optimize_queryset(queryset())[:rows]
+            return regular_renderer.render(serializer_class(page, many=True).data)
+
+        def fast_with_query():
+            page = row_queryset(serializer_class, queryset())[:rows]
+            return fast_renderer.render(mapper.map_rows(page))
+
+        if regular() != fast():
+            raise CommandError(f"{serializer_class.__name__}: fast output differs.")
+        results = {}
+        for mode, func in (
+            ("regular", regular),
+            ("fast", fast),
+            ("regular_with_query", regular_with_query),
+            ("fast_with_query", fast_with_query),
+        ):
+            summary = summarize(time_calls(func, options["iterations"]))
+            summary["rows_per_sec"] = len(objects) / summary["mean_ms"] * 1000
+            results[mode] = summary
+        return results
@@ -0,0 +1,70 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from social_app.benchmarking import create_synthetic_users, summarize, time_calls
+from social_app.models import UserProfile
+from social_app.search import get_search_engine
+
+DEFAULT_TERMS = ("Maya", "maya pat", "Sofia Garc", "Mohamed", "z")
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare search latency of the configured user search engine with the "
+        "previous query-time SearchVector path."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=1_000_000,
+            help="Generate synthetic users until at least this many exist.",
+        )
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--page-size", type=int, default=10)
+        parser.add_argument("--terms", nargs="+", default=list(DEFAULT_TERMS))
+        parser.add_argument("--output", help="Write the results as JSON to this file.")
+
+    def handle(self, *args, **options):
+        existing = UserProfile.objects.count()
+        if existing < options["users"]:
+            self.stdout.write(f"Generating {options['users'] - existing} users...")
+            create_synthetic_users(options["users"] - existing)
+
+        page_size = options["page_size"]
+        engine = get_search_engine()
+        results = {"users": UserProfile.objects.count(), "engines": {}}
+        paths = {type(engine).__name__: lambda term: engine.search(UserProfile.objects.all(), term)}
+        if connection.vendor == "postgresql":
+            paths["QueryTimeSearchVector"] = self.query_time_search
+        else:
+            self.stdout.write("Skipping the query-time SearchVector path (PostgreSQL only).")
+
+        for name, search in paths.items():
+            per_term = {}
+            for term in options["terms"]:
+                samples = time_calls(
+                    lambda: list(search(term)[:page_size]), options["iterations"]
+                )
+                per_term[term] = summarize(samples)
+                self.stdout.write(
+                    f"{name:<28} {term!r:<14} p50={per_term[term]['p50_ms']:.2f}ms "
+                    f"p95={per_term[term]['p95_ms']:.2f}ms"
+                )
+            results["engines"][name] = per_term
+
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=2)
+
+    @staticmethod
+    def query_time_search(term):
+        from django.contrib.postgres.search import SearchQuery, SearchVector
+
+        return (
+            UserProfile.objects.annotate(search=SearchVector("user__name"))
+            .filter(search=SearchQuery(term))
+        )
@@ -0,0 +1,88 @@
+import json
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, models, transaction
+
+from social_app.benchmarking import summarize, time_calls
+from social_app.ids import uuid7
+
+GENERATORS = {"uuid4": uuid.uuid4, "uuid7": uuid7}
+TABLE = "bench_uuid_inserts"
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare inserting rows keyed by random (v4) and time-ordered (v7) "
+        "UUIDs into a scratch table with a uuid primary key."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000)
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--output", help="Write the results as JSON to this file.")
+
+    def handle(self, *args, **options):
+        results = {"vendor": connection.vendor, "generate": {}, "insert": {}}
+        for name, generate in GENERATORS.items():
+            results["generate"][name] = summarize(time_calls(generate, 10_000))
+            results["insert"][name] = self.bench_inserts(generate, options)
+            insert = results["insert"][name]
+            line = (
+                f"{name}: {insert['rows_per_sec']:.0f} rows/s, batch "
+                f"p50={insert['batches']['p50_ms']:.2f}ms p99={insert['batches']['p99_ms']:.2f}ms"
+            )
+            if insert["index_bytes"] is not None:
+                line += f", primary key index {insert['index_bytes']} bytes"
+            self.stdout.write(line)
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=2)
+
+    def bench_inserts(self, generate, options) -> dict:
+        """
+        Insert `--rows` rows in committed batches into a fresh table. The
+        batch latencies show the cost growing with the index for random keys.
+        """
+        uuid_field: models.UUIDField = models.UUIDField()
+        insert = f"INSERT INTO {TABLE} (id, payload) VALUES (%s, %s)"
+        batch_size = options["batch_size"]
+        self.create_table()
+        try:
+            batches = []
+            start = time.perf_counter()
+            for offset in range(0, options["rows"], batch_size):
+                count = min(batch_size, options["rows"] - offset)
+                rows = [
+                    (uuid_field.get_db_prep_value(generate(), connection), offset + index)
+                    for index in range(count)
+                ]
+                batch_start = time.perf_counter()
+                with transaction.atomic(), connection.cursor() as cursor:
+                    cursor.executemany(insert, rows)
+                batches.append((time.perf_counter() - batch_start) * 1000)
+            elapsed = time.perf_counter() - start
+            return {
+                "rows_per_sec": options["rows"] / elapsed if elapsed else 0.0,
+                "batches": summarize(batches),
+                "index_bytes": self.index_size(),
+            }
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute(f"DROP TABLE {TABLE}")
+
+    def create_table(self) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+            cursor.execute(
+                f"CREATE TABLE {TABLE} "
+                f"(id {connection.data_types['UUIDField']} PRIMARY KEY, payload integer NOT NULL)"
+            )
+
+    def index_size(self):
+        if connection.vendor != "postgresql":
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_relation_size(%s)", [f"{TABLE}_pkey"])
+            return cursor.fetchone()[0]
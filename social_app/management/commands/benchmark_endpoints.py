@@ -0,0 +1,238 @@
+import json
+import random
+import subprocess
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from social_app.benchmarking import summarize
+from social_app.models import FriendRequest, UserProfile
+
+BULK_SIZE = 10
+
+# (url kwargs, request data) for one call, given the acting profile, a pool
+# of other profile ids and the random generator.
+Prepare = Callable[[UserProfile, List, random.Random], Tuple[Optional[dict], Optional[dict]]]
+
+
+@dataclass
+class Scenario:
+    url_name: str
+    method: str = "get"
+    prepare: Optional[Prepare] = None
+    # Writes run in a transaction which is rolled back after the call, so
+    # every iteration sees the same dataset.
+    writes: bool = False
+
+
+def _pending_to(actor, others, rng, count):
+    """
+    Incoming pending requests for `actor`, created before the timed call.
+    """
+    senders = [
+        sender
+        for sender in rng.sample(others, min(count, len(others)))
+        if sender != actor.uuid
+    ]
+    FriendRequest.objects.filter(sender_id__in=senders, receiver=actor).delete()
+    return FriendRequest.objects.bulk_create(
+        [FriendRequest(sender_id=sender, receiver=actor) for sender in senders]
+    )
+
+
+def _sign_up(actor, others, rng):
+    token = uuid.uuid4().hex
+    return None, {
+        "name": "Bench Signup",
+        "email": f"bench-signup-{token}@example.com",
+        # The shared benchmark password is too common for the validators.
+        "password": f"Signup-{token}",
+    }
+
+
+def _search(term):
+    return lambda actor, others, rng: (None, {"search": term})
+
+
+def _search_email(actor, others, rng):
+    email = UserProfile.objects.filter(uuid=rng.choice(others)).values_list(
+        "user__email", flat=True
+    ).first()
+    return None, {"search": email}
+
+
+def _to_other(actor, others, rng):
+    return {"user_id": rng.choice(others)}, None
+
+
+def _bulk_send(actor, others, rng):
+    user_ids = [str(other) for other in rng.sample(others, min(BULK_SIZE, len(others)))]
+    return None, {"user_ids": user_ids}
+
+
+def _resolve_one(actor, others, rng):
+    return {"request_id": _pending_to(actor, others, rng, 1)[0].uuid}, None
+
+
+def _resolve_many(actor, others, rng):
+    requests = _pending_to(actor, others, rng, BULK_SIZE)
+    return None, {"request_ids": [str(request.uuid) for request in requests]}
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "sign-up": Scenario("sign-up", "post", _sign_up, writes=True),
+    "users": Scenario("users"),
+    "users-search-name": Scenario("users", prepare=_search("Maya")),
+    "users-search-prefix": Scenario("users", prepare=_search("so ga")),
+    "users-search-email": Scenario("users", prepare=_search_email),
+    "friend-list": Scenario("friend-list"),
+    "friend-suggestions": Scenario("friend-suggestions"),
+    "pending-requests": Scenario("pending-requests"),
+    "send-requests": Scenario("send-requests", "post", _to_other, writes=True),
+    "accept-request": Scenario("accept-request", "put", _resolve_one, writes=True),
+    "reject-request": Scenario("reject-request", "put", _resolve_one, writes=True),
+    "bulk-send-requests": Scenario("bulk-send-requests", "post", _bulk_send, writes=True),
+    "bulk-accept-requests": Scenario("bulk-accept-requests", "put", _resolve_many, writes=True),
+    "bulk-reject-requests": Scenario("bulk-reject-requests", "put", _resolve_many, writes=True),
+    "block-unblock": Scenario("block-unblock", "post", _to_other, writes=True),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive every API endpoint in-process against the current database and "
+        "report latency percentiles, queries per request and throughput."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=100)
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument(
+            "--actors", type=int, default=20, help="Number of users sending the requests."
+        )
+        parser.add_argument(
+            "--pool", type=int, default=1000, help="Number of users to send requests to."
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS)
+        )
+        parser.add_argument("--output", help="Write the results as JSON to this file.")
+        parser.add_argument(
+            "--compare", help="Print changes against the JSON results of an earlier run."
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        profiles = UserProfile.objects.order_by("pk")
+        total = profiles.count()
+        if total < 2:
+            raise CommandError("Not enough users; run generate_social_graph first.")
+
+        actors = [
+            profiles.select_related("user")[offset]
+            for offset in rng.sample(range(total), min(options["actors"], total))
+        ]
+        pool_size = min(options["pool"], total)
+        start = rng.randrange(total - pool_size + 1)
+        others = list(profiles.values_list("uuid", flat=True)[start : start + pool_size])
+
+        # Keep the rate limiter in the measured path without ever tripping it.
+        rate_limits = {scope: "1000000/min" for scope in settings.RATE_LIMITS}
+        results = {"meta": self.meta(total, options), "endpoints": {}}
+        with override_settings(ALLOWED_HOSTS=["testserver"], RATE_LIMITS=rate_limits):
+            client = APIClient()
+            for name in options["scenarios"]:
+                results["endpoints"][name] = self.run_scenario(
+                    client, SCENARIOS[name], actors, others, rng, options
+                )
+                self.report(name, results["endpoints"][name])
+
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=2, sort_keys=True)
+        if options["compare"]:
+            with open(options["compare"]) as baseline:
+                self.compare(json.load(baseline), results)
+
+    def run_scenario(self, client, scenario, actors, others, rng, options) -> dict:
+        latencies: List[float] = []
+        queries: List[int] = []
+        statuses: Counter = Counter()
+        for iteration in range(options["warmup"] + options["iterations"]):
+            actor = actors[iteration % len(actors)]
+            client.force_authenticate(user=actor.user)
+            with transaction.atomic():
+                url_kwargs, data = (None, None)
+                if scenario.prepare is not None:
+                    url_kwargs, data = scenario.prepare(actor, others, rng)
+                url = reverse(scenario.url_name, kwargs=url_kwargs)
+                with CaptureQueriesContext(connection) as captured:
+                    start = time.perf_counter()
+                    response = getattr(client, scenario.method)(url, data, format="json")
+                    elapsed = time.perf_counter() - start
+                if scenario.writes:
+                    transaction.set_rollback(True)
+            if iteration >= options["warmup"]:
+                latencies.append(elapsed * 1000)
+                queries.append(len(captured))
+                statuses[str(response.status_code)] += 1
+        client.force_authenticate(user=None)
+
+        result: dict = summarize(latencies)
+        result.update(
+            queries_mean=sum(queries) / len(queries) if queries else 0.0,
+            queries_max=max(queries, default=0),
+            throughput_rps=len(latencies) / (sum(latencies) / 1000) if latencies else 0.0,
+            status_codes=dict(statuses),
+        )
+        return result
+
+    def meta(self, total: int, options) -> dict:
+        try:
+            commit = subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        return {
+            "commit": commit,
+            "timestamp": timezone.now().isoformat(),
+            "database": connection.vendor,
+            "users": total,
+            "iterations": options["iterations"],
+            "seed": options["seed"],
+        }
+
+    def report(self, name: str, result: dict) -> None:
+        self.stdout.write(
+            f"{name:<22} p50={result['p50_ms']:.2f}ms p95={result['p95_ms']:.2f}ms "
+            f"p99={result['p99_ms']:.2f}ms queries={result['queries_mean']:.1f} "
+            f"rps={result['throughput_rps']:.0f} status={result['status_codes']}"
+        )
+
+    def compare(self, baseline: dict, results: dict) -> None:
+        self.stdout.write(f"Compared with {baseline['meta'].get('commit')}:")
+        for name, result in results["endpoints"].items():
+            previous = baseline["endpoints"].get(name)
+            if previous is None:
+                continue
+            changes = []
+            for key in ("p50_ms", "p95_ms", "p99_ms", "queries_mean"):
+                if previous[key]:
+                    change = (result[key] - previous[key]) / previous[key] * 100
+                    changes.append(f"{key}={change:+.1f}%")
+            self.stdout.write(f"{name:<22} " + " ".join(changes))
@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from social_app.suggestions import compute_all_suggestions
+
+
+class Command(BaseCommand):
+    help = "Precompute ranked friend-of-friend suggestions for every user."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top-n", type=int, default=settings.FRIEND_SUGGESTIONS_LIMIT)
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of users whose suggestions are computed and stored per batch.",
+        )
+
+    def handle(self, *args, **options):
+        total = compute_all_suggestions(
+            top_n=options["top_n"], chunk_size=options["chunk_size"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Computed suggestions for {total} users."))
@@ -0,0 +1,125 @@
+import json
+import random
+import re
+from typing import Dict, List
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from social_app.management.commands.benchmark_endpoints import SCENARIOS
+from social_app.models import UserProfile
+
+# How each backend asks for a plan, and how a full table scan shows in it.
+EXPLAIN_PREFIX = {"postgresql": "EXPLAIN ", "sqlite": "EXPLAIN QUERY PLAN "}
+SEQ_SCAN = {
+    "postgresql": re.compile(r"Seq Scan on (\w+)"),
+    # "SCAN table" without "USING [COVERING] INDEX ...".
+    "sqlite": re.compile(r"^SCAN (\w+)$"),
+}
+EXPLAINABLE = ("SELECT", "UPDATE", "DELETE", "WITH")
+
+
+class Command(BaseCommand):
+    help = (
+        "Run each endpoint scenario once against the current database, EXPLAIN "
+        "the queries it makes and flag the ones planned as sequential scans."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS)
+        )
+        parser.add_argument(
+            "--ignore-table",
+            action="append",
+            default=[],
+            help="Table whose sequential scans are expected, e.g. small lookup tables.",
+        )
+        parser.add_argument(
+            "--fail-on-seq-scan",
+            action="store_true",
+            help="Exit with an error if any sequential scan is flagged.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", help="Write the plans as JSON to this file.")
+
+    def handle(self, *args, **options):
+        if connection.vendor not in EXPLAIN_PREFIX:
+            raise CommandError(f"EXPLAIN is not supported on {connection.vendor}.")
+        rng = random.Random(options["seed"])
+        profiles = UserProfile.objects.order_by("pk")
+        total = profiles.count()
+        if total < 2:
+            raise CommandError("Not enough users; run generate_social_graph first.")
+        if connection.vendor == "postgresql":
+            # Plans of a freshly generated dataset depend on its statistics.
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+        actor = profiles.select_related("user")[rng.randrange(total)]
+        others = list(profiles.exclude(pk=actor.pk).values_list("uuid", flat=True)[:1000])
+        ignored = set(options["ignore_table"])
+        rate_limits = {scope: "1000000/min" for scope in settings.RATE_LIMITS}
+        results: Dict[str, List[dict]] = {}
+        flagged = 0
+        with override_settings(ALLOWED_HOSTS=["testserver"], RATE_LIMITS=rate_limits):
+            client = APIClient()
+            client.force_authenticate(user=actor.user)
+            for name in options["scenarios"]:
+                results[name] = self.explain_scenario(client, SCENARIOS[name], actor, others, rng)
+                for query in results[name]:
+                    query["seq_scans"] = [
+                        table for table in query["seq_scans"] if table not in ignored
+                    ]
+                    flagged += bool(query["seq_scans"])
+                self.report(name, results[name])
+
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=2)
+        if flagged and options["fail_on_seq_scan"]:
+            raise CommandError(f"{flagged} queries planned with sequential scans.")
+
+    def explain_scenario(self, client, scenario, actor, others, rng) -> List[dict]:
+        """
+        Plans of the distinct queries one call makes. Everything, including
+        the scenario's setup, is rolled back.
+        """
+        with transaction.atomic():
+            url_kwargs, data = (None, None)
+            if scenario.prepare is not None:
+                url_kwargs, data = scenario.prepare(actor, others, rng)
+            url = reverse(scenario.url_name, kwargs=url_kwargs)
+            with CaptureQueriesContext(connection) as captured:
+                response = getattr(client, scenario.method)(url, data, format="json")
+            if response.status_code >= 500:
+                raise CommandError(f"{scenario.url_name} returned {response.status_code}.")
+            sqls = dict.fromkeys(
+                query["sql"]
+                for query in captured.captured_queries
+                if query["sql"].lstrip().upper().startswith(EXPLAINABLE)
+            )
+            plans = [self.explain(sql) for sql in sqls]
+            transaction.set_rollback(True)
+        return plans
+
+    def explain(self, sql: str) -> dict:
+        with connection.cursor() as cursor:
+            cursor.execute(EXPLAIN_PREFIX[connection.vendor] + sql)
+            # PostgreSQL returns one plan line per row, SQLite the line last.
+            plan = [row[-1] for row in cursor.fetchall()]
+        pattern = SEQ_SCAN[connection.vendor]
+        seq_scans = [
+            match.group(1) for match in (pattern.search(line.strip()) for line in plan) if match
+        ]
+        return {"sql": sql, "plan": plan, "seq_scans": seq_scans}
+
+    def report(self, name: str, plans: List[dict]) -> None:
+        flagged = [plan for plan in plans if plan["seq_scans"]]
+        self.stdout.write(f"{name:<22} queries={len(plans)} seq_scans={len(flagged)}")
+        for plan in flagged:
+            self.stdout.write(f"  {', '.join(plan['seq_scans'])}: {plan['sql'][:200]}")
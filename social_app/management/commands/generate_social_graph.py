@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from social_app.benchmarking import generate_social_graph
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk load synthetic users with power-law friend degrees, pending and "
+        "rejected requests and blocks, for load tests and benchmarks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100_000)
+        parser.add_argument("--mean-friends", type=float, default=20)
+        parser.add_argument(
+            "--exponent",
+            type=float,
+            default=2.5,
+            help="Pareto exponent of the friend degrees; lower gives more hubs.",
+        )
+        parser.add_argument("--pending-per-user", type=float, default=2)
+        parser.add_argument("--rejected-per-user", type=float, default=1)
+        parser.add_argument("--blocks-per-user", type=float, default=0.2)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        if options["exponent"] <= 1:
+            raise CommandError("--exponent must be greater than 1.")
+        start = time.perf_counter()
+        counts = generate_social_graph(
+            options["users"],
+            mean_friends=options["mean_friends"],
+            exponent=options["exponent"],
+            pending_per_user=options["pending_per_user"],
+            rejected_per_user=options["rejected_per_user"],
+            blocks_per_user=options["blocks_per_user"],
+            batch_size=options["batch_size"],
+            seed=options["seed"],
+        )
+        elapsed = time.perf_counter() - start
+        summary = ", ".join(f"{count} {kind}" for kind, count in counts.items())
+        self.stdout.write(f"Generated {summary} in {elapsed:.1f}s.")
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from social_app.user_import import import_users, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Import users with their profiles from a CSV (email,name,password header) "
+        "or JSON lines file, in chunks. Existing emails are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--hash-passwords",
+            action="store_true",
+            help="Passwords are plain text; hash them with the configured hasher. "
+            "By default they must be hashes one of PASSWORD_HASHERS can verify.",
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        counts = import_users(
+            read_rows(options["path"]),
+            batch_size=options["batch_size"],
+            hash_passwords=options["hash_passwords"],
+        )
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {counts['imported']} users in {elapsed:.1f}s; skipped "
+                f"{counts['existing']} existing and {counts['invalid']} invalid rows."
+            )
+        )
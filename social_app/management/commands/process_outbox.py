@@ -0,0 +1,80 @@
+import signal
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from social_app.outbox import process_batch, prune_processed
+
+
+class Command(BaseCommand):
+    help = (
+        "Drain the friend graph outbox into the configured consumers, polling "
+        "the database for new events. No external broker is needed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=settings.OUTBOX_BATCH_SIZE)
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=1,
+            help="Worker threads, each claiming its own batches.",
+        )
+        parser.add_argument(
+            "--poll-interval", type=float, default=settings.OUTBOX_POLL_INTERVAL
+        )
+        parser.add_argument(
+            "--max-attempts", type=int, default=settings.OUTBOX_MAX_ATTEMPTS
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Exit once the outbox is empty."
+        )
+
+    def handle(self, *args, **options):
+        self.stopping = threading.Event()
+        self.processed = 0
+        self.lock = threading.Lock()
+        previous_handlers = {}
+        if threading.current_thread() is threading.main_thread():
+            # Finish the current batches on SIGINT/SIGTERM, then exit.
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                previous_handlers[signum] = signal.signal(
+                    signum, lambda *_: self.stopping.set()
+                )
+        try:
+            if options["concurrency"] == 1:
+                self.work(options)
+            else:
+                threads = [
+                    threading.Thread(target=self.work, args=(options,), daemon=True)
+                    for _ in range(options["concurrency"])
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+        finally:
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+        self.stdout.write(f"Processed {self.processed} events.")
+
+    def work(self, options) -> None:
+        retention = timedelta(hours=settings.OUTBOX_RETENTION_HOURS)
+        try:
+            while not self.stopping.is_set():
+                claimed = process_batch(options["batch_size"], options["max_attempts"])
+                with self.lock:
+                    self.processed += claimed
+                if claimed:
+                    continue
+                if options["once"]:
+                    break
+                prune_processed(timezone.now() - retention)
+                self.stopping.wait(options["poll_interval"])
+        finally:
+            if threading.current_thread() is not threading.main_thread():
+                connection.close()
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from social_app.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount the friend and pending request counters of every profile and "
+        "fix the ones that drifted, e.g. after bulk loads or manual edits."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Report drifted profiles without fixing them."
+        )
+
+    def handle(self, *args, **options):
+        result = reconcile_counters(
+            batch_size=options["batch_size"], dry_run=options["dry_run"]
+        )
+        verb = "Found" if options["dry_run"] else "Fixed"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {result['fixed']} of {result['checked']} profiles with drifted counters."
+            )
+        )
@@ -0,0 +1,65 @@
+# Generated by Django 5.0.7 on 2026-10-18 01:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_friendships(apps, schema_editor):
+    UserProfile = apps.get_model("social_app", "UserProfile")
+    Friendship = apps.get_model("social_app", "Friendship")
+    rows = UserProfile.friends.through.objects.values_list(
+        "from_userprofile_id", "to_userprofile_id"
+    )
+    batch = []
+    for profile_id, friend_id in rows.iterator(chunk_size=5000):
+        batch.append(Friendship(profile_id=profile_id, friend_id=friend_id))
+        batch.append(Friendship(profile_id=friend_id, friend_id=profile_id))
+        if len(batch) >= 10000:
+            Friendship.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    Friendship.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("social_app", "0005_alter_blockdetail_unique_together"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Friendship",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "friend",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="friend_of",
+                        to="social_app.userprofile",
+                    ),
+                ),
+                (
+                    "profile",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="friendships",
+                        to="social_app.userprofile",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("profile", "friend")},
+            },
+        ),
+        migrations.RunPython(backfill_friendships, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.0.7 on 2026-10-18 01:28
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+CREATE_SEARCH_INDEXES = """
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE OR REPLACE FUNCTION social_app_customuser_search_vector_update()
+RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := to_tsvector('simple', coalesce(NEW.name, ''));
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER social_app_customuser_search_vector_trigger
+BEFORE INSERT OR UPDATE ON social_app_customuser
+FOR EACH ROW EXECUTE FUNCTION social_app_customuser_search_vector_update();
+
+UPDATE social_app_customuser
+SET search_vector = to_tsvector('simple', coalesce(name, ''));
+
+CREATE INDEX social_app_customuser_search_vector_idx
+ON social_app_customuser USING GIN (search_vector);
+
+CREATE INDEX social_app_customuser_name_trgm_idx
+ON social_app_customuser USING GIN (name gin_trgm_ops);
+"""
+
+DROP_SEARCH_INDEXES = """
+DROP INDEX IF EXISTS social_app_customuser_name_trgm_idx;
+DROP INDEX IF EXISTS social_app_customuser_search_vector_idx;
+DROP TRIGGER IF EXISTS social_app_customuser_search_vector_trigger
+ON social_app_customuser;
+DROP FUNCTION IF EXISTS social_app_customuser_search_vector_update();
+"""
+
+
+def create_search_indexes(apps, schema_editor):
+    # Other databases use SimpleUserSearchEngine and leave the column empty.
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CREATE_SEARCH_INDEXES)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_SEARCH_INDEXES)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("social_app", "0007_friendsuggestion"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customuser",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
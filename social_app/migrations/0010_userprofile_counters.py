@@ -0,0 +1,53 @@
+# Generated by Django 5.0.7 on 2026-10-18 01:56
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def _count_of(model, profile_field, **filters):
+    rows = (
+        model.objects.filter(**{profile_field: OuterRef("uuid")}, **filters)
+        .order_by()
+        .values(profile_field)
+        .annotate(total=Count("*"))
+        .values("total")
+    )
+    return Coalesce(Subquery(rows, output_field=IntegerField()), 0)
+
+
+def backfill_counters(apps, schema_editor):
+    UserProfile = apps.get_model("social_app", "UserProfile")
+    Friendship = apps.get_model("social_app", "Friendship")
+    FriendRequest = apps.get_model("social_app", "FriendRequest")
+    UserProfile.objects.update(
+        friend_count=_count_of(Friendship, "profile"),
+        pending_received_count=_count_of(FriendRequest, "receiver", status="P"),
+        pending_sent_count=_count_of(FriendRequest, "sender", status="P"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("social_app", "0009_outboxevent"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userprofile",
+            name="friend_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="userprofile",
+            name="pending_received_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="userprofile",
+            name="pending_sent_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.0.7 on 2026-10-18 01:59
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+CONSTRAINT = models.UniqueConstraint(Lower("email"), name="customuser_email_lower_uniq")
+
+
+def check_case_duplicates(apps, schema_editor):
+    CustomUser = apps.get_model("social_app", "CustomUser")
+    duplicates = list(
+        CustomUser.objects.values(email_lower=Lower("email"))
+        .annotate(total=Count("*"))
+        .filter(total__gt=1)
+        .values_list("email_lower", flat=True)[:20]
+    )
+    if duplicates:
+        raise RuntimeError(
+            "Emails registered more than once in different case must be merged "
+            f"before migrating: {', '.join(duplicates)}"
+        )
+
+
+def create_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        # Built without blocking writes to the users table. IF NOT EXISTS
+        # lets a migration interrupted after this statement be rerun; drop
+        # the index first if it was left INVALID.
+        schema_editor.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS customuser_email_lower_uniq "
+            "ON social_app_customuser (LOWER(email))"
+        )
+    else:
+        CustomUser = apps.get_model("social_app", "CustomUser")
+        schema_editor.add_constraint(CustomUser, CONSTRAINT)
+
+
+def drop_index(apps, schema_editor):
+    CustomUser = apps.get_model("social_app", "CustomUser")
+    schema_editor.remove_constraint(CustomUser, CONSTRAINT)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run in a transaction.
+    atomic = False
+
+    dependencies = [
+        ("social_app", "0010_userprofile_counters"),
+    ]
+
+    operations = [
+        migrations.RunPython(check_case_duplicates, migrations.RunPython.noop),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddConstraint(model_name="customuser", constraint=CONSTRAINT),
+            ],
+            database_operations=[migrations.RunPython(create_index, drop_index)],
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.0.7 on 2026-10-18 02:06
+
+from django.db import migrations, models
+
+INDEXES = [
+    (
+        "blockdetail",
+        models.Index(fields=["blocked", "blocker"], name="blockdetail_blocked_idx"),
+    ),
+    (
+        "friendrequest",
+        models.Index(
+            models.F("receiver"),
+            models.OrderBy(models.F("created_at"), descending=True),
+            models.OrderBy(models.F("uuid"), descending=True),
+            condition=models.Q(("status", "P")),
+            name="friendrequest_pending_idx",
+        ),
+    ),
+    (
+        "userprofile",
+        models.Index(
+            models.OrderBy(models.F("created_at"), descending=True),
+            models.OrderBy(models.F("uuid"), descending=True),
+            name="userprofile_keyset_idx",
+        ),
+    ),
+]
+
+
+def create_indexes(apps, schema_editor):
+    for model_name, index in INDEXES:
+        model = apps.get_model("social_app", model_name)
+        if schema_editor.connection.vendor == "postgresql":
+            # Built without blocking writes to the tables.
+            schema_editor.add_index(model, index, concurrently=True)
+        else:
+            schema_editor.add_index(model, index)
+
+
+def drop_indexes(apps, schema_editor):
+    for model_name, index in INDEXES:
+        schema_editor.remove_index(apps.get_model("social_app", model_name), index)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run in a transaction.
+    atomic = False
+
+    dependencies = [
+        ("social_app", "0011_customuser_email_lower_uniq"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(model_name=model_name, index=index)
+                for model_name, index in INDEXES
+            ],
+            database_operations=[migrations.RunPython(create_indexes, drop_indexes)],
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.7 on 2026-10-18 02:09
+
+import social_app.ids
+from django.db import migrations, models
+
+MODELS = ["blockdetail", "friendrequest", "friendsuggestion", "userprofile"]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("social_app", "0012_hot_query_indexes"),
+    ]
+
+    # Only the Python-side default changes: the column stays a uuid and
+    # existing rows keep their ids. State-only, as SQLite would otherwise
+    # rebuild each table.
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name=model_name,
+                    name="uuid",
+                    field=models.UUIDField(
+                        default=social_app.ids.uuid7,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                )
+                for model_name in MODELS
+            ],
+        ),
+    ]
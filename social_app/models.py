@@ -1,11 +1,17 @@
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager
-from django.db import models
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models, transaction
 from django.utils import timezone
-import uuid
 from django.db.models import QuerySet
+from django.db.models.functions import Lower
 from django.conf import settings
 from datetime import timedelta
-from django.db.models import Subquery
+from typing import List
+from . import counters, outbox
+from .auth_state import invalidate_auth_state
+from .blocklist import get_blocker_ids, invalidate_blocker_ids
+from .ids import uuid7
+from .caching import FRIENDS_LIST, PENDING_LIST, invalidate_list_cache, invalidate_user_lists
 
 
 class CustomUserManager(BaseUserManager):
@@ -29,6 +35,22 @@ class CustomUserManager(BaseUserManager):
 
         return self.create_user(email, password, **extra_fields)
 
+    def by_email(self, email: str) -> QuerySet:
+        """
+        The user with this email in any case. Filters on LOWER(email) so the
+        lookup uses the `customuser_email_lower_uniq` index, unlike
+        `email__iexact`, which compiles to UPPER() on PostgreSQL.
+        """
+        return self.alias(email_lower=Lower("email")).filter(email_lower=email.lower())
+
+    def by_emails(self, emails) -> QuerySet:
+        return self.alias(email_lower=Lower("email")).filter(
+            email_lower__in=[email.lower() for email in emails]
+        )
+
+    def get_by_natural_key(self, username):
+        return self.by_email(username).get()
+
 
 class CustomUser(AbstractBaseUser):
     email = models.EmailField(unique=True)
@@ -38,18 +60,38 @@ class CustomUser(AbstractBaseUser):
     date_joined = models.DateTimeField(default=timezone.now)
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
+    # Maintained by a database trigger on PostgreSQL, unused elsewhere.
+    search_vector = SearchVectorField(null=True, editable=False)
 
     objects = CustomUserManager()
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(Lower("email"), name="customuser_email_lower_uniq"),
+        ]
+
     def __str__(self):
         return f"{self.email}"
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Deactivation or a password change must reach token authentication.
+        invalidate_auth_state(self.pk)
+
+    def delete(self, *args, **kwargs):
+        user_id = self.pk
+        result = super().delete(*args, **kwargs)
+        invalidate_auth_state(user_id)
+        return result
+
 
 class BaseModel(models.Model):
-    uuid = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # Time-ordered, so new rows are appended to the primary key index.
+    # Rows created before the switch keep their random version 4 ids.
+    uuid = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -59,8 +101,12 @@ class BaseModel(models.Model):
 
 class UserProfileQuerySet(models.QuerySet):
     def remove_block_users(self, user):
-        blockers = BlockDetail.objects.filter(blocked=user).values('blocker')
-        return self.exclude(uuid__in=Subquery(blockers))
+        return self.exclude_blockers(get_blocker_ids(user.uuid))
+
+    def exclude_blockers(self, blocker_ids):
+        if not blocker_ids:
+            return self
+        return self.exclude(uuid__in=blocker_ids)
 
 
 class UserProfileManager(models.Manager):
@@ -75,13 +121,48 @@ class UserProfile(BaseModel):
     friends = models.ManyToManyField(
         "self", symmetrical=False, related_name="following", blank=True
     )
+    # Maintained on write through social_app.counters.
+    friend_count = models.PositiveIntegerField(default=0, editable=False)
+    pending_received_count = models.PositiveIntegerField(default=0, editable=False)
+    pending_sent_count = models.PositiveIntegerField(default=0, editable=False)
     objects = UserProfileManager()
 
+    class Meta:
+        indexes = [
+            # The user listing's keyset ordering, DEFAULT_KEYSET_ORDERING.
+            models.Index(
+                models.F("created_at").desc(),
+                models.F("uuid").desc(),
+                name="userprofile_keyset_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.user.name}"
 
     def get_friends(self) -> QuerySet["UserProfile"]:
-        return self.friends.all()
+        return UserProfile.objects.filter(friend_of__profile=self)
+
+
+class Friendship(models.Model):
+    """
+    Symmetric friend adjacency: an accepted request is stored once per
+    direction so membership and friend lists are single index lookups.
+    """
+
+    profile = models.ForeignKey(
+        UserProfile, on_delete=models.CASCADE, related_name="friendships"
+    )
+    friend = models.ForeignKey(
+        UserProfile, on_delete=models.CASCADE, related_name="friend_of"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("profile", "friend")
+
+    def __str__(self):
+        return f"{self.profile_id} <-> {self.friend_id}"
 
 
 class RequestStatus(models.TextChoices):
@@ -104,20 +185,33 @@ class FriendRequest(BaseModel):
 
     class Meta:
         unique_together = ("sender", "receiver")
+        indexes = [
+            # A receiver's pending requests, newest first, as paginated.
+            models.Index(
+                "receiver",
+                models.F("created_at").desc(),
+                models.F("uuid").desc(),
+                condition=models.Q(status=RequestStatus.PENDING),
+                name="friendrequest_pending_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.sender} -> {self.receiver}"
 
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding and self.status == RequestStatus.PENDING:
+                counters.adjust_pending([self], 1)
+        invalidate_list_cache(PENDING_LIST, self.receiver_id)
+
     def make_accepted(self) -> None:
-        self.sender.friends.add(self.receiver)
-        self.status = RequestStatus.ACCEPTED
-        self.save()
+        FriendRequest.accept_many([self])
 
     def make_rejected(self) -> None:
-        self.status = RequestStatus.REJECTED
-        cooldown_time = timezone.now() + timedelta(seconds=settings.COOLDOWN_TIME)
-        self.cooldown_time = cooldown_time
-        self.save()
+        FriendRequest.reject_many([self])
 
     def not_in_pending(self) -> bool:
         return self.status != RequestStatus.PENDING
@@ -129,17 +223,196 @@ class FriendRequest(BaseModel):
         return self.cooldown_time < timezone.now()
 
     def make_pending(self):
-        self.status = RequestStatus.PENDING
-        self.cooldown_time = None
-        self.save()
+        FriendRequest.make_pending_many([self])
+
+    @classmethod
+    def accept_many(cls, requests: List["FriendRequest"]) -> None:
+        """
+        Accept requests with one insert per adjacency table and one update.
+        """
+        now = timezone.now()
+        through = UserProfile.friends.through
+        with transaction.atomic():
+            new_friendships = counters.unstored_friendships(
+                (request.sender_id, request.receiver_id) for request in requests
+            )
+            through.objects.bulk_create(
+                [
+                    through(
+                        from_userprofile_id=request.sender_id,
+                        to_userprofile_id=request.receiver_id,
+                    )
+                    for request in requests
+                ],
+                ignore_conflicts=True,
+            )
+            Friendship.objects.bulk_create(
+                [
+                    edge
+                    for request in requests
+                    for edge in (
+                        Friendship(profile_id=request.sender_id, friend_id=request.receiver_id),
+                        Friendship(profile_id=request.receiver_id, friend_id=request.sender_id),
+                    )
+                ],
+                ignore_conflicts=True,
+            )
+            counters.count_friendships(new_friendships)
+            counters.adjust_pending(
+                [request for request in requests if request.status == RequestStatus.PENDING], -1
+            )
+            for request in requests:
+                request.status = RequestStatus.ACCEPTED
+                request.updated_at = now
+            FriendRequest.objects.bulk_update(requests, ["status", "updated_at"])
+            outbox.emit(outbox.REQUEST_ACCEPTED, map(outbox.request_payload, requests))
+        profile_ids = {request.sender_id for request in requests}
+        profile_ids.update(request.receiver_id for request in requests)
+        invalidate_list_cache(FRIENDS_LIST, *profile_ids)
+        invalidate_list_cache(PENDING_LIST, *{request.receiver_id for request in requests})
+
+    @classmethod
+    def reject_many(cls, requests: List["FriendRequest"]) -> None:
+        now = timezone.now()
+        cooldown_time = now + timedelta(seconds=settings.COOLDOWN_TIME)
+        was_pending = [request for request in requests if request.status == RequestStatus.PENDING]
+        for request in requests:
+            request.status = RequestStatus.REJECTED
+            request.cooldown_time = cooldown_time
+            request.updated_at = now
+        with transaction.atomic():
+            counters.adjust_pending(was_pending, -1)
+            FriendRequest.objects.bulk_update(
+                requests, ["status", "cooldown_time", "updated_at"]
+            )
+            outbox.emit(outbox.REQUEST_REJECTED, map(outbox.request_payload, requests))
+        invalidate_list_cache(PENDING_LIST, *{request.receiver_id for request in requests})
+
+    @classmethod
+    def make_pending_many(cls, requests: List["FriendRequest"]) -> None:
+        now = timezone.now()
+        not_pending = [request for request in requests if request.status != RequestStatus.PENDING]
+        for request in requests:
+            request.status = RequestStatus.PENDING
+            request.cooldown_time = None
+            request.updated_at = now
+        with transaction.atomic():
+            counters.adjust_pending(not_pending, 1)
+            FriendRequest.objects.bulk_update(
+                requests, ["status", "cooldown_time", "updated_at"]
+            )
+            outbox.emit(outbox.REQUEST_SENT, map(outbox.request_payload, requests))
+        invalidate_list_cache(PENDING_LIST, *{request.receiver_id for request in requests})
 
     def is_accepted(self):
         return self.status == RequestStatus.ACCEPTED
     
 
+class ArchivedFriendRequest(models.Model):
+    """
+    A resolved friend request moved out of FriendRequest by
+    social_app.archival, keeping its id and timestamps. Rejected requests
+    are only archived once their cooldown is over, so an archived request
+    never stops a new one from being sent; an archived acceptance still
+    answers "Already friends".
+    """
+
+    uuid = models.UUIDField(primary_key=True, editable=False)
+    sender = models.ForeignKey(
+        UserProfile, on_delete=models.CASCADE, related_name="+", db_index=False
+    )
+    receiver = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name="+")
+    status = models.CharField(max_length=1, choices=RequestStatus.choices)
+    cooldown_time = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["sender", "receiver"], name="archivedrequest_pair_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.sender_id} -> {self.receiver_id} (archived)"
+
+    def is_rejected(self):
+        return self.status == RequestStatus.REJECTED
+
+    def is_accepted(self):
+        return self.status == RequestStatus.ACCEPTED
+
+
 class BlockDetail(BaseModel):
     blocker = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='blocked_details')
     blocked = models.ForeignKey(UserProfile, on_delete=models.CASCADE)
 
     class Meta:
-        unique_together = ("blocker", "blocked")
\ No newline at end of file
+        unique_together = ("blocker", "blocked")
+        indexes = [
+            # Who blocked a profile; covers the blocklist lookups.
+            models.Index(fields=["blocked", "blocker"], name="blockdetail_blocked_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                outbox.emit(outbox.USER_BLOCKED, [outbox.block_payload(self)])
+        invalidate_user_lists(self.blocker_id, self.blocked_id)
+        invalidate_blocker_ids(self.blocked_id)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            outbox.emit(outbox.USER_UNBLOCKED, [outbox.block_payload(self)])
+        invalidate_user_lists(self.blocker_id, self.blocked_id)
+        invalidate_blocker_ids(self.blocked_id)
+        return result
+
+
+class FriendSuggestion(BaseModel):
+    """
+    Precomputed "people you may know" entry, refreshed by the suggestions job.
+    """
+
+    profile = models.ForeignKey(
+        UserProfile, on_delete=models.CASCADE, related_name="suggestions"
+    )
+    suggested = models.ForeignKey(
+        UserProfile, on_delete=models.CASCADE, related_name="+"
+    )
+    mutual_count = models.PositiveIntegerField()
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        unique_together = ("profile", "suggested")
+        ordering = ("rank",)
+
+
+class OutboxEvent(models.Model):
+    """
+    Side effect of a friend graph change, written in the same transaction as
+    the change and handed to the configured consumers by `process_outbox`.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    topic = models.CharField(max_length=64)
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=models.Q(processed_at__isnull=True),
+                name="outbox_unprocessed_idx",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.topic} #{self.id}"
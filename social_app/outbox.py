@@ -0,0 +1,102 @@
+import logging
+from functools import lru_cache
+from typing import Dict, Iterable, List
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+REQUEST_SENT = "friend_request.sent"
+REQUEST_ACCEPTED = "friend_request.accepted"
+REQUEST_REJECTED = "friend_request.rejected"
+USER_BLOCKED = "block.created"
+USER_UNBLOCKED = "block.deleted"
+
+
+def request_payload(request) -> Dict[str, str]:
+    return {
+        "request_id": str(request.uuid),
+        "sender_id": str(request.sender_id),
+        "receiver_id": str(request.receiver_id),
+    }
+
+
+def block_payload(block) -> Dict[str, str]:
+    return {"blocker_id": str(block.blocker_id), "blocked_id": str(block.blocked_id)}
+
+
+def emit(topic: str, payloads: Iterable[dict]) -> None:
+    """
+    Queue one event per payload. Call it inside the transaction making the
+    change, so events exist exactly when the change is committed.
+    """
+    OutboxEvent = apps.get_model("social_app", "OutboxEvent")
+    OutboxEvent.objects.bulk_create(
+        [OutboxEvent(topic=topic, payload=payload) for payload in payloads]
+    )
+
+
+class BaseConsumer:
+    """
+    Handles batches of events of its `topics`. Events are retried after a
+    failure, also when another consumer of the batch failed, so `handle`
+    must be idempotent.
+    """
+
+    topics: tuple = ()
+
+    def handle(self, events: List) -> None:
+        raise NotImplementedError
+
+
+@lru_cache(maxsize=None)
+def get_consumers() -> List[BaseConsumer]:
+    return [import_string(path)() for path in settings.OUTBOX_CONSUMERS]
+
+
+def process_batch(batch_size: int = 100, max_attempts: int = 5) -> int:
+    """
+    Claim up to `batch_size` unprocessed events, oldest first, and pass them
+    to their consumers. Rows are locked with SKIP LOCKED where supported, so
+    several workers can drain the outbox in parallel. A failing consumer
+    rolls back its own writes and leaves the batch for a retry; events are
+    given up on after `max_attempts`. Returns the number of events claimed.
+    """
+    OutboxEvent = apps.get_model("social_app", "OutboxEvent")
+    with transaction.atomic():
+        events = list(
+            OutboxEvent.objects.select_for_update(skip_locked=True)
+            .filter(processed_at__isnull=True, attempts__lt=max_attempts)
+            .order_by("id")[:batch_size]
+        )
+        if not events:
+            return 0
+        errors = []
+        for consumer in get_consumers():
+            selected = [event for event in events if event.topic in consumer.topics]
+            if not selected:
+                continue
+            try:
+                with transaction.atomic():
+                    consumer.handle(selected)
+            except Exception as exc:
+                logger.exception("Outbox consumer %s failed", type(consumer).__name__)
+                errors.append(f"{type(consumer).__name__}: {exc!r}")
+        for event in events:
+            event.attempts += 1
+            if errors:
+                event.last_error = "\n".join(errors)
+            else:
+                event.processed_at = timezone.now()
+        OutboxEvent.objects.bulk_update(events, ["attempts", "last_error", "processed_at"])
+    return len(events)
+
+
+def prune_processed(older_than) -> int:
+    OutboxEvent = apps.get_model("social_app", "OutboxEvent")
+    deleted, _ = OutboxEvent.objects.filter(processed_at__lt=older_than).delete()
+    return deleted
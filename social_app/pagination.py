@@ -0,0 +1,207 @@
+import base64
+import binascii
+import json
+from typing import List, Optional, Sequence, cast
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import InvalidPage, Page
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+DEFAULT_KEYSET_ORDERING = ("-created_at", "-uuid")
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over a unique ordering, e.g. (created_at, uuid). Pages
+    are fetched with a `WHERE (ordering) < (cursor)` filter instead of an
+    OFFSET, no total count is computed and rows inserted while a client is
+    paging never shift or repeat the pages after its cursor.
+    """
+
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self, page_size: int, ordering: Sequence[str] = DEFAULT_KEYSET_ORDERING):
+        self.page_size = page_size
+        self.ordering = tuple(ordering)
+        self.next_cursor: Optional[str] = None
+
+    def paginate_queryset(self, queryset, request, view=None) -> List:
+        return self.finish_page(list(self.get_page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None) -> List:
+        queryset = self.get_page_queryset(queryset, request)
+        return self.finish_page([item async for item in queryset])
+
+    def get_page_queryset(self, queryset, request) -> QuerySet:
+        """
+        The rows of the requested page plus one, which tells whether a next
+        page exists.
+        """
+        self.request = request
+        queryset = queryset.order_by(*self.ordering)
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded:
+            values = self.decode_cursor(encoded, queryset)
+            queryset = queryset.filter(self.after(values))
+        return queryset[: self.page_size + 1]
+
+    def finish_page(self, page: List) -> List:
+        self.next_cursor = None
+        if len(page) > self.page_size:
+            page = page[: self.page_size]
+            self.next_cursor = self.encode_cursor(page[-1])
+        return page
+
+    def after(self, values: Sequence) -> Q:
+        """
+        Lexicographic "comes after" filter for the ordering, e.g. for
+        ("-created_at", "-uuid"): created_at < c OR (created_at = c AND uuid < u).
+        """
+        condition = Q()
+        for position, field in enumerate(self.ordering):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            step = Q(**{f"{name}__{lookup}": values[position]})
+            for previous, value in zip(self.ordering[:position], values):
+                step &= Q(**{previous.lstrip("-"): value})
+            condition |= step
+        return condition
+
+    def get_value(self, item, name: str):
+        if isinstance(item, dict):
+            return item[name]
+        return getattr(item, name)
+
+    def encode_cursor(self, item) -> str:
+        values = []
+        for field in self.ordering:
+            value = self.get_value(item, field.lstrip("-"))
+            values.append(value if isinstance(value, (int, float)) else str(value))
+        payload = json.dumps(values, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(payload).decode()
+
+    def decode_cursor(self, encoded: str, queryset: QuerySet) -> List:
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+            return [
+                self.to_python(queryset, field.lstrip("-"), value)
+                for field, value in zip(self.ordering, values)
+            ]
+        except (ValueError, TypeError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def to_python(self, queryset: QuerySet, name: str, value):
+        try:
+            field = queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # Annotations such as a search rank are kept as decoded.
+            return value
+        return field.to_python(value)
+
+    def get_next_link(self) -> Optional[str]:
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data) -> Response:
+        return Response({"next": self.get_next_link(), "results": data})
+
+
+class CustomPagination(PageNumberPagination):
+    """
+    Page number pagination by default. Clients opt into keyset pagination
+    with `?pagination=cursor`, then follow the `next` links, which carry a
+    `cursor` parameter. Views choose the keyset with `keyset_ordering` or
+    `get_keyset_ordering()`, and can skip the page number COUNT query with a
+    `get_known_count()` (async views: `aget_known_count()`) returning the
+    total, or None to count.
+    """
+
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    mode_query_param = "pagination"
+    cursor_query_param = KeysetPagination.cursor_query_param
+
+    keyset: Optional[KeysetPagination] = None
+
+    def get_page_size(self, request) -> int:
+        # page_size is always set, so the base class never returns None here.
+        return super().get_page_size(request) or self.page_size
+
+    def use_keyset(self, request) -> bool:
+        return (
+            request.query_params.get(self.mode_query_param) == "cursor"
+            or self.cursor_query_param in request.query_params
+        )
+
+    def get_keyset_ordering(self, view) -> Sequence[str]:
+        if hasattr(view, "get_keyset_ordering"):
+            return view.get_keyset_ordering()
+        return getattr(view, "keyset_ordering", DEFAULT_KEYSET_ORDERING)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.use_keyset(request):
+            self.keyset = KeysetPagination(
+                self.get_page_size(request), self.get_keyset_ordering(view)
+            )
+            return self.keyset.paginate_queryset(queryset, request, view)
+        count = view.get_known_count() if hasattr(view, "get_known_count") else None
+        if count is None:
+            return super().paginate_queryset(queryset, request, view)
+        return list(self.load_page(queryset, request, count).object_list)
+
+    async def apaginate_queryset(self, queryset, request, view=None) -> List:
+        """
+        `paginate_queryset` for async views, running the count and page
+        queries through the async ORM.
+        """
+        self.keyset = None
+        if self.use_keyset(request):
+            self.keyset = KeysetPagination(
+                self.get_page_size(request), self.get_keyset_ordering(view)
+            )
+            return await self.keyset.apaginate_queryset(queryset, request, view)
+        count = None
+        if hasattr(view, "aget_known_count"):
+            count = await view.aget_known_count()
+        if count is None:
+            count = await queryset.acount()
+        page = self.load_page(queryset, request, count)
+        # The page holds an unevaluated slice of the queryset.
+        page.object_list = [item async for item in cast(QuerySet, page.object_list)]
+        return page.object_list
+
+    def load_page(self, queryset, request, count: int) -> Page:
+        """
+        Set up the requested page of a queryset whose row count is already
+        known, e.g. from a profile counter column, so no COUNT query runs.
+        """
+        self.request = request
+        paginator = self.django_paginator_class(queryset, self.get_page_size(request))
+        # Paginator.count is a cached_property; prime it so page() doesn't query.
+        paginator.count = count
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(
+                self.invalid_page_message.format(page_number=page_number, message=str(exc))
+            )
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_paginated_response(self, data) -> Response:
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -1,5 +1,6 @@
 from rest_framework.permissions import BasePermission
-from .models import BlockDetail, FriendRequest
+from .blocklist import is_blocked_by
+from .models import FriendRequest
 
 
 class IsReceiver(BasePermission):
@@ -17,4 +18,4 @@ class IsNotBlockedUser(BasePermission):
     def has_permission(self, request, view) -> bool:
         blocked = request.user.user_profile
         blocker_id = request.parser_context['kwargs'].get("user_id")
-        return not BlockDetail.objects.filter(blocked=blocked, blocker_id=blocker_id).exists()
+        return not is_blocked_by(blocked.uuid, blocker_id)
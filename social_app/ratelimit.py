@@ -0,0 +1,112 @@
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Deque, Dict, Tuple
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    remaining: int
+    retry_after: float
+
+
+def parse_rate(rate: str) -> Tuple[int, int]:
+    """
+    Parse a DRF style rate such as "3/min" into (limit, window in seconds).
+    """
+    num, period = rate.split("/")
+    duration = {"s": 1, "m": 60, "h": 3600, "d": 86400}[period[0]]
+    return int(num), duration
+
+
+class BaseRateLimiter:
+    def hit(self, key: str, limit: int, window: int, cost: int = 1) -> RateLimitResult:
+        """
+        Record `cost` hits against `key` if they fit in the sliding window.
+        Rejected hits are not recorded.
+        """
+        raise NotImplementedError
+
+
+class LocalSlidingWindowRateLimiter(BaseRateLimiter):
+    """
+    In-process sliding window, meant for tests and single process setups.
+    """
+
+    def __init__(self) -> None:
+        self._hits: Dict[str, Deque[float]] = defaultdict(deque)
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, limit: int, window: int, cost: int = 1) -> RateLimitResult:
+        now = time.monotonic()
+        with self._lock:
+            hits = self._hits[key]
+            while hits and hits[0] <= now - window:
+                hits.popleft()
+            if len(hits) + cost > limit:
+                retry_after = hits[0] + window - now if hits else window
+                return RateLimitResult(False, limit - len(hits), retry_after)
+            hits.extend([now] * cost)
+            return RateLimitResult(True, limit - len(hits), 0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hits.clear()
+
+
+# Trim the window, then admit the hit only if it still fits. Running it as a
+# single script keeps check-and-add atomic across workers.
+SLIDING_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+local count = redis.call('ZCARD', key)
+if count + cost > limit then
+    local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+    local retry_after = window
+    if oldest[2] then
+        retry_after = tonumber(oldest[2]) + window - now
+    end
+    return {0, limit - count, retry_after}
+end
+for i = 1, cost do
+    redis.call('ZADD', key, now, ARGV[5] .. ':' .. i)
+end
+redis.call('PEXPIRE', key, window)
+return {1, limit - count - cost, 0}
+"""
+
+
+class RedisSlidingWindowRateLimiter(BaseRateLimiter):
+    """
+    Sliding window log kept in a Redis sorted set per key.
+    """
+
+    def __init__(self) -> None:
+        from django_redis import get_redis_connection
+
+        connection = get_redis_connection(settings.RATE_LIMIT_CACHE_ALIAS)
+        self._script = connection.register_script(SLIDING_WINDOW_SCRIPT)
+
+    def hit(self, key: str, limit: int, window: int, cost: int = 1) -> RateLimitResult:
+        now_ms = int(time.time() * 1000)
+        allowed, remaining, retry_after_ms = self._script(
+            keys=[f"ratelimit:{key}"],
+            args=[now_ms, window * 1000, limit, cost, uuid.uuid4().hex],
+        )
+        return RateLimitResult(bool(allowed), int(remaining), int(retry_after_ms) / 1000)
+
+
+@lru_cache(maxsize=None)
+def get_rate_limiter() -> BaseRateLimiter:
+    return import_string(settings.RATE_LIMIT_BACKEND)()
@@ -0,0 +1,33 @@
+import orjson
+from django.conf import settings
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+from .instrumentation import InstrumentedJSONRenderer, measure_serialization
+
+_ENCODER = JSONEncoder()
+_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+class FastJSONRenderer(InstrumentedJSONRenderer):
+    """
+    Renders with orjson when FAST_SERIALIZATION is on, producing the same
+    bytes as JSONRenderer with DRF's compact, unicode defaults: datetimes and
+    other non-JSON types go through DRF's encoder, and U+2028/U+2029 are
+    escaped. Indented output (e.g. the browsable API) uses JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            data is None
+            or not settings.FAST_SERIALIZATION
+            or not (api_settings.COMPACT_JSON and api_settings.UNICODE_JSON)
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        with measure_serialization():
+            return (
+                orjson.dumps(data, default=_ENCODER.default, option=_OPTIONS)
+                .replace(b"\xe2\x80\xa8", b"\\u2028")
+                .replace(b"\xe2\x80\xa9", b"\\u2029")
+            )
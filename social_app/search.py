@@ -0,0 +1,89 @@
+import re
+from functools import lru_cache
+from typing import List
+
+from django.conf import settings
+from django.db.models import Case, F, IntegerField, Q, QuerySet, Value, When
+from django.utils.module_loading import import_string
+
+from .models import UserProfile
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(term: str) -> List[str]:
+    return TOKEN_RE.findall(term.lower())
+
+
+class BaseUserSearchEngine:
+    """
+    Filters and ranks a UserProfile queryset by the user's name. Every token
+    of the search term is matched as a word prefix, so partially typed names
+    (autocomplete) match too.
+    """
+
+    def search(self, queryset: QuerySet[UserProfile], term: str) -> QuerySet[UserProfile]:
+        raise NotImplementedError
+
+
+class PostgresUserSearchEngine(BaseUserSearchEngine):
+    """
+    Uses the stored `CustomUser.search_vector` (GIN indexed, maintained by a
+    trigger) for prefix matching and the trigram GIN index on `name` for
+    typo tolerant matching, ranking by both.
+    """
+
+    def search(self, queryset: QuerySet[UserProfile], term: str) -> QuerySet[UserProfile]:
+        from django.contrib.postgres.search import (
+            SearchQuery,
+            SearchRank,
+            TrigramWordSimilarity,
+        )
+
+        tokens = tokenize(term)
+        if not tokens:
+            return queryset.none()
+        query = SearchQuery(
+            " & ".join(f"{token}:*" for token in tokens),
+            search_type="raw",
+            config="simple",
+        )
+        return (
+            queryset.filter(
+                Q(user__search_vector=query) | Q(user__name__trigram_word_similar=term)
+            )
+            .annotate(
+                rank=SearchRank(F("user__search_vector"), query)
+                + TrigramWordSimilarity(term, "user__name")
+            )
+            .order_by("-rank", "uuid")
+        )
+
+
+class SimpleUserSearchEngine(BaseUserSearchEngine):
+    """
+    Portable LIKE based fallback for databases without full text search,
+    used by the SQLite test settings.
+    """
+
+    def search(self, queryset: QuerySet[UserProfile], term: str) -> QuerySet[UserProfile]:
+        tokens = tokenize(term)
+        if not tokens:
+            return queryset.none()
+        for token in tokens:
+            queryset = queryset.filter(
+                Q(user__name__istartswith=token) | Q(user__name__icontains=f" {token}")
+            )
+        return queryset.annotate(
+            rank=Case(
+                When(user__name__iexact=term, then=Value(2)),
+                When(user__name__istartswith=term, then=Value(1)),
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+        ).order_by("-rank", "user__name", "uuid")
+
+
+@lru_cache(maxsize=None)
+def get_search_engine() -> BaseUserSearchEngine:
+    return import_string(settings.USER_SEARCH_ENGINE)()
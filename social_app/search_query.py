@@ -0,0 +1,26 @@
+import re
+from typing import Optional
+
+from .utils import is_valid_email
+
+# Kinds of user search terms, each served by its cheapest lookup: an email by
+# the LOWER(email) unique index, a uuid by the profile primary key and
+# anything else by the configured search engine's text index.
+EMPTY = "empty"
+EMAIL = "email"
+UUID = "uuid"
+NAME = "name"
+
+UUID_RE = re.compile(
+    r"[0-9a-f]{8}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{12}", re.IGNORECASE
+)
+
+
+def classify(term: Optional[str]) -> str:
+    if not term:
+        return EMPTY
+    if is_valid_email(term):
+        return EMAIL
+    if UUID_RE.fullmatch(term):
+        return UUID
+    return NAME
@@ -1,10 +1,27 @@
 from rest_framework import serializers
-from .models import CustomUser, UserProfile, FriendRequest
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from .authentication import ProfileRefreshToken
+from .models import CustomUser, FriendSuggestion, UserProfile, FriendRequest
 from django.core.exceptions import ValidationError
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
 from django.contrib.auth.password_validation import validate_password
+from django.conf import settings
+
+
+class ProfileTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Login serializer issuing tokens with the claims CachedJWTAuthentication
+    needs.
+    """
+
+    token_class = ProfileRefreshToken
 
 
 class SignUpSerializer(serializers.ModelSerializer):
+    # Declared so no UniqueValidator query runs; the unique index on email
+    # rejects duplicates when the user is inserted.
+    email = serializers.EmailField(max_length=254)
     password = serializers.CharField(
         write_only=True, required=True, style={"input_type": "password"}
     )
@@ -22,29 +39,55 @@ class SignUpSerializer(serializers.ModelSerializer):
         return value
 
     def validate_email(self, value: str) -> str:
-        value = value.lower()
-        try:
-            CustomUser.objects.get(email=value)
-            raise serializers.ValidationError("User with this email already exisits")
-        except CustomUser.DoesNotExist:
-            return value
+        return value.lower()
 
     def create(self, validated_data) -> CustomUser:
-        user: CustomUser = CustomUser.objects.create_user(
+        # Hash before opening the transaction, hashing is the slow part.
+        user = CustomUser(
             name=validated_data["name"],
             email=validated_data["email"],
-            password=validated_data["password"],
+            password=make_password(validated_data["password"]),
         )
-        UserProfile.objects.create(user=user)
+        try:
+            with transaction.atomic():
+                user.save()
+                UserProfile.objects.create(user=user)
+        except IntegrityError:
+            raise serializers.ValidationError(
+                {"email": ["User with this email already exisits"]}
+            )
         return user
 
 
-class UserSerializer(serializers.ModelSerializer):
+class OptimizedModelSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer whose Meta declares the relations (`select_related`) and
+    columns (`only_fields`) it reads, so list views can load a page of rows
+    in a single query.
+    """
+
+    @classmethod
+    def optimize_queryset(cls, queryset, extra_fields=()):
+        meta = cls.Meta
+        select_related = getattr(meta, "select_related", ())
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        only_fields = getattr(meta, "only_fields", ())
+        if only_fields:
+            concrete = {field.name for field in queryset.model._meta.concrete_fields}
+            extra = [field for field in extra_fields if field in concrete]
+            queryset = queryset.only(*only_fields, *extra)
+        return queryset
+
+
+class UserSerializer(OptimizedModelSerializer):
     name = serializers.CharField(max_length=150, source="user.name")
 
     class Meta:
         model = UserProfile
         fields = ("uuid", "name")
+        select_related = ("user",)
+        only_fields = ("uuid", "user__name")
 
 
 class UserDetailSerializer(serializers.ModelSerializer):
@@ -56,10 +99,39 @@ class UserDetailSerializer(serializers.ModelSerializer):
         fields = ("uuid", "email", "name")
 
 
-class FriendRequestSerializer(serializers.ModelSerializer):
+class FriendRequestSerializer(OptimizedModelSerializer):
     sender = UserSerializer(read_only=True)
     status = serializers.CharField(source="get_status_display")
 
     class Meta:
         model = FriendRequest
         fields = ("uuid", "status", "sender", "created_at")
+        select_related = ("sender__user",)
+        only_fields = ("uuid", "status", "created_at", "sender__uuid", "sender__user__name")
+
+
+class FriendSuggestionSerializer(OptimizedModelSerializer):
+    uuid = serializers.UUIDField(source="suggested.uuid")
+    name = serializers.CharField(source="suggested.user.name")
+
+    class Meta:
+        model = FriendSuggestion
+        fields = ("uuid", "name", "mutual_count")
+        select_related = ("suggested__user",)
+        only_fields = ("mutual_count", "suggested__uuid", "suggested__user__name")
+
+
+class BulkSendRequestSerializer(serializers.Serializer):
+    user_ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        allow_empty=False,
+        max_length=settings.BULK_REQUEST_MAX_ITEMS,
+    )
+
+
+class BulkResolveRequestSerializer(serializers.Serializer):
+    request_ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        allow_empty=False,
+        max_length=settings.BULK_REQUEST_MAX_ITEMS,
+    )
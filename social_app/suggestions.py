@@ -0,0 +1,229 @@
+import heapq
+import uuid
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from itertools import chain
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from .models import BlockDetail, Friendship, FriendRequest, FriendSuggestion, UserProfile
+
+
+class ProfileIds:
+    """
+    Profile uuids in ascending order, packed 16 bytes each into one buffer
+    instead of a list of UUID objects. Node `i` is the `i`th uuid; `node_of`
+    finds a uuid's node by binary search.
+    """
+
+    def __init__(self, packed: bytes) -> None:
+        self.packed = packed
+
+    def __len__(self) -> int:
+        return len(self.packed) // 16
+
+    def __getitem__(self, node: int) -> uuid.UUID:
+        return uuid.UUID(bytes=self._key(node))
+
+    def _key(self, node: int) -> bytes:
+        return self.packed[16 * node : 16 * node + 16]
+
+    def node_of(self, profile_id: uuid.UUID) -> Optional[int]:
+        key = profile_id.bytes
+        node = bisect_left(range(len(self)), key, key=self._key)
+        if node < len(self) and self._key(node) == key:
+            return node
+        return None
+
+
+@dataclass
+class CSRGraph:
+    """
+    Friend graph in compressed sparse row form: the friends of node `i` are
+    `neighbours[offsets[i]:offsets[i + 1]]`, nodes being indexes into `ids`.
+    """
+
+    ids: ProfileIds
+    offsets: array
+    neighbours: array
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def node_of(self, profile_id: uuid.UUID) -> Optional[int]:
+        return self.ids.node_of(profile_id)
+
+    def neighbours_of(self, node: int) -> Sequence[int]:
+        return self.neighbours[self.offsets[node] : self.offsets[node + 1]]
+
+
+def _edge_nodes(ids: ProfileIds, chunk_size: int) -> Iterator[Tuple[int, int]]:
+    """
+    (node, friend node) for every friendship between profiles in `ids`, read
+    in profile order so each profile is looked up once.
+    """
+    edges = Friendship.objects.order_by("profile_id", "friend_id").values_list(
+        "profile_id", "friend_id"
+    )
+    last_id = node = None
+    for profile_id, friend_id in edges.iterator(chunk_size=chunk_size):
+        if profile_id != last_id:
+            last_id, node = profile_id, ids.node_of(profile_id)
+        friend = ids.node_of(friend_id)
+        if node is not None and friend is not None:
+            yield node, friend
+
+
+def load_csr_graph(chunk_size: int = 10000) -> CSRGraph:
+    """
+    Stream the friendship table into a CSR graph. Edges are read twice (once
+    to size each row, once to fill it) so only the packed ids and integer
+    arrays are held in memory, never the edge list itself.
+    """
+    packed = bytearray()
+    # UUIDs sort the same in the database as their bytes do.
+    for profile_id in (
+        UserProfile.objects.order_by("uuid")
+        .values_list("uuid", flat=True)
+        .iterator(chunk_size=chunk_size)
+    ):
+        packed += profile_id.bytes
+    ids = ProfileIds(bytes(packed))
+    del packed
+
+    offsets = array("q", bytes(8 * (len(ids) + 1)))
+    for node, _ in _edge_nodes(ids, chunk_size):
+        offsets[node + 1] += 1
+    for node in range(1, len(offsets)):
+        offsets[node] += offsets[node - 1]
+
+    neighbours = array("q", bytes(8 * offsets[-1]))
+    cursor = array("q", offsets[:-1])
+    for node, friend in _edge_nodes(ids, chunk_size):
+        # Rows added between the two passes are skipped, not overflowed.
+        if cursor[node] < offsets[node + 1]:
+            neighbours[cursor[node]] = friend
+            cursor[node] += 1
+    return CSRGraph(ids=ids, offsets=offsets, neighbours=neighbours)
+
+
+def rank_candidates(
+    node: Hashable,
+    direct: Set,
+    second_hop: Iterable,
+    excluded: Set,
+    top_n: int,
+) -> List[Tuple]:
+    """
+    Rank friends-of-friends by mutual friend count, returning up to `top_n`
+    (candidate, mutual_count) pairs. `second_hop` yields one entry per
+    friend-of-friend path. Ties are broken on the candidate id, which orders
+    the same way for CSR node indexes and profile uuids.
+    """
+    counts = Counter(second_hop)
+    candidates = (
+        (candidate, count)
+        for candidate, count in counts.items()
+        if candidate != node and candidate not in direct and candidate not in excluded
+    )
+    return heapq.nlargest(top_n, candidates, key=lambda item: (item[1], item[0]))
+
+
+def excluded_pairs(profile_ids: Iterable) -> Dict:
+    """
+    Users each profile must not be suggested: anyone blocked in either
+    direction and anyone with an existing friend request either way.
+    """
+    profile_ids = list(profile_ids)
+    blocks = BlockDetail.objects.filter(
+        Q(blocker_id__in=profile_ids) | Q(blocked_id__in=profile_ids)
+    ).values_list("blocker_id", "blocked_id")
+    requests = FriendRequest.objects.filter(
+        Q(sender_id__in=profile_ids) | Q(receiver_id__in=profile_ids)
+    ).values_list("sender_id", "receiver_id")
+    excluded: Dict = defaultdict(set)
+    for first, second in chain(blocks, requests):
+        excluded[first].add(second)
+        excluded[second].add(first)
+    return excluded
+
+
+def store_suggestions(results: Dict) -> None:
+    """
+    Replace the stored suggestions of every profile in `results`, a mapping
+    of profile id to ranked (suggested id, mutual count) pairs.
+    """
+    suggestions = [
+        FriendSuggestion(
+            profile_id=profile_id,
+            suggested_id=suggested_id,
+            mutual_count=mutual_count,
+            rank=rank,
+        )
+        for profile_id, ranked in results.items()
+        for rank, (suggested_id, mutual_count) in enumerate(ranked)
+    ]
+    with transaction.atomic():
+        FriendSuggestion.objects.filter(profile_id__in=list(results)).delete()
+        FriendSuggestion.objects.bulk_create(suggestions, batch_size=1000)
+
+
+def compute_all_suggestions(
+    top_n: int = settings.FRIEND_SUGGESTIONS_LIMIT, chunk_size: int = 1000
+) -> int:
+    """
+    Recompute suggestions for every profile, `chunk_size` profiles at a time.
+    Returns the number of profiles processed.
+    """
+    graph = load_csr_graph()
+    for start in range(0, len(graph), chunk_size):
+        nodes = range(start, min(start + chunk_size, len(graph)))
+        excluded = excluded_pairs(graph.ids[node] for node in nodes)
+        results = {}
+        for node in nodes:
+            profile_id = graph.ids[node]
+            direct = set(graph.neighbours_of(node))
+            second_hop = chain.from_iterable(
+                graph.neighbours_of(friend) for friend in direct
+            )
+            blocked = {
+                other
+                for other in map(graph.node_of, excluded.get(profile_id, ()))
+                if other is not None
+            }
+            ranked = rank_candidates(node, direct, second_hop, blocked, top_n)
+            results[profile_id] = [
+                (graph.ids[candidate], count) for candidate, count in ranked
+            ]
+        store_suggestions(results)
+    return len(graph)
+
+
+def refresh_suggestions(
+    profile_ids: Iterable, top_n: int = settings.FRIEND_SUGGESTIONS_LIMIT
+) -> None:
+    """
+    Recompute suggestions for a few profiles straight from the database,
+    without loading the whole graph.
+    """
+    profile_ids = list(profile_ids)
+    excluded = excluded_pairs(profile_ids)
+    results = {}
+    for profile_id in profile_ids:
+        direct = set(
+            Friendship.objects.filter(profile_id=profile_id).values_list(
+                "friend_id", flat=True
+            )
+        )
+        second_hop = Friendship.objects.filter(profile_id__in=direct).values_list(
+            "friend_id", flat=True
+        )
+        results[profile_id] = rank_candidates(
+            profile_id, direct, second_hop, excluded.get(profile_id, set()), top_n
+        )
+    store_suggestions(results)
@@ -0,0 +1,37 @@
+from typing import Optional
+
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def assert_query_budget(
+    client,
+    url_name: str,
+    budget: int,
+    method: str = "get",
+    url_kwargs: Optional[dict] = None,
+    using: str = "default",
+    **request_kwargs,
+):
+    """
+    Call an endpoint through a test client and fail if it runs more than
+    `budget` SQL queries. Returns the response.
+    """
+    url = reverse(url_name, kwargs=url_kwargs)
+    with CaptureQueriesContext(connections[using]) as context:
+        response = getattr(client, method)(url, **request_kwargs)
+    executed = len(context.captured_queries)
+    if executed > budget:
+        queries = "\n".join(
+            f"{index}. {query['sql']}"
+            for index, query in enumerate(context.captured_queries, start=1)
+        )
+        raise QueryBudgetExceeded(
+            f"{method.upper()} {url_name} ran {executed} queries, budget is {budget}:\n{queries}"
+        )
+    return response
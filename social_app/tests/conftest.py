@@ -0,0 +1,60 @@
+import pytest
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from social_app.blocklist import local_cache
+from social_app.models import UserProfile
+from social_app.ratelimit import get_rate_limiter
+from social_app.testing import assert_query_budget
+
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    local_cache.clear()
+    get_rate_limiter().reset()
+    yield
+    cache.clear()
+    local_cache.clear()
+
+
+@pytest.fixture
+def user_and_profiles():
+    # Create a user and associated user profile
+    user1 = User.objects.create_user(
+        email="user1@example.com", password="password123", name="User One"
+    )
+    profile1 = UserProfile.objects.create(user=user1)
+    user2 = User.objects.create_user(
+        email="user2@example.com", password="password123", name="User Two"
+    )
+    profile2 = UserProfile.objects.create(user=user2)
+    return {"user1": user1, "profile1": profile1, "user2": user2, "profile2": profile2}
+
+
+@pytest.fixture
+def authenticated_client(user_and_profiles):
+    client = APIClient()
+    client.force_authenticate(user=user_and_profiles["user1"])
+    return client
+
+
+@pytest.fixture
+def make_profile(db):
+    def _make_profile(name: str) -> UserProfile:
+        email = f"{name.lower().replace(' ', '.')}@example.com"
+        user = User.objects.create_user(email=email, password="password123", name=name)
+        return UserProfile.objects.create(user=user)
+
+    return _make_profile
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Usage: query_budget(client, "friend-list", 3, data={"page_size": 50})
+    """
+    return assert_query_budget
@@ -0,0 +1,106 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from social_app.archival import archive_resolved_requests
+from social_app.helpers import process_bulk_requests, process_request
+from rest_framework.test import APIClient
+
+from social_app.models import ArchivedFriendRequest, FriendRequest, RequestStatus, UserProfile
+
+
+def resolve(sender, receiver, status, days_ago=60, cooldown_over=True):
+    request = FriendRequest.objects.create(sender=sender, receiver=receiver)
+    if status == RequestStatus.ACCEPTED:
+        request.make_accepted()
+    elif status == RequestStatus.REJECTED:
+        request.make_rejected()
+    cooldown = -1 if cooldown_over else 1
+    FriendRequest.objects.filter(pk=request.pk).update(
+        updated_at=timezone.now() - timedelta(days=days_ago),
+        cooldown_time=(
+            timezone.now() + timedelta(days=cooldown)
+            if status == RequestStatus.REJECTED
+            else None
+        ),
+    )
+    return request
+
+
+@pytest.fixture
+def profiles(make_profile):
+    return [make_profile(f"User {index}") for index in range(6)]
+
+
+@pytest.mark.django_db
+def test_only_settled_old_requests_are_archived(profiles):
+    alice, *others = profiles
+    accepted = resolve(alice, others[0], RequestStatus.ACCEPTED)
+    rejected = resolve(alice, others[1], RequestStatus.REJECTED)
+    resolve(alice, others[2], RequestStatus.REJECTED, cooldown_over=False)
+    resolve(alice, others[3], RequestStatus.ACCEPTED, days_ago=1)
+    resolve(alice, others[4], RequestStatus.PENDING)
+    counts_before = list(UserProfile.objects.order_by("pk").values_list("friend_count"))
+    batches = []
+
+    result = archive_resolved_requests(
+        timezone.now() - timedelta(days=30), batch_size=1, progress=batches.append
+    )
+
+    assert result == {"archived": 2, "batches": 2}
+    assert batches == [{"archived": 1, "batches": 1}, {"archived": 2, "batches": 2}]
+    assert set(ArchivedFriendRequest.objects.values_list("uuid", "status")) == {
+        (accepted.uuid, RequestStatus.ACCEPTED),
+        (rejected.uuid, RequestStatus.REJECTED),
+    }
+    assert FriendRequest.objects.count() == 3
+    assert list(UserProfile.objects.order_by("pk").values_list("friend_count")) == counts_before
+
+
+@pytest.mark.django_db
+def test_sending_again_after_archiving(profiles):
+    alice, bob, carol, dave = profiles[:4]
+    resolve(alice, bob, RequestStatus.ACCEPTED)
+    resolve(alice, carol, RequestStatus.REJECTED)
+    resolve(alice, dave, RequestStatus.ACCEPTED)
+    archive_resolved_requests(timezone.now())
+
+    assert process_request(alice, bob.uuid) == (False, {"message": "Already friends"})
+    processed, response = process_request(alice, carol.uuid)
+    assert processed and response["status"] == "Pending"
+    assert FriendRequest.objects.get().receiver == carol
+
+    results = process_bulk_requests(alice, [dave.uuid])
+    assert results == [
+        {"user_id": str(dave.uuid), "processed": False, "message": "Already friends"}
+    ]
+    assert FriendRequest.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_send_request_view_sees_archived_friendship(profiles):
+    alice, bob = profiles[:2]
+    resolve(alice, bob, RequestStatus.ACCEPTED)
+    archive_resolved_requests(timezone.now())
+    client = APIClient()
+    client.force_authenticate(user=alice.user)
+
+    response = client.post(reverse("send-requests", kwargs={"user_id": str(bob.uuid)}))
+
+    assert response.status_code == 400
+    assert response.json() == {"message": "Already friends"}
+    assert not FriendRequest.objects.exists()
+
+
+@pytest.mark.django_db
+def test_archive_requests_command(profiles, capsys):
+    resolve(profiles[0], profiles[1], RequestStatus.ACCEPTED)
+    call_command("archive_requests", dry_run=True)
+    assert "1 requests to archive." in capsys.readouterr().out
+
+    call_command("archive_requests")
+    assert "Archived 1 requests in 1 batches." in capsys.readouterr().out
+    assert ArchivedFriendRequest.objects.count() == 1
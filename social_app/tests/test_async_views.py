@@ -0,0 +1,109 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from social_app.caching import FRIENDS_LIST, get_cache_stats
+from social_app.instrumentation import registry
+from social_app.models import BlockDetail, FriendRequest
+
+
+@pytest.fixture
+def token(user_and_profiles):
+    return str(AccessToken.for_user(user_and_profiles["user1"]))
+
+
+@pytest.fixture
+def jwt_client(token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client
+
+
+@pytest.fixture
+def social_graph(user_and_profiles, make_profile):
+    me = user_and_profiles["profile1"]
+    for index in range(3):
+        friend = make_profile(f"Friend {index}")
+        FriendRequest.objects.create(sender=friend, receiver=me).make_accepted()
+    for index in range(3):
+        FriendRequest.objects.create(sender=make_profile(f"Sender {index}"), receiver=me)
+    blocker = make_profile("Friend Blocker")
+    BlockDetail.objects.create(blocker=blocker, blocked=me)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "sync_name, async_name, params",
+    [
+        ("users", "async-users", {}),
+        ("users", "async-users", {"search": "friend"}),
+        ("users", "async-users", {"search": "user2@example.com"}),
+        ("users", "async-users", {"search": "friend", "pagination": "cursor", "page_size": 2}),
+        ("friend-list", "async-friend-list", {"page_size": 2, "page": 2}),
+        ("friend-list", "async-friend-list", {"pagination": "cursor", "page_size": 2}),
+        ("pending-requests", "async-pending-requests", {}),
+    ],
+)
+def test_async_views_match_sync_views(jwt_client, social_graph, sync_name, async_name, params):
+    sync_response = jwt_client.get(reverse(sync_name), params)
+    async_response = jwt_client.get(reverse(async_name), params)
+    assert sync_response.status_code == async_response.status_code == 200
+    assert async_response["Content-Type"] == "application/json"
+    expected = sync_response.content.replace(
+        reverse(sync_name).encode(), reverse(async_name).encode()
+    )
+    assert async_response.content == expected
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "params", [{"page": 9}, {"cursor": "not-a-cursor"}, {"search": "nobody@example.com"}]
+)
+def test_async_errors_match_sync_errors(jwt_client, social_graph, params):
+    sync_response = jwt_client.get(reverse("users"), params)
+    async_response = jwt_client.get(reverse("async-users"), params)
+    assert sync_response.status_code == async_response.status_code == 404
+    assert async_response.json() == sync_response.json()
+
+
+@pytest.mark.django_db
+def test_async_views_require_a_valid_token(user_and_profiles):
+    client = APIClient()
+    response = client.get(reverse("async-friend-list"))
+    assert response.status_code == 401
+    assert response.json() == client.get(reverse("friend-list")).json()
+    assert response["WWW-Authenticate"] == 'Bearer realm="api"'
+
+    client.credentials(HTTP_AUTHORIZATION="Bearer invalid")
+    assert client.get(reverse("async-friend-list")).status_code == 401
+
+
+@pytest.mark.django_db
+def test_async_list_cache_is_invalidated_with_the_sync_one(
+    jwt_client, social_graph, user_and_profiles, django_capture_on_commit_callbacks
+):
+    url = reverse("async-friend-list")
+    assert jwt_client.get(url).json()["count"] == 3
+    assert jwt_client.get(url).json()["count"] == 3
+    assert get_cache_stats(FRIENDS_LIST) == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+    with django_capture_on_commit_callbacks(execute=True):
+        FriendRequest.objects.create(
+            sender=user_and_profiles["profile2"], receiver=user_and_profiles["profile1"]
+        ).make_accepted()
+    assert jwt_client.get(url).json()["count"] == 4
+
+
+@pytest.mark.django_db
+def test_async_request_metrics(settings, token, social_graph):
+    settings.REQUEST_METRICS_ENABLED = True
+    registry.reset()
+    response = async_to_sync(AsyncClient().get)(
+        reverse("async-pending-requests"), headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 200, response.content
+    body = APIClient().get(reverse("metrics")).content.decode()
+    registry.reset()
+    assert 'social_app_request_queries_count{url_name="async-pending-requests"} 1' in body
+    assert 'social_app_request_queries_sum{url_name="async-pending-requests"} 0' not in body
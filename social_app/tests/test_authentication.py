@@ -0,0 +1,103 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from social_app.authentication import CachedJWTAuthentication, ProfileRefreshToken
+
+
+def bearer_client(token) -> APIClient:
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client
+
+
+@pytest.fixture
+def access_token(user_and_profiles):
+    return ProfileRefreshToken.for_user(user_and_profiles["user1"]).access_token
+
+
+@pytest.mark.django_db
+def test_login_issues_profile_claims(user_and_profiles):
+    response = APIClient().post(
+        reverse("token_obtain_pair"),
+        {"email": "user1@example.com", "password": "password123"},
+    )
+    assert response.status_code == 200
+    token = AccessToken(response.data["access"])
+    assert token["profile_uuid"] == str(user_and_profiles["profile1"].uuid)
+    assert token["is_active"] is True
+
+
+@pytest.mark.django_db
+def test_cached_auth_state_skips_user_queries(access_token):
+    client = bearer_client(access_token)
+    url = reverse("friend-list")
+    with CaptureQueriesContext(connection) as first:
+        assert client.get(url).status_code == 200
+    with CaptureQueriesContext(connection) as second:
+        assert client.get(url).status_code == 200
+    # The first request loads the auth state and the page; the second is
+    # served from both caches.
+    assert any("social_app_customuser" in query["sql"] for query in first.captured_queries)
+    assert len(second) == 0
+
+
+@pytest.mark.django_db
+def test_lightweight_user_loads_deferred_fields(access_token, user_and_profiles):
+    user = CachedJWTAuthentication().get_user(access_token)
+    assert user.pk == user_and_profiles["user1"].pk
+    assert user.user_profile.uuid == user_and_profiles["profile1"].uuid
+    assert user.user_profile.user is user
+    with CaptureQueriesContext(connection) as queries:
+        assert user.name == "User One"
+    assert len(queries) == 1
+
+
+@pytest.mark.django_db
+def test_deactivation_applies_immediately(access_token, user_and_profiles):
+    client = bearer_client(access_token)
+    assert client.get(reverse("friend-list")).status_code == 200
+    user = user_and_profiles["user1"]
+    user.is_active = False
+    user.save()
+    response = client.get(reverse("friend-list"))
+    assert response.status_code == 401
+    assert response.data["detail"].code == "user_inactive"
+
+
+@pytest.mark.django_db
+def test_password_change_revokes_tokens(monkeypatch, user_and_profiles):
+    monkeypatch.setattr(api_settings, "CHECK_REVOKE_TOKEN", True)
+    user = user_and_profiles["user1"]
+    client = bearer_client(ProfileRefreshToken.for_user(user).access_token)
+    assert client.get(reverse("friend-list")).status_code == 200
+    user.set_password("a-new-password")
+    user.save()
+    response = client.get(reverse("friend-list"))
+    assert response.status_code == 401
+    assert response.data["detail"].code == "password_changed"
+
+
+@pytest.mark.django_db
+def test_tokens_without_profile_claim_fall_back_to_the_database(user_and_profiles):
+    client = bearer_client(RefreshToken.for_user(user_and_profiles["user1"]).access_token)
+    assert client.get(reverse("friend-list")).status_code == 200
+
+
+@pytest.mark.django_db
+def test_token_for_another_profile_is_rejected(access_token, make_profile):
+    access_token["profile_uuid"] = str(make_profile("Someone Else").uuid)
+    assert bearer_client(access_token).get(reverse("friend-list")).status_code == 401
+
+
+@pytest.mark.django_db
+def test_async_views_use_the_cached_auth_state(access_token):
+    client = bearer_client(access_token)
+    url = reverse("async-friend-list")
+    assert client.get(url).status_code == 200
+    with CaptureQueriesContext(connection) as queries:
+        assert client.get(url).status_code == 200
+    assert len(queries) == 0
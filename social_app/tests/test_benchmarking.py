@@ -0,0 +1,56 @@
+import json
+import random
+
+import pytest
+from django.core.management import call_command
+
+from social_app.benchmarking import generate_social_graph, power_law_degrees
+from social_app.counters import reconcile_counters
+from social_app.models import BlockDetail, Friendship, FriendRequest, RequestStatus, UserProfile
+
+
+def test_power_law_degrees_mean_and_cap():
+    degrees = power_law_degrees(20000, 20, 2.5, random.Random(1))
+    assert 15 < sum(degrees) / len(degrees) < 25
+    assert max(degrees) <= 19999
+    assert max(degrees) > 100
+
+
+@pytest.mark.django_db
+def test_generate_social_graph_writes_consistent_friendships():
+    counts = generate_social_graph(
+        50, mean_friends=4, pending_per_user=1, rejected_per_user=1, blocks_per_user=0.5
+    )
+
+    assert UserProfile.objects.count() == counts["users"] == 50
+    assert Friendship.objects.exists()
+    for edge in Friendship.objects.all():
+        assert Friendship.objects.filter(profile=edge.friend, friend=edge.profile).exists()
+    accepted = FriendRequest.objects.filter(status=RequestStatus.ACCEPTED)
+    assert Friendship.objects.count() == 2 * accepted.count()
+    assert FriendRequest.objects.filter(status=RequestStatus.PENDING).exists()
+    assert FriendRequest.objects.filter(status=RequestStatus.REJECTED).exists()
+    assert BlockDetail.objects.exists()
+    assert reconcile_counters(dry_run=True) == {"checked": 50, "fixed": 0}
+
+
+@pytest.mark.django_db
+def test_benchmark_endpoints_leaves_dataset_unchanged(tmp_path):
+    generate_social_graph(30, mean_friends=3)
+    requests_before = FriendRequest.objects.count()
+    output = tmp_path / "results.json"
+
+    call_command(
+        "benchmark_endpoints", iterations=3, warmup=1, actors=3, output=str(output)
+    )
+
+    results = json.loads(output.read_text())
+    assert set(results["endpoints"]) >= {"users", "friend-list", "send-requests"}
+    for name, result in results["endpoints"].items():
+        assert result["count"] == 3
+        assert not any(code.startswith("5") for code in result["status_codes"]), name
+    assert results["endpoints"]["friend-list"]["status_codes"] == {"200": 3}
+    assert results["endpoints"]["accept-request"]["status_codes"] == {"200": 3}
+    assert results["endpoints"]["sign-up"]["status_codes"] == {"201": 3}
+    assert FriendRequest.objects.count() == requests_before
+    assert UserProfile.objects.count() == 30
@@ -0,0 +1,52 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from social_app.blocklist import LocalLRUCache, get_blocker_ids
+
+
+def test_local_lru_evicts_and_expires():
+    lru = LocalLRUCache(maxsize=2, ttl=60)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    lru.get("a")
+    lru.set("c", 3)
+    assert lru.get("b") is None
+    assert lru.get("a") == 1
+    expired = LocalLRUCache(maxsize=2, ttl=-1)
+    expired.set("a", 1)
+    assert expired.get("a") is None
+
+
+@pytest.mark.django_db
+def test_block_and_unblock_update_cached_set(authenticated_client, user_and_profiles):
+    profile1, profile2 = user_and_profiles["profile1"], user_and_profiles["profile2"]
+    assert get_blocker_ids(profile2.uuid) == frozenset()
+    url = reverse("block-unblock", kwargs={"user_id": profile2.uuid})
+    authenticated_client.post(url)
+    assert get_blocker_ids(profile2.uuid) == {profile1.uuid}
+    authenticated_client.delete(url)
+    assert get_blocker_ids(profile2.uuid) == frozenset()
+
+
+@pytest.mark.django_db
+def test_blocked_user_checks_use_cache(
+    user_and_profiles, django_assert_num_queries
+):
+    profile1, profile2 = user_and_profiles["profile1"], user_and_profiles["profile2"]
+    client = APIClient()
+    client.force_authenticate(user=user_and_profiles["user1"])
+    client.post(reverse("block-unblock", kwargs={"user_id": profile2.uuid}))
+
+    blocked_client = APIClient()
+    blocked_client.force_authenticate(user=user_and_profiles["user2"])
+    send_url = reverse("send-requests", kwargs={"user_id": profile1.uuid})
+    response = blocked_client.post(send_url)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    # Warm cache: the permission check needs no query at all.
+    with django_assert_num_queries(0):
+        response = blocked_client.post(send_url)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    response = blocked_client.get(reverse("users"), {"search": "User"})
+    assert response.data["results"] == []
@@ -0,0 +1,120 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from social_app import graph
+from social_app.models import BlockDetail, FriendRequest, RequestStatus
+
+
+@pytest.fixture
+def sender(make_profile):
+    return make_profile("Sender")
+
+
+@pytest.fixture
+def sender_client(sender):
+    client = APIClient()
+    client.force_authenticate(user=sender.user)
+    return client
+
+
+@pytest.mark.django_db
+def test_bulk_send_reports_per_item_results(sender, sender_client, make_profile, settings):
+    settings.RATE_LIMITS = {"send-requests": "10/min"}
+    fresh, friend, blocker, cooled, cooling = (
+        make_profile(name) for name in ("Fresh", "Friend", "Blocker", "Cooled", "Cooling")
+    )
+    FriendRequest.objects.create(sender=sender, receiver=friend, status=RequestStatus.ACCEPTED)
+    BlockDetail.objects.create(blocker=blocker, blocked=sender)
+    FriendRequest.objects.create(
+        sender=sender,
+        receiver=cooled,
+        status=RequestStatus.REJECTED,
+        cooldown_time=timezone.now() - timedelta(seconds=1),
+    )
+    FriendRequest.objects.create(
+        sender=sender,
+        receiver=cooling,
+        status=RequestStatus.REJECTED,
+        cooldown_time=timezone.now() + timedelta(hours=1),
+    )
+    user_ids = [str(profile.uuid) for profile in (fresh, friend, blocker, cooled, cooling)]
+    response = sender_client.post(
+        reverse("bulk-send-requests"), {"user_ids": user_ids}, format="json"
+    )
+    assert response.status_code == status.HTTP_200_OK
+    results = response.data["results"]
+    assert [result["processed"] for result in results] == [True, False, False, True, False]
+    assert results[0]["request"]["status"] == "Pending"
+    assert results[1]["message"] == "Already friends"
+    assert results[2]["message"] == "Blocked by user"
+    assert results[4]["message"] == "Cool down time is not over"
+    assert FriendRequest.objects.get(sender=sender, receiver=cooled).status == RequestStatus.PENDING
+
+
+@pytest.mark.django_db
+def test_bulk_send_applies_rate_limit_per_item(sender_client, make_profile, settings):
+    settings.RATE_LIMITS = {"send-requests": "2/min"}
+    user_ids = [str(make_profile(f"Receiver {index}").uuid) for index in range(3)]
+    response = sender_client.post(
+        reverse("bulk-send-requests"), {"user_ids": user_ids}, format="json"
+    )
+    assert [result["processed"] for result in response.data["results"]] == [True, True, False]
+    assert FriendRequest.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_bulk_accept_and_reject(make_profile):
+    receiver = make_profile("Receiver")
+    senders = [make_profile(f"Sender {index}") for index in range(4)]
+    requests = [
+        FriendRequest.objects.create(sender=sender, receiver=receiver) for sender in senders
+    ]
+    client = APIClient()
+    client.force_authenticate(user=receiver.user)
+    accepted_ids = [str(request.uuid) for request in requests[:3]]
+    with CaptureQueriesContext(connection) as accept_queries:
+        response = client.put(
+            reverse("bulk-accept-requests"), {"request_ids": accepted_ids}, format="json"
+        )
+    assert all(result["processed"] for result in response.data["results"])
+    assert graph.friend_count(receiver.uuid) == 3
+    assert receiver.following.count() == 3
+    m2m_inserts = [
+        query for query in accept_queries.captured_queries
+        if query["sql"].startswith("INSERT")
+        and '"social_app_userprofile_friends"' in query["sql"]
+    ]
+    assert len(m2m_inserts) == 1
+
+    response = client.put(
+        reverse("bulk-reject-requests"),
+        {"request_ids": [str(requests[0].uuid), str(requests[3].uuid)]},
+        format="json",
+    )
+    results = response.data["results"]
+    assert results[0] == {
+        "request_id": str(requests[0].uuid),
+        "processed": False,
+        "message": "Request can't be Rejected",
+    }
+    assert results[1]["processed"]
+    requests[3].refresh_from_db()
+    assert requests[3].status == RequestStatus.REJECTED
+    assert requests[3].cooldown_time is not None
+
+
+@pytest.mark.django_db
+def test_bulk_accept_only_own_requests(sender, sender_client, make_profile):
+    request = FriendRequest.objects.create(sender=sender, receiver=make_profile("Other"))
+    response = sender_client.put(
+        reverse("bulk-accept-requests"), {"request_ids": [str(request.uuid)]}, format="json"
+    )
+    assert response.data["results"][0]["message"] == "Not found"
+    request.refresh_from_db()
+    assert request.status == RequestStatus.PENDING
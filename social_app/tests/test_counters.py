@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from social_app.authentication import ProfileRefreshToken
+from social_app.counters import COUNTER_FIELDS, reconcile_counters
+from social_app.graph import add_friendships
+from social_app.helpers import process_bulk_requests, process_request
+from social_app.models import FriendRequest, UserProfile
+
+
+def counters(profile):
+    return UserProfile.objects.values_list(*COUNTER_FIELDS).get(pk=profile.pk)
+
+
+@pytest.fixture
+def alice_bob(make_profile):
+    return make_profile("Alice"), make_profile("Bob")
+
+
+@pytest.mark.django_db
+def test_request_lifecycle_updates_counters(alice_bob):
+    alice, bob = alice_bob
+    process_request(alice, bob.uuid)
+    # (friends, pending received, pending sent)
+    assert counters(alice) == (0, 0, 1)
+    assert counters(bob) == (0, 1, 0)
+
+    request = FriendRequest.objects.get()
+    request.make_rejected()
+    assert counters(alice) == counters(bob) == (0, 0, 0)
+
+    request.cooldown_time = timezone.now() - timedelta(seconds=1)
+    request.save()
+    process_request(alice, bob.uuid)
+    assert counters(bob) == (0, 1, 0)
+
+    FriendRequest.objects.get().make_accepted()
+    assert counters(alice) == counters(bob) == (1, 0, 0)
+
+
+@pytest.mark.django_db
+def test_friendships_are_counted_once(alice_bob):
+    alice, bob = alice_bob
+    FriendRequest.objects.create(sender=alice, receiver=bob).make_accepted()
+    FriendRequest.objects.create(sender=bob, receiver=alice).make_accepted()
+    add_friendships([(alice.uuid, bob.uuid), (bob.uuid, alice.uuid)])
+    assert counters(alice) == counters(bob) == (1, 0, 0)
+
+
+@pytest.mark.django_db
+def test_bulk_send_counts_new_requests(alice_bob, make_profile):
+    alice, bob = alice_bob
+    carol = make_profile("Carol")
+    process_bulk_requests(alice, [bob.uuid, carol.uuid])
+    assert counters(alice) == (0, 0, 2)
+    assert counters(carol) == (0, 1, 0)
+
+
+@pytest.mark.django_db
+def test_reconcile_repairs_drift(alice_bob):
+    alice, bob = alice_bob
+    FriendRequest.objects.create(sender=alice, receiver=bob).make_accepted()
+    FriendRequest.objects.create(sender=bob, receiver=alice)
+    UserProfile.objects.filter(pk=alice.pk).update(friend_count=7, pending_received_count=0)
+
+    assert reconcile_counters(dry_run=True) == {"checked": 2, "fixed": 1}
+    assert counters(alice) == (7, 0, 0)
+    call_command("reconcile_counters", batch_size=1)
+    assert counters(alice) == (1, 1, 0)
+    assert counters(bob) == (1, 0, 1)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url_name", ["friend-list", "async-friend-list"])
+def test_friend_list_count_comes_from_the_counter(alice_bob, url_name):
+    alice, bob = alice_bob
+    FriendRequest.objects.create(sender=alice, receiver=bob).make_accepted()
+    client = APIClient()
+    token = ProfileRefreshToken.for_user(alice.user).access_token
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(reverse(url_name))
+    assert response.json()["count"] == 1
+    assert not any("COUNT(" in query["sql"] for query in queries.captured_queries)
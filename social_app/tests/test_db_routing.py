@@ -0,0 +1,53 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient
+from social_app.authentication import ProfileRefreshToken
+from social_app.db_routing import ReplicaRouter
+from social_app.models import FriendRequest, UserProfile
+
+# Reads inside a transaction always use the primary, so these tests commit.
+pytestmark = pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+
+
+@pytest.fixture
+def replica(settings):
+    settings.DATABASE_REPLICAS = ["replica"]
+
+
+def copy_to_replica(*profiles):
+    for profile in profiles:
+        profile.user.save(using="replica")
+        profile.save(using="replica")
+
+
+@pytest.mark.parametrize("url_name", ["friend-list", "async-friend-list"])
+def test_reads_go_to_the_replica_until_the_user_writes(replica, make_profile, url_name):
+    alice, bob, carol = (make_profile(name) for name in ("Alice", "Bob", "Carol"))
+    copy_to_replica(alice, bob, carol)
+    FriendRequest.objects.create(sender=bob, receiver=alice).make_accepted()
+    cache.clear()  # The accept's pin on Alice has expired; the replica lags.
+
+    client = APIClient()
+    token = ProfileRefreshToken.for_user(alice.user).access_token
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    assert client.get(reverse(url_name)).json() == {
+        "count": 0,
+        "next": None,
+        "previous": None,
+        "results": [],
+    }
+
+    assert client.post(reverse("block-unblock", args=[carol.uuid])).status_code == 200
+    response = client.get(reverse(url_name)).json()
+    assert response["count"] == 1
+    assert response["results"][0]["uuid"] == str(bob.uuid)
+
+
+def test_rows_read_from_a_replica_are_written_to_the_primary(replica, make_profile):
+    profile = make_profile("Alice")
+    copy_to_replica(profile)
+    replica_copy = UserProfile.objects.using("replica").get(pk=profile.pk)
+    router = ReplicaRouter()
+    assert router.db_for_write(UserProfile, instance=replica_copy) == "default"
+    assert router.allow_relation(replica_copy, profile)
@@ -0,0 +1,39 @@
+import pytest
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from social_app.models import CustomUser
+
+
+@pytest.fixture
+def mixed_case_user(make_profile):
+    profile = make_profile("Mixed Case")
+    CustomUser.objects.filter(pk=profile.user_id).update(email="Mixed.Case@Example.com")
+    return profile
+
+
+@pytest.mark.django_db
+def test_by_email_filters_on_the_lowercased_index(mixed_case_user):
+    with CaptureQueriesContext(connection) as queries:
+        user = CustomUser.objects.by_email("MIXED.case@example.COM").get()
+    assert user.pk == mixed_case_user.user_id
+    assert 'LOWER("social_app_customuser"."email")' in queries[0]["sql"]
+    assert "UPPER" not in queries[0]["sql"]
+
+
+@pytest.mark.django_db
+def test_emails_are_unique_in_any_case(mixed_case_user):
+    with pytest.raises(IntegrityError):
+        CustomUser.objects.create_user(email="mixed.case@example.com", password="x", name="Copy")
+
+
+@pytest.mark.django_db
+def test_login_and_search_ignore_email_case(mixed_case_user, authenticated_client):
+    response = APIClient().post(
+        reverse("token_obtain_pair"),
+        {"email": "mixed.case@EXAMPLE.com", "password": "password123"},
+    )
+    assert response.status_code == 200
+    response = authenticated_client.get(reverse("users"), {"search": "MIXED.CASE@example.com"})
+    assert response.data["uuid"] == str(mixed_case_user.uuid)
@@ -0,0 +1,44 @@
+import json
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+
+from social_app.benchmarking import generate_social_graph
+
+# Name search falls back to LIKE on SQLite, which has no trigram index.
+INDEXED_SCENARIOS = [
+    "users",
+    "users-search-email",
+    "friend-list",
+    "pending-requests",
+    "send-requests",
+    "accept-request",
+    "bulk-accept-requests",
+    "block-unblock",
+]
+
+
+@pytest.mark.django_db
+def test_hot_queries_use_indexes(tmp_path):
+    generate_social_graph(30, mean_friends=3, pending_per_user=2, blocks_per_user=0.5)
+    output = tmp_path / "plans.json"
+
+    call_command(
+        "explain_queries", scenarios=INDEXED_SCENARIOS, fail_on_seq_scan=True, output=str(output)
+    )
+
+    plans = json.loads(output.read_text())
+    listing_plans = [line for query in plans["users"] for line in query["plan"]]
+    assert any("userprofile_keyset_idx" in line for line in listing_plans)
+
+
+@pytest.mark.django_db
+def test_missing_index_is_flagged():
+    generate_social_graph(30, mean_friends=3)
+    with connection.cursor() as cursor:
+        cursor.execute("DROP INDEX userprofile_keyset_idx")
+
+    with pytest.raises(CommandError, match="sequential scans"):
+        call_command("explain_queries", scenarios=["users"], fail_on_seq_scan=True)
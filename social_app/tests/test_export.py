@@ -0,0 +1,131 @@
+import csv
+import gzip
+import io
+import json
+import warnings
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from social_app.archival import archive_resolved_requests
+from social_app.benchmarking import generate_social_graph
+from social_app.export import dump_graph
+from social_app.models import BlockDetail, FriendRequest
+
+
+def lines(response) -> list:
+    return b"".join(response.streaming_content).decode().splitlines()
+
+
+@pytest.fixture
+def graph(user_and_profiles, make_profile):
+    me, bob = user_and_profiles["profile1"], user_and_profiles["profile2"]
+    carol, dave = make_profile("Carol"), make_profile("Dave")
+    FriendRequest.objects.create(sender=me, receiver=bob).make_accepted()
+    archive_resolved_requests(timezone.now())
+    FriendRequest.objects.create(sender=carol, receiver=me)
+    BlockDetail.objects.create(blocker=me, blocked=dave)
+    BlockDetail.objects.create(blocker=carol, blocked=bob)
+    return {"me": me, "bob": bob, "carol": carol, "dave": dave}
+
+
+@pytest.mark.django_db
+def test_export_streams_own_graph(authenticated_client, graph):
+    response = authenticated_client.get(reverse("export"))
+
+    assert response.status_code == 200
+    assert response.streaming
+    assert response["Content-Type"] == "application/x-ndjson"
+    records = [json.loads(line) for line in lines(response)]
+    me, bob, carol, dave = (str(graph[name].uuid) for name in ("me", "bob", "carol", "dave"))
+    assert sorted((r["type"], r["source"], r["target"]) for r in records) == [
+        ("archived_request", me, bob),
+        ("block", me, dave),
+        ("friend", me, bob),
+        ("request", carol, me),
+    ]
+    request = next(record for record in records if record["type"] == "request")
+    assert request["status"] == "P" and request["cooldown_time"] is None
+
+
+@pytest.mark.django_db
+def test_export_csv_gzip(authenticated_client, graph):
+    response = authenticated_client.get(
+        reverse("export"), {"output": "csv"}, HTTP_ACCEPT_ENCODING="gzip, br"
+    )
+
+    assert response["Content-Encoding"] == "gzip"
+    body = gzip.decompress(b"".join(response.streaming_content)).decode()
+    rows = list(csv.DictReader(io.StringIO(body)))
+    assert len(rows) == 4
+    assert {row["type"] for row in rows} == {"friend", "archived_request", "request", "block"}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("compress", [False, True])
+def test_export_streams_asynchronously_under_asgi(user_and_profiles, graph, compress):
+    token = AccessToken.for_user(user_and_profiles["user1"])
+    headers = {"Authorization": f"Bearer {token}"}
+    if compress:
+        headers["Accept-Encoding"] = "gzip"
+
+    async def fetch():
+        response = await AsyncClient().get(reverse("export"), headers=headers)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            return response, b"".join([chunk async for chunk in response])
+
+    response, body = async_to_sync(fetch)()
+
+    assert response.status_code == 200
+    assert response.is_async
+    if compress:
+        body = gzip.decompress(body)
+    records = [json.loads(line) for line in body.decode().splitlines()]
+    assert sorted(record["type"] for record in records) == [
+        "archived_request",
+        "block",
+        "friend",
+        "request",
+    ]
+
+
+@pytest.mark.django_db
+def test_export_rejects_unknown_output(authenticated_client):
+    response = authenticated_client.get(reverse("export"), {"output": "xml"})
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("compress", [False, True])
+def test_graph_dump_resumes_from_checkpoint(tmp_path, compress):
+    generate_social_graph(40, mean_friends=3, pending_per_user=1, blocks_per_user=0.5)
+    read = gzip.decompress if compress else (lambda data: data)
+    complete = tmp_path / "complete.csv"
+    dump_graph(str(complete), "csv", compress=compress, checkpoint_every=7)
+
+    class Interrupted(Exception):
+        pass
+
+    def interrupt(state):
+        if state["records"] >= 50:
+            raise Interrupted
+
+    resumed = tmp_path / "resumed.csv"
+    checkpoint = str(tmp_path / "checkpoint.json")
+    with pytest.raises(Interrupted):
+        dump_graph(
+            str(resumed), "csv", checkpoint, compress, checkpoint_every=7, progress=interrupt
+        )
+    # Records written after the last checkpoint are dropped on resume.
+    with open(resumed, "ab") as output:
+        output.write(b"partial")
+    state = dump_graph(str(resumed), "csv", checkpoint, compress, checkpoint_every=7)
+
+    assert state["section"] is None
+    assert read(resumed.read_bytes()) == read(complete.read_bytes())
+    assert state["records"] == len(read(complete.read_bytes()).splitlines()) - 1
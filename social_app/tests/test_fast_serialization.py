@@ -0,0 +1,113 @@
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from django.core.cache import cache
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from social_app.authentication import ProfileRefreshToken
+from social_app.fast_serialization import compile_row_mapper
+from social_app.models import FriendRequest, FriendSuggestion
+from social_app.renderers import FastJSONRenderer
+from social_app.serializers import FriendRequestSerializer, FriendSuggestionSerializer
+
+# Names exercising JSON escaping: quotes, backslashes, control characters,
+# non-ASCII and the line separators JSONRenderer escapes.
+NAMES = [
+    'Zoë "Quoted" Smith',
+    "Back\\slash / Slash",
+    "Tab\tand\nnewline\x01",
+    "Line\u2028Para\u2029Sep",
+    "Emoji 😀 Ünïcode 名前",
+    "Plain Name",
+]
+ENDPOINTS = [
+    ("users", {}),
+    ("users", {"search": "s"}),
+    ("friend-list", {}),
+    ("pending-requests", {}),
+    ("friend-suggestions", {}),
+    ("async-users", {}),
+    ("async-friend-list", {}),
+    ("async-pending-requests", {}),
+]
+PAGINATIONS = [{}, {"page": 2, "page_size": 1}, {"pagination": "cursor", "page_size": 1}]
+
+
+@pytest.fixture
+def client_with_graph(make_profile):
+    me = make_profile("Me Myself")
+    others = [make_profile(name) for name in NAMES]
+    for other in others[:3]:
+        FriendRequest.objects.create(sender=me, receiver=other).make_accepted()
+    for other in others[3:]:
+        FriendRequest.objects.create(sender=other, receiver=me)
+    FriendSuggestion.objects.bulk_create(
+        FriendSuggestion(profile=me, suggested=other, mutual_count=index, rank=index)
+        for index, other in enumerate(others)
+    )
+    client = APIClient()
+    token = ProfileRefreshToken.for_user(me.user).access_token
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client
+
+
+def get_pages(client, url_name, params) -> list:
+    """
+    Bodies of the first page and, with keyset pagination, the next one.
+    """
+    cache.clear()
+    response = client.get(reverse(url_name), params)
+    assert response.status_code == 200
+    bodies = [response.content]
+    next_link = response.json().get("next")
+    if next_link and "cursor=" in next_link:
+        cache.clear()
+        bodies.append(client.get(next_link).content)
+    return bodies
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("pagination", PAGINATIONS)
+@pytest.mark.parametrize("url_name, params", ENDPOINTS)
+def test_fast_path_is_byte_identical(client_with_graph, url_name, params, pagination):
+    fast = get_pages(client_with_graph, url_name, {**params, **pagination})
+    with override_settings(FAST_SERIALIZATION=False):
+        regular = get_pages(client_with_graph, url_name, {**params, **pagination})
+    assert fast == regular
+    assert b"results" in fast[0]
+
+
+def test_row_mapper_columns():
+    assert compile_row_mapper(FriendRequestSerializer).columns == (
+        "uuid",
+        "status",
+        "sender__uuid",
+        "sender__user__name",
+        "created_at",
+    )
+    assert compile_row_mapper(FriendSuggestionSerializer).columns == (
+        "suggested__uuid",
+        "suggested__user__name",
+        "mutual_count",
+    )
+
+
+def test_renderer_matches_json_renderer():
+    data = {
+        "text": "\u2028\u2029 \"x\" \\ 😀 \x00",
+        "when": datetime(2024, 5, 1, 12, 30, 45, 123456, tzinfo=timezone.utc),
+        "whole": datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc),
+        "id": uuid.UUID("01a14cc9-ad65-7307-8f88-36a2814ce4b8"),
+        "amount": Decimal("1.50"),
+        "nested": [{"a": None, "b": True, 1: 2.5}],
+    }
+    assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+    context = {"indent": 4}
+    assert FastJSONRenderer().render(data, renderer_context=context) == (
+        JSONRenderer().render(data, renderer_context=context)
+    )
@@ -0,0 +1,47 @@
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+from social_app import graph
+from social_app.models import Friendship, FriendRequest
+
+
+@pytest.mark.django_db
+def test_accept_adds_symmetric_friendship(user_and_profiles):
+    sender, receiver = user_and_profiles["profile1"], user_and_profiles["profile2"]
+    FriendRequest.objects.create(sender=sender, receiver=receiver).make_accepted()
+    assert graph.are_friends(sender.uuid, receiver.uuid)
+    assert graph.are_friends(receiver.uuid, sender.uuid)
+    assert graph.friend_count(receiver.uuid) == 1
+    assert graph.friend_ids(receiver.uuid) == {sender.uuid}
+
+
+@pytest.mark.django_db
+def test_receiver_sees_sender_in_friend_list(user_and_profiles):
+    sender, receiver = user_and_profiles["profile1"], user_and_profiles["profile2"]
+    FriendRequest.objects.create(sender=sender, receiver=receiver).make_accepted()
+    client = APIClient()
+    client.force_authenticate(user=user_and_profiles["user2"])
+    response = client.get(reverse("friend-list"))
+    assert [friend["uuid"] for friend in response.data["results"]] == [str(sender.uuid)]
+
+
+@pytest.mark.django_db
+def test_mutual_friends(make_profile):
+    alice, bob, carol, dave = (make_profile(name) for name in ("Alice", "Bob", "Carol", "Dave"))
+    graph.add_friendships(
+        [(alice.uuid, carol.uuid), (bob.uuid, carol.uuid), (alice.uuid, dave.uuid)]
+    )
+    assert graph.mutual_friend_ids(alice.uuid, bob.uuid) == {carol.uuid}
+    assert graph.mutual_friend_ids(bob.uuid, dave.uuid) == set()
+
+
+@pytest.mark.django_db
+def test_rebuild_from_m2m(make_profile):
+    alice, bob, carol = (make_profile(name) for name in ("Alice", "Bob", "Carol"))
+    alice.friends.add(bob)
+    carol.friends.add(alice)
+    call_command("rebuild_friend_graph", batch_size=1)
+    assert Friendship.objects.count() == 4
+    assert graph.friend_ids(alice.uuid) == {bob.uuid, carol.uuid}
+    assert graph.friend_ids(bob.uuid) == {alice.uuid}
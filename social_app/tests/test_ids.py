@@ -0,0 +1,33 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from social_app.ids import uuid7, uuid7_floor, uuid7_time
+from social_app.models import FriendRequest
+
+
+def test_uuid7_layout_and_order():
+    ids = [uuid7() for _ in range(10_000)]
+    assert all(value.version == 7 and value.variant == "specified in RFC 4122" for value in ids)
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+
+
+def test_uuid7_time_and_floor():
+    before = datetime.now(timezone.utc) - timedelta(milliseconds=1)
+    value = uuid7()
+    assert before <= uuid7_time(value) <= datetime.now(timezone.utc)
+    assert uuid7_floor(before) < value < uuid7_floor(before + timedelta(seconds=1))
+    assert uuid7_time(uuid.uuid4()) is None
+
+
+@pytest.mark.django_db
+def test_new_rows_get_time_ordered_ids(make_profile):
+    first, second, third = (make_profile(f"User {index}") for index in range(3))
+    requests = [
+        FriendRequest.objects.create(sender=first, receiver=second),
+        FriendRequest.objects.create(sender=first, receiver=third),
+    ]
+    assert all(request.uuid.version == 7 for request in requests)
+    assert list(FriendRequest.objects.order_by("uuid")) == requests
@@ -0,0 +1,86 @@
+import logging
+import time
+
+import pytest
+from django.urls import reverse
+from rest_framework.serializers import ListSerializer
+from rest_framework.test import APIClient
+from social_app.fast_serialization import RowListSerializer
+from social_app.instrumentation import Histogram, registry
+from social_app.testing import QueryBudgetExceeded
+
+
+@pytest.fixture
+def metrics_enabled(settings):
+    settings.REQUEST_METRICS_ENABLED = True
+    registry.reset()
+    yield
+    registry.reset()
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram((1, 5))
+    for value in (0, 1, 3, 10):
+        histogram.observe(value)
+    lines = histogram.render("queries", 'url_name="x"')
+    assert lines[:3] == [
+        'queries_bucket{url_name="x",le="1"} 2',
+        'queries_bucket{url_name="x",le="5"} 3',
+        'queries_bucket{url_name="x",le="+Inf"} 4',
+    ]
+    assert lines[-1] == 'queries_count{url_name="x"} 4'
+
+
+@pytest.mark.django_db
+def test_metrics_grouped_by_url_name(metrics_enabled, user_and_profiles):
+    client = APIClient()
+    client.force_authenticate(user=user_and_profiles["user1"])
+    client.get(reverse("friend-list"))
+    client.get(reverse("friend-list"))
+    body = client.get(reverse("metrics")).content.decode()
+    assert 'social_app_request_duration_seconds_count{url_name="friend-list"} 2' in body
+    assert 'social_app_request_queries_sum{url_name="friend-list"}' in body
+    assert 'social_app_request_cache_total{url_name="friend-list",result="hit"} 1' in body
+    assert 'social_app_request_cache_total{url_name="friend-list",result="miss"} 1' in body
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("fast", [True, False])
+def test_serialization_time_includes_serializer(
+    metrics_enabled, settings, authenticated_client, monkeypatch, fast
+):
+    settings.FAST_SERIALIZATION = fast
+    serializer_class = RowListSerializer if fast else ListSerializer
+    data = serializer_class.data
+
+    def slow_data(self):
+        time.sleep(0.05)
+        return data.fget(self)
+
+    monkeypatch.setattr(serializer_class, "data", property(slow_data))
+    authenticated_client.get(reverse("users"))
+    body = authenticated_client.get(reverse("metrics")).content.decode()
+    prefix = 'social_app_request_serialization_seconds_sum{url_name="users"} '
+    line = next(line for line in body.splitlines() if line.startswith(prefix))
+    assert float(line[len(prefix):]) >= 0.05
+
+
+@pytest.mark.django_db
+def test_metrics_only_served_locally(metrics_enabled):
+    response = APIClient().get(reverse("metrics"), REMOTE_ADDR="10.0.0.1")
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_slow_queries_are_logged(metrics_enabled, settings, authenticated_client, caplog):
+    settings.SLOW_QUERY_THRESHOLD_MS = 0
+    with caplog.at_level(logging.WARNING, logger="social_app.instrumentation"):
+        authenticated_client.get(reverse("friend-list"))
+    assert any("Slow query" in message for message in caplog.messages)
+
+
+@pytest.mark.django_db
+def test_query_budget_helper(authenticated_client, query_budget):
+    query_budget(authenticated_client, "friend-list", 5)
+    with pytest.raises(QueryBudgetExceeded):
+        query_budget(authenticated_client, "users", 0, data={"search": "User"})
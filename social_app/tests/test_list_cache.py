@@ -0,0 +1,120 @@
+import pytest
+from django.db import transaction
+from django.urls import reverse
+from rest_framework import status
+from social_app.caching import FRIENDS_LIST, PENDING_LIST, get_cache_stats, get_cache_version
+from social_app.models import BlockDetail, FriendRequest
+
+
+@pytest.mark.django_db
+def test_friend_list_is_served_from_cache(authenticated_client):
+    url = reverse("friend-list")
+    authenticated_client.get(url)
+    response = authenticated_client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    stats = get_cache_stats(FRIENDS_LIST)
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+
+@pytest.mark.django_db
+def test_friend_list_invalidated_on_accept(
+    authenticated_client, user_and_profiles, django_capture_on_commit_callbacks
+):
+    url = reverse("friend-list")
+    response = authenticated_client.get(url)
+    assert response.data["count"] == 0
+    with django_capture_on_commit_callbacks(execute=True):
+        friend_request = FriendRequest.objects.create(
+            sender=user_and_profiles["profile1"], receiver=user_and_profiles["profile2"]
+        )
+        friend_request.make_accepted()
+    response = authenticated_client.get(url)
+    assert response.data["count"] == 1
+
+
+@pytest.mark.django_db
+def test_pending_list_invalidated_on_new_request(
+    authenticated_client, user_and_profiles, django_capture_on_commit_callbacks
+):
+    url = reverse("pending-requests")
+    response = authenticated_client.get(url)
+    assert response.data["count"] == 0
+    with django_capture_on_commit_callbacks(execute=True):
+        FriendRequest.objects.create(
+            sender=user_and_profiles["profile2"], receiver=user_and_profiles["profile1"]
+        )
+    response = authenticated_client.get(url)
+    assert response.data["count"] == 1
+    with django_capture_on_commit_callbacks(execute=True):
+        BlockDetail.objects.create(
+            blocker=user_and_profiles["profile1"], blocked=user_and_profiles["profile2"]
+        )
+    response = authenticated_client.get(url)
+    assert response.data["count"] == 1
+    stats = get_cache_stats(PENDING_LIST)
+    assert stats["hits"] == 0
+    assert stats["misses"] == 3
+
+
+@pytest.mark.django_db
+def test_list_version_bumped_on_commit(
+    authenticated_client, user_and_profiles, django_capture_on_commit_callbacks
+):
+    url = reverse("pending-requests")
+    profile_id = user_and_profiles["profile1"].uuid
+    authenticated_client.get(url)
+    version = get_cache_version(PENDING_LIST, profile_id)
+    with django_capture_on_commit_callbacks(execute=True):
+        with transaction.atomic():
+            FriendRequest.objects.create(
+                sender=user_and_profiles["profile2"], receiver=user_and_profiles["profile1"]
+            )
+            # A read racing the write still finds the old version, so whatever
+            # it caches is orphaned once the write commits.
+            assert get_cache_version(PENDING_LIST, profile_id) == version
+            authenticated_client.get(url)
+            assert get_cache_stats(PENDING_LIST)["hits"] == 1
+    assert get_cache_version(PENDING_LIST, profile_id) != version
+    response = authenticated_client.get(url)
+    assert response.data["count"] == 1
+    assert get_cache_stats(PENDING_LIST)["misses"] == 2
+
+
+@pytest.mark.django_db
+def test_pages_are_cached_separately(authenticated_client, user_and_profiles):
+    url = reverse("pending-requests")
+    FriendRequest.objects.create(
+        sender=user_and_profiles["profile2"], receiver=user_and_profiles["profile1"]
+    )
+    first_page = authenticated_client.get(url, {"page_size": 1})
+    assert len(first_page.data["results"]) == 1
+    second_page = authenticated_client.get(url, {"page": 2, "page_size": 1})
+    assert second_page.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url_name", ["accept-request", "reject-request"])
+def test_resolving_a_request_invalidates_after_commit(
+    authenticated_client, user_and_profiles, django_capture_on_commit_callbacks, url_name
+):
+    receiver = user_and_profiles["profile1"]
+    friend_request = FriendRequest.objects.create(
+        sender=user_and_profiles["profile2"], receiver=receiver
+    )
+    pending_url = reverse("pending-requests")
+    assert authenticated_client.get(pending_url).data["count"] == 1
+    version = get_cache_version(PENDING_LIST, receiver.uuid)
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        response = authenticated_client.put(
+            reverse(url_name, kwargs={"request_id": friend_request.uuid})
+        )
+    assert response.status_code == status.HTTP_200_OK
+    # Nothing is invalidated until the view's transaction has committed.
+    assert get_cache_version(PENDING_LIST, receiver.uuid) == version
+    for callback in callbacks:
+        callback()
+    assert get_cache_version(PENDING_LIST, receiver.uuid) != version
+    assert authenticated_client.get(pending_url).data["count"] == 0
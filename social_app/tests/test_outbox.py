@@ -0,0 +1,114 @@
+import pytest
+from django.core.management import call_command
+from django.db import transaction
+from social_app import outbox
+from social_app.helpers import process_request
+from social_app.models import BlockDetail, FriendRequest, FriendSuggestion, OutboxEvent
+
+
+class RecordingConsumer(outbox.BaseConsumer):
+    topics = (outbox.REQUEST_ACCEPTED, outbox.USER_BLOCKED)
+
+    def __init__(self):
+        self.batches = []
+
+    def handle(self, events):
+        self.batches.append([(event.topic, event.payload) for event in events])
+
+
+class FailingConsumer(outbox.BaseConsumer):
+    topics = (outbox.REQUEST_ACCEPTED,)
+
+    def handle(self, events):
+        OutboxEvent.objects.create(topic="written.by.failing.consumer", payload={})
+        raise RuntimeError("boom")
+
+
+@pytest.fixture
+def consumers(monkeypatch):
+    registered = []
+    monkeypatch.setattr(outbox, "get_consumers", lambda: registered)
+    return registered
+
+
+@pytest.mark.django_db
+def test_graph_changes_emit_events(user_and_profiles):
+    sender, receiver = user_and_profiles["profile1"], user_and_profiles["profile2"]
+    process_request(sender, receiver.uuid)
+    request = FriendRequest.objects.get()
+    request.make_accepted()
+    block = BlockDetail.objects.create(blocker=receiver, blocked=sender)
+    block.delete()
+
+    assert list(OutboxEvent.objects.order_by("id").values_list("topic", flat=True)) == [
+        outbox.REQUEST_SENT,
+        outbox.REQUEST_ACCEPTED,
+        outbox.USER_BLOCKED,
+        outbox.USER_UNBLOCKED,
+    ]
+    assert OutboxEvent.objects.get(topic=outbox.REQUEST_ACCEPTED).payload == {
+        "request_id": str(request.uuid),
+        "sender_id": str(sender.uuid),
+        "receiver_id": str(receiver.uuid),
+    }
+
+
+@pytest.mark.django_db
+def test_events_roll_back_with_the_change(user_and_profiles):
+    request = FriendRequest.objects.create(
+        sender=user_and_profiles["profile1"], receiver=user_and_profiles["profile2"]
+    )
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            request.make_rejected()
+            raise RuntimeError
+    assert not OutboxEvent.objects.exists()
+
+
+@pytest.mark.django_db
+def test_worker_hands_events_to_matching_consumers(consumers, user_and_profiles):
+    recording = RecordingConsumer()
+    consumers.append(recording)
+    profile1, profile2 = user_and_profiles["profile1"], user_and_profiles["profile2"]
+    FriendRequest.objects.create(sender=profile1, receiver=profile2).make_rejected()
+    BlockDetail.objects.create(blocker=profile1, blocked=profile2)
+
+    call_command("process_outbox", once=True, batch_size=1)
+
+    payload = {"blocker_id": str(profile1.uuid), "blocked_id": str(profile2.uuid)}
+    assert recording.batches == [[(outbox.USER_BLOCKED, payload)]]
+    assert not OutboxEvent.objects.filter(processed_at__isnull=True).exists()
+
+
+@pytest.mark.django_db
+def test_failed_batches_are_retried_then_given_up(consumers, user_and_profiles):
+    recording = RecordingConsumer()
+    consumers.extend([FailingConsumer(), recording])
+    FriendRequest.objects.create(
+        sender=user_and_profiles["profile1"], receiver=user_and_profiles["profile2"]
+    ).make_accepted()
+
+    assert outbox.process_batch(max_attempts=2) == 1
+    event = OutboxEvent.objects.get()
+    assert event.processed_at is None
+    assert event.attempts == 1
+    assert "FailingConsumer: RuntimeError('boom')" in event.last_error
+
+    assert outbox.process_batch(max_attempts=2) == 1
+    assert outbox.process_batch(max_attempts=2) == 0
+    # The failing consumer's writes were rolled back, the other one ran twice.
+    assert OutboxEvent.objects.count() == 1
+    assert len(recording.batches) == 2
+
+
+@pytest.mark.django_db
+def test_suggestions_refreshed_from_outbox(make_profile):
+    alice, bob, carol = (make_profile(name) for name in ("Alice", "Bob", "Carol"))
+    FriendRequest.objects.create(sender=alice, receiver=bob).make_accepted()
+    FriendRequest.objects.create(sender=bob, receiver=carol).make_accepted()
+
+    call_command("process_outbox", once=True, concurrency=1)
+
+    suggestion = FriendSuggestion.objects.get(profile=alice)
+    assert suggestion.suggested_id == carol.uuid
+    assert suggestion.mutual_count == 1
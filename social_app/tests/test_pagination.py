@@ -0,0 +1,67 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from social_app.models import FriendRequest
+
+
+@pytest.fixture
+def receiver_with_requests(make_profile):
+    receiver = make_profile("Receiver")
+    senders = [make_profile(f"Sender {index}") for index in range(5)]
+    for sender in senders:
+        FriendRequest.objects.create(sender=sender, receiver=receiver)
+    client = APIClient()
+    client.force_authenticate(user=receiver.user)
+    return receiver, client
+
+
+def collect_pages(client, url, params):
+    seen = []
+    response = client.get(url, params)
+    while True:
+        assert response.status_code == status.HTTP_200_OK
+        assert "count" not in response.data
+        seen.extend(item["uuid"] for item in response.data["results"])
+        if response.data["next"] is None:
+            return seen
+        response = client.get(response.data["next"])
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_walks_all_rows(receiver_with_requests):
+    receiver, client = receiver_with_requests
+    url = reverse("pending-requests")
+    seen = collect_pages(client, url, {"pagination": "cursor", "page_size": 2})
+    expected = FriendRequest.objects.filter(receiver=receiver).order_by(
+        "-created_at", "-uuid"
+    )
+    assert seen == [str(pk) for pk in expected.values_list("uuid", flat=True)]
+
+
+@pytest.mark.django_db
+def test_cursor_is_stable_under_inserts(receiver_with_requests, make_profile):
+    receiver, client = receiver_with_requests
+    url = reverse("pending-requests")
+    first = client.get(url, {"pagination": "cursor", "page_size": 2})
+    FriendRequest.objects.create(sender=make_profile("Late Sender"), receiver=receiver)
+    rest = collect_pages(client, first.data["next"], {})
+    seen = [item["uuid"] for item in first.data["results"]] + rest
+    assert len(seen) == len(set(seen)) == 5
+
+
+@pytest.mark.django_db
+def test_invalid_cursor(authenticated_client):
+    response = authenticated_client.get(reverse("pending-requests"), {"cursor": "bogus"})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_search_cursor_pagination(authenticated_client, make_profile):
+    for index in range(3):
+        make_profile(f"Maya {index}")
+    url = reverse("users")
+    seen = collect_pages(
+        authenticated_client, url, {"search": "maya", "pagination": "cursor", "page_size": 1}
+    )
+    assert len(seen) == len(set(seen)) == 3
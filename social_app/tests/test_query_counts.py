@@ -0,0 +1,51 @@
+import pytest
+from django.core.management import call_command
+from rest_framework.test import APIClient
+from social_app.graph import add_friendships
+from social_app.models import FriendRequest
+
+
+@pytest.fixture
+def busy_profile(make_profile):
+    """
+    A profile with 12 friends, 12 pending requests and 12 suggestions.
+    """
+    profile = make_profile("Busy Person")
+    friends = [make_profile(f"Friend {index}") for index in range(12)]
+    senders = [make_profile(f"Sender {index}") for index in range(12)]
+    strangers = [make_profile(f"Stranger {index}") for index in range(12)]
+    add_friendships([(profile.uuid, friend.uuid) for friend in friends])
+    add_friendships([(friend.uuid, other.uuid) for friend, other in zip(friends, strangers)])
+    for sender in senders:
+        FriendRequest.objects.create(sender=sender, receiver=profile)
+    call_command("compute_friend_suggestions")
+    client = APIClient()
+    client.force_authenticate(user=profile.user)
+    return client
+
+
+# Page number pagination adds a COUNT query, cursor pagination does not.
+# Search also loads the (cold) blocked-by set.
+LIST_ENDPOINTS = [
+    ("friend-list", {}, 2),
+    ("pending-requests", {}, 2),
+    ("users", {}, 3),
+    ("users", {"search": "friend"}, 3),
+    ("friend-suggestions", {}, 2),
+]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url_name,params,budget", LIST_ENDPOINTS)
+@pytest.mark.parametrize("pagination", [{}, {"pagination": "cursor"}])
+def test_list_query_count_is_constant(
+    busy_profile, query_budget, url_name, params, budget, pagination
+):
+    if pagination:
+        budget -= 1
+    for page_size in (1, 10):
+        # Caching is keyed by page size, so every call here is a cache miss.
+        response = query_budget(
+            busy_profile, url_name, budget, data={**params, **pagination, "page_size": page_size}
+        )
+        assert len(response.data["results"]) == page_size
@@ -0,0 +1,55 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from social_app.helpers import RATE_LIMIT_MESSAGE
+from social_app.models import FriendRequest
+from social_app.ratelimit import LocalSlidingWindowRateLimiter, parse_rate
+
+
+def test_parse_rate():
+    assert parse_rate("3/min") == (3, 60)
+    assert parse_rate("100/hour") == (100, 3600)
+
+
+def test_local_limiter_rejects_over_limit():
+    limiter = LocalSlidingWindowRateLimiter()
+    assert limiter.hit("key", limit=2, window=60).allowed
+    result = limiter.hit("key", limit=2, window=60, cost=2)
+    assert not result.allowed
+    assert result.remaining == 1
+    assert 0 < result.retry_after <= 60
+    assert limiter.hit("key", limit=2, window=60).allowed
+    assert not limiter.hit("key", limit=2, window=60).allowed
+    assert limiter.hit("other", limit=2, window=60).allowed
+
+
+@pytest.mark.django_db
+def test_send_request_rate_limit(authenticated_client, make_profile, settings):
+    settings.RATE_LIMITS = {"send-requests": "2/min"}
+    receivers = [make_profile(f"Receiver {index}") for index in range(3)]
+
+    def send(receiver):
+        return authenticated_client.post(
+            reverse("send-requests", kwargs={"user_id": receiver.uuid})
+        )
+
+    assert send(receivers[0]).status_code == status.HTTP_200_OK
+    # Sends that fail for other reasons don't use up the limit.
+    for _ in range(3):
+        response = send(receivers[0])
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {"message": "Already requested"}
+    assert send(receivers[1]).status_code == status.HTTP_200_OK
+
+    response = send(receivers[2])
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {"message": RATE_LIMIT_MESSAGE}
+    assert not FriendRequest.objects.filter(receiver=receivers[2]).exists()
+
+
+@pytest.mark.django_db
+def test_unconfigured_endpoint_is_not_throttled(authenticated_client, settings):
+    settings.RATE_LIMITS = {}
+    for _ in range(5):
+        response = authenticated_client.get(reverse("friend-list"))
+        assert response.status_code == status.HTTP_200_OK
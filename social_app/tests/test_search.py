@@ -0,0 +1,25 @@
+import pytest
+from social_app.models import UserProfile
+from social_app.search import SimpleUserSearchEngine, tokenize
+
+
+def test_tokenize():
+    assert tokenize("  Maya  PAT-el ") == ["maya", "pat", "el"]
+
+
+@pytest.mark.django_db
+def test_prefix_search_ranks_exact_and_prefix_matches_first(make_profile):
+    for name in ("Anna Maya", "Maya Patel", "Maya", "Mayank Rao", "Amaya Cruz"):
+        make_profile(name)
+    results = SimpleUserSearchEngine().search(UserProfile.objects.all(), "maya")
+    names = [profile.user.name for profile in results]
+    assert names == ["Maya", "Maya Patel", "Mayank Rao", "Anna Maya"]
+
+
+@pytest.mark.django_db
+def test_every_token_must_match(make_profile):
+    make_profile("Maya Patel")
+    make_profile("Maya Rao")
+    results = SimpleUserSearchEngine().search(UserProfile.objects.all(), "maya pa")
+    assert [profile.user.name for profile in results] == ["Maya Patel"]
+    assert not SimpleUserSearchEngine().search(UserProfile.objects.all(), "  ").exists()
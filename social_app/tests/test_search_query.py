@@ -0,0 +1,49 @@
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from social_app import search_query
+from social_app.models import BlockDetail
+
+
+@pytest.mark.parametrize(
+    "term, kind",
+    [
+        (None, search_query.EMPTY),
+        ("", search_query.EMPTY),
+        ("user2@example.com", search_query.EMAIL),
+        ("User2@Example.COM", search_query.EMAIL),
+        ("user2@", search_query.NAME),
+        ("not an@email", search_query.NAME),
+        ("0b6f0d8e-4f7c-4a7e-9d55-6a1c2b3d4e5f", search_query.UUID),
+        ("0B6F0D8E4F7C4A7E9D556A1C2B3D4E5F", search_query.UUID),
+        ("0b6f0d8e-4f7c", search_query.NAME),
+        ("maya pat", search_query.NAME),
+    ],
+)
+def test_classify(term, kind):
+    assert search_query.classify(term) == kind
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url_name", ["users", "async-users"])
+@pytest.mark.parametrize("pagination", [{}, {"pagination": "cursor"}])
+def test_uuid_search_lists_the_profile(user_and_profiles, make_profile, url_name, pagination):
+    client = APIClient()
+    token = AccessToken.for_user(user_and_profiles["user1"])
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    me, profile = user_and_profiles["profile1"], user_and_profiles["profile2"]
+    blocker = make_profile("Blocker")
+    BlockDetail.objects.create(blocker=blocker, blocked=me)
+
+    def search(term):
+        response = client.get(reverse(url_name), {"search": term, **pagination})
+        assert response.status_code == 200
+        return response.json()["results"]
+
+    assert search(str(profile.uuid).upper()) == [
+        {"uuid": str(profile.uuid), "name": "User Two"}
+    ]
+    assert search(str(me.uuid)) == []
+    assert search(str(blocker.uuid)) == []
+    assert search("00000000-0000-0000-0000-000000000000") == []
@@ -0,0 +1,88 @@
+import pytest
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from social_app.models import CustomUser, UserProfile
+
+SIGNUP = {"name": "New User", "email": "New.User@Example.com", "password": "Signup-p4ssword"}
+
+
+@pytest.mark.django_db
+def test_signup_inserts_without_looking_up_the_email():
+    with CaptureQueriesContext(connection) as queries:
+        response = APIClient().post(reverse("sign-up"), SIGNUP)
+    assert response.status_code == 201
+    assert response.data["email"] == "new.user@example.com"
+    assert not any(query["sql"].startswith("SELECT") for query in queries.captured_queries)
+    assert UserProfile.objects.filter(user__email="new.user@example.com").exists()
+
+
+@pytest.mark.django_db
+def test_duplicate_signup_is_rejected_by_the_unique_index():
+    client = APIClient()
+    assert client.post(reverse("sign-up"), SIGNUP).status_code == 201
+    response = client.post(reverse("sign-up"), {**SIGNUP, "name": "Someone Else"})
+    assert response.status_code == 400
+    assert response.data == {"email": ["User with this email already exisits"]}
+    assert CustomUser.objects.count() == UserProfile.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_signup_rolls_back_the_user_without_a_profile(monkeypatch):
+    def fail(**kwargs):
+        raise RuntimeError("profile insert failed")
+
+    monkeypatch.setattr(UserProfile.objects, "create", fail)
+    with pytest.raises(RuntimeError):
+        APIClient().post(reverse("sign-up"), SIGNUP)
+    assert not CustomUser.objects.exists()
+
+
+def test_hasher_costs_come_from_settings(settings):
+    hashers = ["social_app.hashers.TunablePBKDF2PasswordHasher"]
+    settings.PASSWORD_HASHER_OPTIONS = {"pbkdf2_sha256": {"iterations": 1000}}
+    settings.PASSWORD_HASHERS = hashers
+    encoded = make_password("secret")
+    assert encoded.startswith("pbkdf2_sha256$1000$")
+    # Hashers are loaded once, changing PASSWORD_HASHERS reloads them.
+    settings.PASSWORD_HASHER_OPTIONS = {"pbkdf2_sha256": {"iterations": 2000}}
+    settings.PASSWORD_HASHERS = list(hashers)
+    assert get_hasher().must_update(encoded)
+
+
+@pytest.mark.django_db
+def test_import_users_in_chunks(tmp_path, user_and_profiles):
+    source = tmp_path / "users.csv"
+    source.write_text(
+        "email,name,password\n"
+        "Ada@Example.com,Ada,first-secret\n"
+        "user1@example.com,Existing,whatever\n"
+        "not-an-email,Broken,whatever\n"
+        "ada@example.com,Ada Again,whatever\n"
+        "grace@example.com,Grace,\n"
+    )
+    call_command("import_users", str(source), batch_size=2, hash_passwords=True)
+    call_command("import_users", str(source), batch_size=2, hash_passwords=True)
+
+    ada = CustomUser.objects.get(email="ada@example.com")
+    assert ada.name == "Ada"
+    assert authenticate(email="ada@example.com", password="first-secret") == ada
+    assert not CustomUser.objects.get(email="grace@example.com").has_usable_password()
+    assert CustomUser.objects.count() == UserProfile.objects.count() == 4
+
+
+@pytest.mark.django_db
+def test_import_keeps_recognised_hashes(tmp_path):
+    source = tmp_path / "users.jsonl"
+    source.write_text(
+        '{"email": "ada@example.com", "name": "Ada", "password": "%s"}\n'
+        '{"email": "bob@example.com", "name": "Bob", "password": "legacy$unknown"}\n'
+        % make_password("kept")
+    )
+    call_command("import_users", str(source))
+    assert list(CustomUser.objects.values_list("email", flat=True)) == ["ada@example.com"]
+    assert authenticate(email="ada@example.com", password="kept") is not None
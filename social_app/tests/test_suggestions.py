@@ -0,0 +1,84 @@
+import uuid
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+from social_app.graph import add_friendships
+from social_app.models import BlockDetail, FriendRequest, FriendSuggestion
+from social_app.suggestions import load_csr_graph, refresh_suggestions
+
+
+@pytest.fixture
+def network(make_profile):
+    names = ("Alice", "Bob", "Carol", "Dave", "Erin", "Frank")
+    profiles = {name: make_profile(name) for name in names}
+    add_friendships(
+        [
+            (profiles["Alice"].uuid, profiles["Bob"].uuid),
+            (profiles["Alice"].uuid, profiles["Carol"].uuid),
+            (profiles["Bob"].uuid, profiles["Dave"].uuid),
+            (profiles["Carol"].uuid, profiles["Dave"].uuid),
+            (profiles["Bob"].uuid, profiles["Erin"].uuid),
+            (profiles["Carol"].uuid, profiles["Frank"].uuid),
+        ]
+    )
+    return profiles
+
+
+def suggested_for(profile):
+    return [
+        (suggestion.suggested_id, suggestion.mutual_count)
+        for suggestion in FriendSuggestion.objects.filter(profile=profile)
+    ]
+
+
+@pytest.mark.django_db
+def test_csr_graph_matches_friendships(network):
+    graph = load_csr_graph(chunk_size=2)
+    assert sorted(graph.ids[node] for node in range(len(graph))) == [
+        graph.ids[node] for node in range(len(graph))
+    ]
+    alice = graph.node_of(network["Alice"].uuid)
+    friends = {graph.ids[node] for node in graph.neighbours_of(alice)}
+    assert friends == {network["Bob"].uuid, network["Carol"].uuid}
+    assert graph.node_of(uuid.uuid4()) is None
+
+
+@pytest.mark.django_db
+def test_suggestions_ranked_by_mutual_friends(network):
+    call_command("compute_friend_suggestions", chunk_size=2)
+    suggestions = suggested_for(network["Alice"])
+    assert suggestions[0] == (network["Dave"].uuid, 2)
+    assert {profile_id for profile_id, _ in suggestions[1:]} == {
+        network["Erin"].uuid,
+        network["Frank"].uuid,
+    }
+
+
+@pytest.mark.django_db
+def test_blocked_and_requested_users_are_not_suggested(network):
+    BlockDetail.objects.create(blocker=network["Erin"], blocked=network["Alice"])
+    FriendRequest.objects.create(sender=network["Alice"], receiver=network["Frank"])
+    call_command("compute_friend_suggestions")
+    assert suggested_for(network["Alice"]) == [(network["Dave"].uuid, 2)]
+
+
+@pytest.mark.django_db
+def test_refresh_matches_batch_job(network):
+    refresh_suggestions([network["Dave"].uuid])
+    incremental = suggested_for(network["Dave"])
+    call_command("compute_friend_suggestions")
+    assert suggested_for(network["Dave"]) == incremental
+
+
+@pytest.mark.django_db
+def test_suggestions_endpoint(network):
+    call_command("compute_friend_suggestions")
+    client = APIClient()
+    client.force_authenticate(user=network["Alice"].user)
+    response = client.get(reverse("friend-suggestions"), {"page_size": 1})
+    assert response.data["count"] == 3
+    assert response.data["results"] == [
+        {"uuid": str(network["Dave"].uuid), "name": "Dave", "mutual_count": 2}
+    ]
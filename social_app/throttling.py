@@ -0,0 +1,50 @@
+from typing import Optional
+
+from django.conf import settings
+from rest_framework.throttling import BaseThrottle
+
+from .ratelimit import RateLimitResult, get_rate_limiter, parse_rate
+
+
+def hit_rate_limit(scope: Optional[str], ident, cost: int = 1) -> Optional[RateLimitResult]:
+    """
+    Record a hit for `ident` against the rate configured for `scope`, or
+    return None when the scope is not rate limited.
+    """
+    rate = settings.RATE_LIMITS.get(scope) if scope is not None else None
+    if rate is None:
+        return None
+    limit, window = parse_rate(rate)
+    return get_rate_limiter().hit(f"{scope}_{ident}", limit, window, cost)
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """
+    Throttle backed by the configured rate limiter. The scope is the view's
+    `throttle_scope` or its URL name, and rates are read from
+    `settings.RATE_LIMITS`; views without a configured rate are not limited.
+    """
+
+    def __init__(self) -> None:
+        self.retry_after: Optional[float] = None
+
+    def get_scope(self, request, view) -> Optional[str]:
+        scope = getattr(view, "throttle_scope", None)
+        if scope is None and request.resolver_match is not None:
+            scope = request.resolver_match.url_name
+        return scope
+
+    def get_ident(self, request):
+        if request.user and request.user.is_authenticated:
+            return request.user.pk
+        return super().get_ident(request)
+
+    def allow_request(self, request, view) -> bool:
+        result = hit_rate_limit(self.get_scope(request, view), self.get_ident(request))
+        if result is None:
+            return True
+        self.retry_after = result.retry_after
+        return result.allowed
+
+    def wait(self) -> Optional[float]:
+        return self.retry_after
@@ -0,0 +1,101 @@
+import csv
+import json
+import logging
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+
+from .models import CustomUser, UserProfile
+
+logger = logging.getLogger(__name__)
+
+
+def read_rows(path: str) -> Iterator[dict]:
+    """
+    Users to import from a CSV file with a header row or a JSON lines file
+    (`.jsonl`), with the keys email, name and optionally password.
+    """
+    with open(path, newline="") as source:
+        if path.endswith(".jsonl"):
+            for line in source:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(source)
+
+
+def _chunks(rows: Iterable[dict], size: int) -> Iterator[List[Tuple[int, dict]]]:
+    chunk: List[Tuple[int, dict]] = []
+    for number, row in enumerate(rows, start=1):
+        chunk.append((number, row))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _encoded_password(password: Optional[str], hash_passwords: bool) -> str:
+    if not password:
+        # Imported users without a password reset it before logging in.
+        return make_password(None)
+    if hash_passwords:
+        return make_password(password)
+    # Raises ValueError for formats none of PASSWORD_HASHERS can verify.
+    identify_hasher(password)
+    return password
+
+
+def _build_user(row: dict, hash_passwords: bool) -> CustomUser:
+    email = (row.get("email") or "").strip().lower()
+    validate_email(email)
+    return CustomUser(
+        email=email,
+        name=(row.get("name") or "").strip()[:150],
+        password=_encoded_password(row.get("password"), hash_passwords),
+    )
+
+
+def import_users(
+    rows: Iterable[dict], batch_size: int = 1000, hash_passwords: bool = False
+) -> Dict[str, int]:
+    """
+    Create users and their profiles in chunks of `batch_size` rows, one
+    transaction per chunk. Passwords are taken as hashes in a format one of
+    PASSWORD_HASHERS verifies, or hashed here with `hash_passwords`. Emails
+    that already exist are skipped, so an interrupted import can be rerun.
+    """
+    counts = {"imported": 0, "existing": 0, "invalid": 0}
+    for chunk in _chunks(rows, batch_size):
+        users: Dict[str, CustomUser] = {}
+        for number, row in chunk:
+            try:
+                user = _build_user(row, hash_passwords)
+            except (ValidationError, ValueError) as exc:
+                logger.warning("Skipping row %s: %s", number, exc)
+                counts["invalid"] += 1
+                continue
+            if user.email in users:
+                counts["existing"] += 1
+            else:
+                users[user.email] = user
+        with transaction.atomic():
+            existing = {
+                email.lower()
+                for email in CustomUser.objects.by_emails(users).values_list("email", flat=True)
+            }
+            new_users = [user for email, user in users.items() if email not in existing]
+            # Users signing up meanwhile are skipped by the unique index.
+            CustomUser.objects.bulk_create(new_users, ignore_conflicts=True)
+            user_ids = CustomUser.objects.filter(
+                email__in=[user.email for user in new_users], user_profile__isnull=True
+            ).values_list("pk", flat=True)
+            profiles = UserProfile.objects.bulk_create(
+                [UserProfile(user_id=user_id) for user_id in user_ids]
+            )
+        counts["imported"] += len(profiles)
+        counts["existing"] += len(users) - len(profiles)
+    return counts
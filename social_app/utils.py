@@ -2,11 +2,21 @@ from typing import Optional
 from django.core.exceptions import ValidationError
 from django.core.validators import EmailValidator
 
+# Validators are stateless; building one per call recompiles nothing but
+# still costs an allocation and attribute setup on every search request.
+EMAIL_VALIDATOR = EmailValidator()
+
 
 def is_valid_email(email: Optional[str]) -> bool:
-    validator: EmailValidator = EmailValidator()
+    # Cheap precheck: most search terms are names or partly typed addresses,
+    # which skip the regex and IDNA checks of the full validator.
+    if not email:
+        return False
+    user_part, at, domain_part = email.rpartition("@")
+    if not (at and user_part and domain_part):
+        return False
     try:
-        validator(email)
+        EMAIL_VALIDATOR(email)
         return True
     except ValidationError:
         return False
@@ -14,6 +14,8 @@ from pathlib import Path
 import os
 from datetime import timedelta
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -39,6 +41,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "rest_framework_simplejwt",
     "social_app",
@@ -46,6 +49,7 @@ INSTALLED_APPS = [
 
 
 MIDDLEWARE = [
+    "social_app.instrumentation.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -79,6 +83,41 @@ WSGI_APPLICATION = "social_networking_app.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
+# Connection reuse, chosen with DATABASE_POOL_MODE:
+# - "persistent" (default under WSGI): every worker thread keeps its
+#   connection for DATABASE_CONN_MAX_AGE seconds and checks it is usable
+#   before reusing it in a new request. Postgres then holds up to
+#   workers * GUNICORN_THREADS connections per gthread server.
+# - "pgbouncer": DATABASE_HOST is a PgBouncer in transaction pooling mode,
+#   which pools the server connections; server-side cursors can't be used
+#   through it. This is how to pool connections under ASGI.
+# - "none" (default under ASGI): one new connection per request.
+# Under ASGI (the uvicorn workers) Django runs each request's sync code in a
+# thread and context of its own, so a connection kept after the request is
+# never reused and stays open until it is garbage collected: CONN_MAX_AGE is
+# always 0 there, and "persistent" is refused.
+# Django 5.0 has no built-in psycopg connection pool.
+ASGI_SERVER = os.environ.get("GUNICORN_WORKER_CLASS", "uvicorn.workers.UvicornWorker") not in (
+    "gthread",
+    "sync",
+)
+DATABASE_POOL_MODE = os.environ.get("DATABASE_POOL_MODE", "none" if ASGI_SERVER else "persistent")
+if ASGI_SERVER and DATABASE_POOL_MODE == "persistent":
+    raise ImproperlyConfigured(
+        'DATABASE_POOL_MODE "persistent" leaks connections under ASGI; '
+        'use "pgbouncer" or "none".'
+    )
+DATABASE_CONN_MAX_AGE = 0 if ASGI_SERVER else int(os.environ.get("DATABASE_CONN_MAX_AGE", 60))
+DATABASE_CONNECTION_SETTINGS = {
+    "persistent": {"CONN_MAX_AGE": DATABASE_CONN_MAX_AGE, "CONN_HEALTH_CHECKS": True},
+    "pgbouncer": {
+        "CONN_MAX_AGE": DATABASE_CONN_MAX_AGE,
+        "CONN_HEALTH_CHECKS": True,
+        "DISABLE_SERVER_SIDE_CURSORS": True,
+    },
+    "none": {"CONN_MAX_AGE": 0},
+}
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql_psycopg2",
@@ -87,9 +126,29 @@ DATABASES = {
         "PASSWORD": os.environ["DATABASE_PASSWORD"],
         "HOST": os.environ["DATABASE_HOST"],
         "PORT": os.environ["DATABASE_PORT"],
+        "OPTIONS": {
+            "connect_timeout": int(os.environ.get("DATABASE_CONNECT_TIMEOUT", 5)),
+        },
+        **DATABASE_CONNECTION_SETTINGS[DATABASE_POOL_MODE],
     }
 }
 
+# Read replicas, as aliases in DATABASES. Views decorated with
+# social_app.db_routing.replica_reads read from one of them, except for users
+# whose lists changed in the last REPLICA_PIN_SECONDS (read-your-writes),
+# which read from the primary. Writes always go to the primary.
+DATABASE_REPLICAS = []
+if os.environ.get("DATABASE_REPLICA_HOST"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": os.environ["DATABASE_REPLICA_HOST"],
+        "PORT": os.environ.get("DATABASE_REPLICA_PORT", os.environ["DATABASE_PORT"]),
+    }
+    DATABASE_REPLICAS = ["replica"]
+DATABASE_ROUTERS = ["social_app.db_routing.ReplicaRouter"]
+# Should exceed the usual replication lag.
+REPLICA_PIN_SECONDS = 5
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -109,6 +168,34 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# New passwords are hashed with PASSWORD_HASHER: "pbkdf2", "scrypt" or
+# "argon2". The others stay listed so existing hashes keep verifying, and
+# are upgraded to the selected hasher and costs on the next login.
+PASSWORD_HASHER_TIERS = {
+    "pbkdf2": "social_app.hashers.TunablePBKDF2PasswordHasher",
+    "scrypt": "social_app.hashers.TunableScryptPasswordHasher",
+    "argon2": "social_app.hashers.TunableArgon2PasswordHasher",
+}
+PASSWORD_HASHER = os.environ.get("PASSWORD_HASHER", "pbkdf2")
+PASSWORD_HASHERS = [PASSWORD_HASHER_TIERS[PASSWORD_HASHER]] + [
+    path for tier, path in PASSWORD_HASHER_TIERS.items() if tier != PASSWORD_HASHER
+]
+# Cost parameters per algorithm; lower costs make signups and logins cheaper
+# and offline guessing of leaked hashes faster. Defaults are Django's.
+PASSWORD_HASHER_OPTIONS = {
+    "pbkdf2_sha256": {
+        "iterations": int(os.environ.get("PASSWORD_PBKDF2_ITERATIONS", 720000)),
+    },
+    "scrypt": {
+        "work_factor": int(os.environ.get("PASSWORD_SCRYPT_WORK_FACTOR", 2**14)),
+    },
+    "argon2": {
+        "time_cost": int(os.environ.get("PASSWORD_ARGON2_TIME_COST", 2)),
+        "memory_cost": int(os.environ.get("PASSWORD_ARGON2_MEMORY_COST", 102400)),
+        "parallelism": int(os.environ.get("PASSWORD_ARGON2_PARALLELISM", 8)),
+    },
+}
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.0/topics/i18n/
@@ -137,15 +224,39 @@ AUTH_USER_MODEL = "social_app.CustomUser"
 REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "social_app.authentication.CachedJWTAuthentication",
+    ),
+    "DEFAULT_THROTTLE_CLASSES": ("social_app.throttling.SlidingWindowThrottle",),
+    "DEFAULT_RENDERER_CLASSES": (
+        "social_app.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
     ),
 }
 
 MAX_REQUESTS_IN_MINUTE = 3
 
+# Per endpoint rates for SlidingWindowThrottle, keyed by URL name (or the
+# view's throttle_scope). Endpoints not listed here are not rate limited.
+RATE_LIMITS = {
+    # Checked by social_app.helpers for each request actually sent, single
+    # or bulk, and answered with 400 rather than the throttle's 429.
+    "send-requests": f"{MAX_REQUESTS_IN_MINUTE}/min",
+    # Full streaming exports of the user's own graph.
+    "export": "10/hour",
+}
+# Largest number of items accepted by the bulk friend request endpoints.
+BULK_REQUEST_MAX_ITEMS = 100
+
+RATE_LIMIT_BACKEND = "social_app.ratelimit.RedisSlidingWindowRateLimiter"
+RATE_LIMIT_CACHE_ALIAS = "default"
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=int(os.environ["JWT_EXPIREY_MINUTES"])),
+    "TOKEN_OBTAIN_SERIALIZER": "social_app.serializers.ProfileTokenObtainPairSerializer",
 }
+# How long CachedJWTAuthentication trusts a cached active flag and password
+# hash. Saving a user drops its entry right away.
+AUTH_STATE_CACHE_TIMEOUT = 60
 
 AUTHENTICATION_BACKENDS = [
     "social_app.authentication.CustomAuthenticationBackend",
@@ -154,6 +265,47 @@ AUTHENTICATION_BACKENDS = [
 
 COOLDOWN_TIME = 24 * 60 * 60
 
+# Accepted requests, and rejected ones whose cooldown is over, are moved to
+# the archive table this many days after they were resolved, by
+# `manage.py archive_requests`.
+REQUEST_ARCHIVE_AFTER_DAYS = 30
+REQUEST_ARCHIVE_BATCH_SIZE = 1000
+
+# Lifetime of cached friend/pending list pages. Entries are invalidated on
+# write through versioned keys, so this only bounds memory usage.
+LIST_CACHE_TIMEOUT = 5 * 60
+
+# "Blocked by" sets are cached in CACHES for BLOCKLIST_CACHE_TIMEOUT seconds
+# and in a per-process LRU for BLOCKLIST_LOCAL_TTL seconds, which bounds how
+# long another worker may serve a set after a block or unblock.
+BLOCKLIST_CACHE_TIMEOUT = 60 * 60
+BLOCKLIST_LOCAL_TTL = 5
+BLOCKLIST_LOCAL_MAXSIZE = 10000
+
+USER_SEARCH_ENGINE = "social_app.search.PostgresUserSearchEngine"
+
+# List endpoints build their pages from values() rows through a mapper
+# compiled from the serializer (social_app.fast_serialization) and render
+# JSON with orjson. The output is byte-identical to the ModelSerializer and
+# JSONRenderer path used when this is off.
+FAST_SERIALIZATION = os.environ.get("FAST_SERIALIZATION", "true").lower() == "true"
+
+# Consumers of the friend graph outbox (social_app.outbox), run by
+# `manage.py process_outbox`. Each is a dotted path to a BaseConsumer.
+OUTBOX_CONSUMERS = [
+    "social_app.consumers.SuggestionRefreshConsumer",
+]
+OUTBOX_BATCH_SIZE = 100
+# Events failing this many times are left in the table for inspection.
+OUTBOX_MAX_ATTEMPTS = 5
+# Seconds between polls of an empty outbox.
+OUTBOX_POLL_INTERVAL = 1.0
+# Processed events are deleted after this many hours.
+OUTBOX_RETENTION_HOURS = 24 * 7
+
+# Number of "people you may know" entries stored per user.
+FRIEND_SUGGESTIONS_LIMIT = 20
+
 REDIS_URL = os.environ['REDIS_URL']
 
 # Configure Django Caching with Redis
@@ -163,10 +315,30 @@ CACHES = {
         'LOCATION': REDIS_URL,
         'OPTIONS': {
             'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            # One pool per process, shared by its threads; the async cache
+            # client builds its per event loop pools from the same kwargs.
+            'CONNECTION_POOL_KWARGS': {
+                'max_connections': int(os.environ.get('REDIS_MAX_CONNECTIONS', 50)),
+                # Ping connections idle for longer than this before reuse.
+                'health_check_interval': int(os.environ.get('REDIS_HEALTH_CHECK_INTERVAL', 30)),
+                'socket_connect_timeout': float(os.environ.get('REDIS_CONNECT_TIMEOUT', 2)),
+                'socket_timeout': float(os.environ.get('REDIS_SOCKET_TIMEOUT', 2)),
+                'retry_on_timeout': True,
+            },
         }
     }
 }
 
+# Cache client used by the async views (social_app.async_views). The Redis
+# client talks to the default cache with redis.asyncio instead of a thread.
+ASYNC_CACHE_BACKEND = "social_app.async_cache.RedisAsyncCache"
+
+# Per endpoint query, cache and latency histograms, exposed at /metrics to
+# METRICS_ALLOWED_IPS. Queries slower than SLOW_QUERY_THRESHOLD_MS are logged.
+REQUEST_METRICS_ENABLED = os.environ.get("REQUEST_METRICS_ENABLED") == "True"
+SLOW_QUERY_THRESHOLD_MS = int(os.environ.get("SLOW_QUERY_THRESHOLD_MS", 100))
+METRICS_ALLOWED_IPS = ["127.0.0.1"]
+
 # Use Redis for session management
 SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
 SESSION_CACHE_ALIAS = 'default'
\ No newline at end of file
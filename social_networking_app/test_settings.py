@@ -5,6 +5,27 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
-    }
+    },
+    # A second database standing in for a read replica. Nothing replicates
+    # into it; set DATABASE_REPLICAS = ["replica"] to route reads to it.
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db_replica.sqlite3",
+    },
 }
+DATABASE_REPLICAS = []
 EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+ASYNC_CACHE_BACKEND = "social_app.async_cache.DjangoAsyncCache"
+
+RATE_LIMIT_BACKEND = "social_app.ratelimit.LocalSlidingWindowRateLimiter"
+
+USER_SEARCH_ENGINE = "social_app.search.SimpleUserSearchEngine"
+
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
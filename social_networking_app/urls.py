@@ -18,6 +18,7 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import include, path
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from social_app.instrumentation import metrics_view
 
 
 urlpatterns = [
@@ -25,4 +26,5 @@ urlpatterns = [
     path("api/login/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("api/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("api/", include("social_app.api_urls")),  # include your app urls.py here
+    path("metrics", metrics_view, name="metrics"),
 ]